@@ -0,0 +1,333 @@
+"""
+Local Analysis Service for BDPA SkillGap
+Small asyncio HTTP/1.1 JSON server over the in-memory analysis artifacts
+
+Endpoints (all JSON):
+    GET  /health
+    GET  /demand?skill=python[&skill=sql...]
+    GET  /combinations?skill=python
+    GET  /industries[?name=AI/ML]
+    GET  /salary[?experience=entry&remote=remote&skill=python[&by=location]]
+    POST /gap            {"skills": ["python", "git", ...]}
+    GET  /stats          cache hit/miss counters
+
+Usage:
+    python analysis/analysis_service.py [--port 8765] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from intern_focused_analysis import normalize_skill
+from market_artifact import ARTIFACT_PATH, build_artifact
+from salary_cube import CUBE_PATH, DIMENSIONS, SalaryCube
+from skill_index import SkillDemandIndex
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+CACHE_SIZE = 4096
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0}
+
+
+# Gap scoring runs in worker processes; each builds the role templates once
+_templates = None
+
+
+def _init_gap_worker(demand):
+    global _templates
+    from cohort_gap import RoleTemplates
+    _templates = RoleTemplates(demand=demand)
+
+
+def _score_profile(skills):
+    from cohort_gap import score_profile
+    return score_profile(_templates, list(skills))
+
+
+class AnalysisService:
+    """Request handlers over the market-data artifact, with an LRU cache of serialized responses"""
+
+    def __init__(self, artifact, workers=2, cache_size=CACHE_SIZE, cube=None):
+        self.artifact = artifact
+        self.cube = cube
+        self.demand_index = SkillDemandIndex(artifact['marketData'].items())
+        self.cache = LRUCache(cache_size)
+        self.workers = workers
+        self._inflight = {}
+        self.started = time.time()
+
+        # Template demand is resolved once here and shipped to the workers
+        from intern_focused_analysis import normalized_industry_skills
+        template_skills = {s for skills in normalized_industry_skills().values() for s in skills}
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_gap_worker,
+                                        initargs=({s: self.demand_index.demand(s) for s in template_skills},))
+
+    @classmethod
+    def from_disk(cls, path=ARTIFACT_PATH, cube_path=CUBE_PATH, **kwargs):
+        """Load the compiled artifact, or compile it in memory when it has not been exported yet"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            artifact = build_artifact()
+        # The salary cube is optional: /salary answers 503 until salary_cube.py has built it
+        try:
+            cube = SalaryCube.load(cube_path)
+        except (OSError, ValueError):
+            cube = None
+        return cls(artifact, cube=cube, **kwargs)
+
+    async def warm_up(self):
+        """Start every worker (imports and template build) before the first real request"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _score_profile, ())
+                               for _ in range(self.workers)))
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def cache_key(method, path, query, body):
+        """Requests that differ only in skill spelling, case, order or duplicates share a key"""
+        if path == '/gap':
+            skills = sorted({normalize_skill(s) for s in body.get('skills', []) if isinstance(s, str)})
+            return (path, tuple(skills))
+        params = tuple(sorted((k, tuple(sorted({normalize_skill(v) if k == 'skill' else v for v in vs})))
+                              for k, vs in query.items()))
+        return (method, path, params)
+
+    def demand(self, query):
+        skills = query.get('skill')
+        if not skills:
+            return 400, {'error': "missing 'skill' parameter"}
+        # Bodies are cached under the normalized key, so they name skills by their normalized form
+        skills = dict.fromkeys(normalize_skill(s) for s in skills)
+        return 200, {'demand': {s: self.demand_index.demand(s) for s in skills}}
+
+    def combinations(self, query):
+        combinations = self.artifact.get('skillCombinations', {})
+        skills = query.get('skill')
+        if not skills:
+            return 200, {'skillCombinations': combinations}
+        skills = dict.fromkeys(normalize_skill(s) for s in skills)
+        return 200, {'skillCombinations': {s: combinations.get(s, []) for s in skills}}
+
+    def industries(self, query):
+        scores = self.artifact.get('industryDemandScores', {})
+        names = query.get('name')
+        if not names:
+            return 200, {'industryDemandScores': scores}
+        unknown = [n for n in names if n not in scores]
+        if unknown:
+            return 404, {'error': f"unknown industry: {', '.join(unknown)}", 'available': list(scores)}
+        return 200, {'industryDemandScores': {n: scores[n] for n in names}}
+
+    def salary(self, query):
+        if self.cube is None:
+            return 503, {'error': "salary cube not built; run analysis/salary_cube.py"}
+        unknown = set(query) - set(DIMENSIONS) - {'by'}
+        if unknown:
+            return 400, {'error': f"unknown parameter: {', '.join(sorted(unknown))}", 'dimensions': list(DIMENSIONS)}
+        # Skills are echoed normalized, as cache_key does, so the cached body fits every spelling
+        query = {dim: sorted({normalize_skill(v) for v in values}) if dim == 'skill' else values
+                 for dim, values in query.items()}
+        members = {dim: values if len(values) > 1 else values[0] for dim, values in query.items() if dim != 'by'}
+        try:
+            if 'by' in query:
+                by = query['by'][0]
+                if by not in DIMENSIONS or any(isinstance(v, list) for v in members.values()):
+                    return 400, {'error': "'by' needs a dimension and one member per sliced dimension",
+                                 'dimensions': list(DIMENSIONS)}
+                rows = self.cube.breakdown(by, **{d: v for d, v in members.items() if d != by})
+                return 200, {'slice': members, 'by': by,
+                             'breakdown': json.loads(rows.head(100).round(2).to_json(orient='records'))}
+            return 200, {'slice': members, 'salary': self.cube.query(**members)}
+        except KeyError as e:
+            return 404, {'error': f"unknown member {e}"}
+
+    async def gap(self, body):
+        skills = body.get('skills')
+        if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+            return 400, {'error': "body must be {\"skills\": [string, ...]}"}
+        loop = asyncio.get_running_loop()
+        roles = await loop.run_in_executor(self.pool, _score_profile, tuple(skills))
+        return 200, {'skills': sorted({normalize_skill(s) for s in skills}), 'roles': roles}
+
+    async def dispatch(self, method, target, body_bytes):
+        """Route one request; returns (status, response bytes)"""
+        url = urlsplit(target)
+        path, query = url.path.rstrip('/') or '/', parse_qs(url.query)
+
+        if path == '/health':
+            return 200, _encode({'status': 'ok', 'uptime_s': round(time.time() - self.started, 1),
+                                 'version': self.artifact.get('version'), 'etag': self.artifact.get('etag')})
+        if path == '/stats':
+            return 200, _encode({'cache': self.cache.stats()})
+
+        routes = {'/demand': 'GET', '/combinations': 'GET', '/industries': 'GET', '/salary': 'GET', '/gap': 'POST'}
+        if path not in routes:
+            return 404, _encode({'error': f"no route for {path}", 'routes': sorted(routes)})
+        if method != routes[path]:
+            return 405, _encode({'error': f"{path} expects {routes[path]}"})
+
+        body = {}
+        if method == 'POST':
+            try:
+                body = json.loads(body_bytes or b'{}')
+            except ValueError:
+                return 400, _encode({'error': 'invalid JSON body'})
+            if not isinstance(body, dict):
+                return 400, _encode({'error': 'JSON body must be an object'})
+
+        key = self.cache_key(method, path, query, body)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Identical requests arriving while the first is still computing share its result
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(self._compute(key, path, query, body))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _compute(self, key, path, query, body):
+        if path == '/gap':
+            status, payload = await self.gap(body)
+        else:
+            status, payload = getattr(self, path.lstrip('/'))(query)
+        response = (status, _encode(payload))
+        if status == 200:
+            self.cache.put(key, response)
+        return response
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    await _respond(writer, 400, _encode({'error': 'malformed request line'}), keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(writer, 400, _encode({'error': 'invalid Content-Length'}), keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _respond(writer, 413, _encode({'error': 'body too large'}), keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b''
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    status, payload = await self.dispatch(method.upper(), target, body)
+                except Exception as e:
+                    status, payload = 500, _encode({'error': str(e)})
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() != 'HTTP/1.0')
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+def _encode(payload):
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+async def _respond(writer, status, payload, keep_alive):
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload
+    )
+    await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=2, cache_size=CACHE_SIZE, artifact_path=ARTIFACT_PATH):
+    service = AnalysisService.from_disk(artifact_path, workers=workers, cache_size=cache_size)
+    await service.warm_up()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"✓ Serving {service.artifact.get('totalSkills', 0):,} skills "
+          f"(artifact {service.artifact.get('etag')}) on http://{host}:{port} with {workers} gap workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the analysis artifacts over local HTTP")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=2, help="Processes for gap scoring")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help="LRU cache entries")
+    parser.add_argument('--artifact', type=Path, default=ARTIFACT_PATH)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size, args.artifact))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
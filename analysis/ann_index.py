@@ -0,0 +1,392 @@
+"""
+Similar-Jobs Index for BDPA Tech Job Market Analysis
+Approximate nearest-neighbor search (IVF over random projections of TF-IDF posting vectors,
+with the candidates re-ranked by exact TF-IDF cosine)
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from data_cache import cache_status, dataset_path, file_sha256
+from resume_matcher import TfidfMatcher, load_postings
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+ANN_CACHE_DIR = ANALYSIS_DIR / "cache" / "ann"
+
+SIMILARITY_SOURCES = ('unified_jobs', 'linkedin_postings', 'ai_jobs', 'ai_jobs_snapshot')
+
+# The index proposes this many times k candidates, which exact TF-IDF cosine re-ranks
+RERANK_FACTOR = 10
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class RandomProjection:
+    """
+    Gaussian random projection from the sparse TF-IDF space to `dim` dense dimensions.
+
+    The projection matrix is regenerated from (n_features, dim, seed), so only
+    those three numbers need to be stored. Output rows are unit length, so the
+    dot product approximates the cosine similarity of the TF-IDF vectors.
+    """
+
+    def __init__(self, n_features, dim=128, seed=0):
+        self.n_features = n_features
+        self.dim = dim
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.components = (rng.standard_normal((n_features, dim)) / np.sqrt(dim)).astype(np.float32)
+
+    def project(self, matrix):
+        return _normalize_rows(np.asarray(matrix @ self.components, dtype=np.float32))
+
+    def params(self):
+        return {'n_features': self.n_features, 'dim': self.dim, 'seed': self.seed}
+
+
+class IVFIndex:
+    """
+    Inverted-file index for unit vectors under inner-product similarity.
+
+    Vectors are assigned to the nearest of `nlist` spherical k-means centroids.
+    A query scores the centroids, scans only the `nprobe` closest lists and
+    returns the best k of those candidates. add() can be called any number of
+    times after train(); new vectors go straight into their nearest list.
+    """
+
+    def __init__(self, dim, nlist=None, nprobe=128):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids = None
+        self._vectors = []
+        self._ids = []
+        self._next_id = 0
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._ids)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def _assign(self, vectors, chunk=65536):
+        return np.concatenate([np.argmax(vectors[i:i + chunk] @ self.centroids.T, axis=1)
+                               for i in range(0, len(vectors), chunk)]) if len(vectors) else np.empty(0, dtype=np.int64)
+
+    def train(self, vectors, n_iter=10, sample_per_list=32, seed=0):
+        """Spherical k-means on a sample of sample_per_list points per list; nlist defaults to 2 * sqrt(n)"""
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = min(self.nlist or max(1, int(2 * np.sqrt(n))), n)
+        sample = vectors[rng.choice(n, size=min(n, sample_per_list * nlist), replace=False)]
+
+        self.centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = self._assign(sample)
+            members = sparse.csr_matrix((np.ones(len(sample), dtype=np.float32), (assign, np.arange(len(sample)))),
+                                        shape=(nlist, len(sample)))
+            sums = np.asarray(members @ sample)
+            empty = np.flatnonzero(np.bincount(assign, minlength=nlist) == 0)
+            # Re-seed empty lists with random sample points so every list stays in use
+            sums[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+            self.centroids = _normalize_rows(sums).astype(np.float32)
+
+        self.nlist = nlist
+        self._vectors = [np.empty((0, self.dim), dtype=np.float32) for _ in range(nlist)]
+        self._ids = [np.empty(0, dtype=np.int64) for _ in range(nlist)]
+        return self
+
+    def add(self, vectors, ids=None):
+        """Add vectors (ids default to consecutive integers after the largest seen); returns the ids"""
+        if not self.is_trained:
+            raise ValueError("IVFIndex.add() called before train()")
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = (np.arange(self._next_id, self._next_id + len(vectors)) if ids is None
+               else np.asarray(ids, dtype=np.int64))
+        assign = self._assign(vectors)
+
+        order = np.argsort(assign, kind='stable')
+        lists, starts = np.unique(assign[order], return_index=True)
+        for list_id, rows in zip(lists, np.split(order, starts[1:])):
+            self._vectors[list_id] = np.concatenate([self._vectors[list_id], vectors[rows]])
+            self._ids[list_id] = np.concatenate([self._ids[list_id], ids[rows]])
+        if len(ids):
+            self._next_id = max(self._next_id, int(ids.max()) + 1)
+        return ids
+
+    def search(self, query, k=10, nprobe=None):
+        """(ids, scores) of the approximate top-k for one query vector, best first"""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        scores = np.concatenate([self._vectors[j] @ query for j in probe])
+        ids = np.concatenate([self._ids[j] for j in probe])
+        if len(ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return ids[order], scores[order]
+
+    def search_batch(self, queries, k=10, nprobe=None):
+        return [self.search(q, k=k, nprobe=nprobe) for q in np.asarray(queries, dtype=np.float32)]
+
+    def save(self, path, **extra):
+        """One .npz with the centroids and the lists packed back to back"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp,
+            centroids=self.centroids,
+            vectors=np.concatenate(self._vectors),
+            ids=np.concatenate(self._ids),
+            list_offsets=np.cumsum([0] + [len(ids) for ids in self._ids]),
+            params=np.array(json.dumps({'dim': self.dim, 'nlist': self.nlist, 'nprobe': self.nprobe,
+                                        'next_id': self._next_id, **extra})),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns (index, extra params passed to save())"""
+        with np.load(path) as npz:
+            params = json.loads(str(npz['params']))
+            index = cls(params.pop('dim'), nlist=params.pop('nlist'), nprobe=params.pop('nprobe'))
+            index._next_id = params.pop('next_id')
+            index.centroids = npz['centroids']
+            offsets, vectors, ids = npz['list_offsets'], npz['vectors'], npz['ids']
+            index._vectors = [vectors[offsets[j]:offsets[j + 1]] for j in range(index.nlist)]
+            index._ids = [ids[offsets[j]:offsets[j + 1]] for j in range(index.nlist)]
+        return index, params
+
+
+def exact_scores(vectors, query):
+    """Inner product of every row with the query (dense rows, or CSR rows with a 1-row CSR query)"""
+    if sparse.issparse(vectors):
+        return (vectors @ query.T).toarray().ravel()
+    return vectors @ query
+
+
+def exact_search(vectors, query, k=10):
+    """Brute-force top-k by inner product, the ground truth for recall"""
+    scores = exact_scores(vectors, query)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def evaluate(search, vectors, n_queries=200, k=10, seed=0):
+    """
+    recall@k and per-query latency of search(row, k) -> ids against exact_search over `vectors`.
+
+    For postings `vectors` is the TF-IDF matrix itself, not its projection, so the
+    recall includes the projection error as well as the lists the index skipped.
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(vectors.shape[0], size=min(n_queries, vectors.shape[0]), replace=False)
+
+    hits, ann_ms, exact_ms = 0, [], []
+    for row in rows:
+        start = time.perf_counter()
+        scores = exact_scores(vectors, vectors[row])
+        top = np.argpartition(-scores, k - 1)[:k]
+        exact_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        ids = search(row, k)
+        ann_ms.append((time.perf_counter() - start) * 1000)
+        # A result counts as a hit when it scores at least the exact k-th neighbour, so
+        # postings with identical text (ties) are not counted as misses
+        hits += int(np.sum(scores[ids] >= scores[top].min() - 1e-6))
+
+    return {
+        'vectors': vectors.shape[0], 'queries': len(rows), 'k': k,
+        'recall': hits / (len(rows) * k),
+        'ann_p50_ms': float(np.percentile(ann_ms, 50)), 'ann_p95_ms': float(np.percentile(ann_ms, 95)),
+        'exact_p50_ms': float(np.percentile(exact_ms, 50)),
+    }
+
+
+def source_hashes(sources):
+    """[name, sha256] of each source CSV in order (None when missing), saved with the index to spot stale saves"""
+    hashes = []
+    for name in sources:
+        path = dataset_path(name)
+        if not path.exists():
+            hashes.append([name, None])
+            continue
+        valid, manifest = cache_status(name, path)
+        hashes.append([name, manifest['sha256'] if valid else file_sha256(path)])
+    return hashes
+
+
+class SimilarJobs:
+    """
+    Postings, their TF-IDF model, the projection and the IVF index, saved together in one directory.
+
+    `sources` records which datasets (and which versions of them, by hash) the
+    postings were loaded from, so a saved index can be checked before reuse.
+    """
+
+    def __init__(self, matcher, projection, index, sources=None):
+        self.matcher = matcher
+        self.projection = projection
+        self.index = index
+        self.sources = sources
+
+    @classmethod
+    def build(cls, postings, dim=128, nlist=None, nprobe=128, min_df=2, sources=None):
+        matcher = TfidfMatcher(min_df=min_df).fit(postings)
+        projection = RandomProjection(len(matcher.vocabulary), dim=dim)
+        vectors = projection.project(matcher.matrix)
+        index = IVFIndex(dim, nlist=nlist, nprobe=nprobe).train(vectors)
+        index.add(vectors)
+        return cls(matcher, projection, index, sources=sources)
+
+    @property
+    def postings(self):
+        return self.matcher.postings
+
+    def add_postings(self, postings):
+        """Index new postings in the existing vocabulary and lists (no refit)"""
+        rows = self.matcher.transform(postings['text'])
+        ids = self.index.add(self.projection.project(rows))
+        self.matcher.matrix = sparse.vstack([self.matcher.matrix, rows]).tocsr()
+        self.matcher._matrix_t = None
+        self.matcher.postings = pd.concat([self.matcher.postings, postings.drop(columns=['text'])],
+                                          ignore_index=True)
+        return ids
+
+    def _frame(self, ids, scores):
+        frame = self.postings.iloc[ids].reset_index(drop=True)
+        frame['similarity'] = np.round(scores, 4)
+        return frame
+
+    def search(self, query, k=10):
+        """(ids, TF-IDF cosines) of the top-k postings for a 1-row TF-IDF query, best first"""
+        ids, _ = self.index.search(self.projection.project(query)[0], k=k * RERANK_FACTOR)
+        scores = exact_scores(self.matcher.matrix[ids], query)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return ids[order], scores[order]
+
+    def similar_to_text(self, text, k=10):
+        return self._frame(*self.search(self.matcher.transform([text]), k=k))
+
+    def similar_to(self, row, k=10):
+        """Postings most like posting `row` (itself excluded)"""
+        ids, scores = self.search(self.matcher.matrix[row], k=k + 1)
+        keep = ids != row
+        return self._frame(ids[keep][:k], scores[keep][:k])
+
+    def save(self, directory):
+        directory = Path(directory)
+        self.matcher.save(directory / "tfidf.npz")
+        self.index.save(directory / "ivf.npz", projection=self.projection.params(), sources=self.sources)
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        matcher = TfidfMatcher.load(directory / "tfidf.npz")
+        index, extra = IVFIndex.load(directory / "ivf.npz")
+        return cls(matcher, RandomProjection(**extra['projection']), index, sources=extra.get('sources'))
+
+
+def synthetic_vectors(n, dim=128, n_clusters=20000, spread=1.0, seed=0):
+    """Clustered unit vectors standing in for posting embeddings at scales the datasets don't reach"""
+    rng = np.random.default_rng(seed)
+    centers = _normalize_rows(rng.standard_normal((n_clusters, dim)).astype(np.float32))
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 1 << 17):
+        stop = min(n, start + (1 << 17))
+        noise = rng.standard_normal((stop - start, dim)).astype(np.float32) * (spread / np.sqrt(dim))
+        vectors[start:stop] = centers[rng.integers(0, n_clusters, stop - start)] + noise
+    return _normalize_rows(vectors)
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def print_evaluation(r, nprobe, build_s=None):
+    print(f"\n--- ANN EVALUATION ({r['vectors']:,} vectors, {r['queries']} queries, nprobe={nprobe}) ---")
+    if build_s is not None:
+        print(f"  • build:      {build_s:.2f}s")
+    print(f"  • recall@{r['k']}:  {r['recall']:.3f}")
+    print(f"  • ANN query:  p50 {r['ann_p50_ms']:.2f} ms | p95 {r['ann_p95_ms']:.2f} ms")
+    print(f"  • exact scan: p50 {r['exact_p50_ms']:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximate nearest-neighbor index over job postings")
+    parser.add_argument('--sources', nargs='+', choices=list(SIMILARITY_SOURCES), default=None)
+    parser.add_argument('--index-dir', type=Path, default=ANN_CACHE_DIR)
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild even if a saved index exists")
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--nprobe', type=int, default=128)
+    parser.add_argument('--similar', type=int, metavar='ROW', help="Show postings most like posting ROW")
+    parser.add_argument('--text', help="Show postings most like this text")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--evaluate', action='store_true',
+                        help="Measure recall@k and latency against brute-force TF-IDF cosine")
+    parser.add_argument('--synthetic', type=positive_int, metavar='N',
+                        help="Evaluate on N synthetic clustered vectors instead of the postings")
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        vectors = synthetic_vectors(args.synthetic, dim=args.dim)
+        start = time.perf_counter()
+        index = IVFIndex(args.dim, nprobe=args.nprobe).train(vectors)
+        index.add(vectors)
+        build_s = time.perf_counter() - start
+        print_evaluation(evaluate(lambda row, k: index.search(vectors[row], k=k)[0], vectors, k=args.top_k),
+                         index.nprobe, build_s)
+        return
+
+    sources = list(args.sources or SIMILARITY_SOURCES)
+    hashes = source_hashes(sources)
+    start = time.perf_counter()
+    jobs = None
+    if (args.index_dir / "ivf.npz").exists() and not args.rebuild:
+        jobs = SimilarJobs.load(args.index_dir)
+        if jobs.sources != hashes or jobs.index.dim != args.dim:
+            print("⚠ Saved index was built from other sources, source data or --dim, rebuilding")
+            jobs = None
+        else:
+            jobs.index.nprobe = args.nprobe
+            print(f"✓ Loaded index of {len(jobs.index):,} postings in {time.perf_counter() - start:.2f}s")
+    if jobs is None:
+        start = time.perf_counter()
+        jobs = SimilarJobs.build(load_postings(sources), dim=args.dim, nprobe=args.nprobe, sources=hashes)
+        jobs.save(args.index_dir)
+        print(f"✓ Indexed {len(jobs.index):,} postings into {jobs.index.nlist} lists "
+              f"in {time.perf_counter() - start:.2f}s -> {args.index_dir}")
+
+    columns = ['similarity', 'title', 'company', 'source']
+    if args.similar is not None:
+        print(f"\n--- POSTINGS LIKE #{args.similar}: {jobs.postings.iloc[args.similar]['title']} ---")
+        print(jobs.similar_to(args.similar, k=args.top_k)[columns].to_string(index=False))
+    if args.text:
+        print(f"\n--- POSTINGS LIKE '{args.text}' ---")
+        print(jobs.similar_to_text(args.text, k=args.top_k)[columns].to_string(index=False))
+    if args.evaluate:
+        matrix = jobs.matcher.matrix
+        print_evaluation(evaluate(lambda row, k: jobs.search(matrix[row], k=k)[0], matrix, k=args.top_k),
+                         jobs.index.nprobe)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+BDPA Analysis - Unified Command Line Interface
+One entry point for the exploration, intern, cohort, trends, ingest, dedup, cube, companies, sql, classify, serve, bench, demo and export workflows
+
+Heavy libraries (pandas, numpy, matplotlib, seaborn) are only imported inside the
+subcommand that needs them, so lightweight subcommands start in well under a second.
+
+Usage:
+    python analysis/bdpa_analysis.py explore [--stream] [--only STAGE ...]
+    python analysis/bdpa_analysis.py intern [--full-vocabulary] [--classify]
+    python analysis/bdpa_analysis.py cohort COHORT.csv | --synthetic N
+    python analysis/bdpa_analysis.py trends [--update [--sources NAME --file NEW.csv]]
+    python analysis/bdpa_analysis.py ingest SNAPSHOT.csv ... [--partial] | --status
+    python analysis/bdpa_analysis.py dedup [DATASET ...] [--threshold 0.8]
+    python analysis/bdpa_analysis.py cube [--query DIM=VALUE ... [--by DIM]]
+    python analysis/bdpa_analysis.py companies [--rebuild] [--lookup NAME ...]
+    python analysis/bdpa_analysis.py sql --ingest | "SELECT ..." | --run NAME ...
+    python analysis/bdpa_analysis.py classify [--sources DATASET ...] [--min-similarity 0.05]
+    python analysis/bdpa_analysis.py serve [--port 8765]
+    python analysis/bdpa_analysis.py bench [--scale 1 10 100] [--update-baseline]
+    python analysis/bdpa_analysis.py demo
+    python analysis/bdpa_analysis.py export [--out PATH]
+"""
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = ANALYSIS_DIR.parent
+
+# Cold-start budget for the lightweight subcommands (seconds, excluding interpreter boot)
+COLD_START_BUDGET_S = 0.5
+LIGHTWEIGHT_COMMANDS = ('demo', 'export', 'intern')
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'seaborn', 'scipy', 'pyarrow')
+
+
+def cmd_explore(args):
+    # The exploration script resolves its data and output paths from the repo root
+    os.chdir(REPO_ROOT)
+    import initial_data_exploration
+    initial_data_exploration.main(args.passthrough)
+
+
+def cmd_intern(args):
+    # The intern analysis reads and writes results/ relative to analysis/
+    os.chdir(ANALYSIS_DIR)
+    import intern_focused_analysis
+    intern_focused_analysis.main(args.passthrough)
+
+
+def cmd_cohort(args):
+    import cohort_gap
+    cohort_gap.main(args.passthrough)
+
+
+def cmd_trends(args):
+    import skill_trends
+    return skill_trends.main(args.passthrough)
+
+
+def cmd_ingest(args):
+    import snapshot_ingest
+    return snapshot_ingest.main(args.passthrough)
+
+
+def cmd_dedup(args):
+    import near_duplicates
+    return near_duplicates.main(args.passthrough)
+
+
+def cmd_cube(args):
+    import salary_cube
+    return salary_cube.main(args.passthrough)
+
+
+def cmd_companies(args):
+    import company_index
+    return company_index.main(args.passthrough)
+
+
+def cmd_sql(args):
+    import sql_store
+    return sql_store.main(args.passthrough)
+
+
+def cmd_classify(args):
+    import industry_classifier
+    return industry_classifier.main(args.passthrough)
+
+
+def cmd_serve(args):
+    import analysis_service
+    analysis_service.main(args.passthrough)
+
+
+def cmd_bench(args):
+    import benchmark_suite
+    return benchmark_suite.main(args.passthrough)
+
+
+def cmd_demo(args):
+    import demo_analysis_example
+    demo_analysis_example.main()
+
+
+def cmd_export(args):
+    """
+    Compile the versioned market-data artifact served by the frontend.
+
+    Pandas-free, and only the head of the demand table is read (market_artifact.DEMAND_TOP
+    skills), so a full-vocabulary skill_counts.csv from an exploration run keeps it
+    within the cold-start budget.
+    """
+    import market_artifact
+    market_artifact.main(['--out', args.out] if args.out else [])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bdpa-analysis', description="BDPA tech job market analysis")
+    parser.add_argument('--timing', action='store_true',
+                        help="Report elapsed time and which heavy libraries were imported")
+    parser.add_argument('--check-budget', action='store_true',
+                        help=f"Fail if a lightweight subcommand exceeds {COLD_START_BUDGET_S}s")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    explore = subparsers.add_parser('explore', help="Full dataset exploration pipeline",
+                                    description="Arguments are passed to initial_data_exploration.py")
+    explore.add_argument('passthrough', nargs=argparse.REMAINDER)
+    explore.set_defaults(func=cmd_explore)
+
+    intern = subparsers.add_parser('intern', help="Intern-focused skill analysis",
+                                   description="Arguments are passed to intern_focused_analysis.py")
+    intern.add_argument('passthrough', nargs=argparse.REMAINDER)
+    intern.set_defaults(func=cmd_intern)
+
+    cohort = subparsers.add_parser('cohort', help="Score a student cohort against the intern role templates",
+                                   description="Arguments are passed to cohort_gap.py")
+    cohort.add_argument('passthrough', nargs=argparse.REMAINDER)
+    cohort.set_defaults(func=cmd_cohort)
+
+    trends = subparsers.add_parser('trends', help="Monthly skill trends and emerging-skill detection",
+                                   description="Arguments are passed to skill_trends.py")
+    trends.add_argument('passthrough', nargs=argparse.REMAINDER)
+    trends.set_defaults(func=cmd_trends)
+
+    ingest = subparsers.add_parser('ingest', help="Apply new posting snapshots to the stored aggregates",
+                                   description="Arguments are passed to snapshot_ingest.py")
+    ingest.add_argument('passthrough', nargs=argparse.REMAINDER)
+    ingest.set_defaults(func=cmd_ingest)
+
+    dedup = subparsers.add_parser('dedup', help="Cluster near-duplicate postings with MinHash LSH",
+                                  description="Arguments are passed to near_duplicates.py")
+    dedup.add_argument('passthrough', nargs=argparse.REMAINDER)
+    dedup.set_defaults(func=cmd_dedup)
+
+    cube = subparsers.add_parser('cube', help="Build or query the salary cube",
+                                 description="Arguments are passed to salary_cube.py")
+    cube.add_argument('passthrough', nargs=argparse.REMAINDER)
+    cube.set_defaults(func=cmd_cube)
+
+    companies = subparsers.add_parser('companies', help="Resolve company names to IDs and join layoffs to postings",
+                                      description="Arguments are passed to company_index.py")
+    companies.add_argument('passthrough', nargs=argparse.REMAINDER)
+    companies.set_defaults(func=cmd_companies)
+
+    sql = subparsers.add_parser('sql', help="Ingest every dataset into SQLite and run ad-hoc or named queries",
+                                description="Arguments are passed to sql_store.py")
+    sql.add_argument('passthrough', nargs=argparse.REMAINDER)
+    sql.set_defaults(func=cmd_sql)
+
+    classify = subparsers.add_parser('classify', help="Classify every posting into the seven intern industries",
+                                     description="Arguments are passed to industry_classifier.py")
+    classify.add_argument('passthrough', nargs=argparse.REMAINDER)
+    classify.set_defaults(func=cmd_classify)
+
+    serve = subparsers.add_parser('serve', help="Serve demand, combinations, industries, salary slices and gap scoring over local HTTP",
+                                  description="Arguments are passed to analysis_service.py")
+    serve.add_argument('passthrough', nargs=argparse.REMAINDER)
+    serve.set_defaults(func=cmd_serve)
+
+    bench = subparsers.add_parser('bench', help="Benchmark the pipeline on synthetic data against the stored baseline",
+                                  description="Arguments are passed to benchmark_suite.py")
+    bench.add_argument('passthrough', nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+
+    demo = subparsers.add_parser('demo', help="Print the example gap analysis")
+    demo.set_defaults(func=cmd_demo)
+
+    export = subparsers.add_parser('export', help="Compile the market-data artifact for /api/market-data")
+    export.add_argument('--out', help="Output path (default: results/market_data.json)")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    # REMAINDER does not capture arguments that start with an option flag,
+    # so anything argparse leaves over is forwarded to the subcommand too
+    args, extra = parser.parse_known_args(argv)
+    if extra:
+        if not hasattr(args, 'passthrough'):
+            parser.error(f"unrecognized arguments: {' '.join(extra)}")
+        args.passthrough = extra + [arg for arg in args.passthrough if arg != '--']
+    status = args.func(args)
+    if status:
+        return status
+
+    elapsed = time.perf_counter() - _START
+    if args.timing:
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"\n⏱ {args.command}: {elapsed * 1000:.0f} ms | heavy imports: {', '.join(loaded) or 'none'}")
+    lightweight = args.command in LIGHTWEIGHT_COMMANDS and '--full-vocabulary' not in getattr(args, 'passthrough', [])
+    if args.check_budget and lightweight and elapsed > COLD_START_BUDGET_S:
+        print(f"✗ {args.command} took {elapsed:.2f}s, over the {COLD_START_BUDGET_S}s cold-start budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
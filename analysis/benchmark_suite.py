@@ -0,0 +1,214 @@
+"""
+Benchmark Suite for BDPA Tech Job Market Analysis
+Times the core pipeline functions on seeded synthetic data at 1x/10x/100x the real row counts
+and fails when wall time or peak memory regresses past the stored baseline
+
+Each case runs in a fresh process so its peak RSS is its own; the columnar dataset cache,
+the skill store and the results are redirected to a temporary directory so benchmark runs
+never touch the real ones. analyze_skills builds the skill store from scratch on every
+repeat, so it times skill parsing rather than a warm store load.
+
+Usage:
+    python analysis/benchmark_suite.py [--scale 1 10] [--repeats 3]
+    python analysis/benchmark_suite.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+
+import synthetic_data
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = ANALYSIS_DIR / "results" / "benchmarks" / "baseline.json"
+
+# A case regresses when it is this much slower / larger than the baseline, beyond an
+# absolute floor that keeps sub-100ms cases from failing on timer noise
+TIME_TOLERANCE = 0.25
+TIME_FLOOR_S = 0.05
+RSS_TOLERANCE = 0.25
+RSS_FLOOR_MB = 32
+
+CASES = ('load_datasets', 'load_datasets_cached', 'read_ai_jobs',
+         'analyze_skills', 'analyze_job_postings', 'filter_intern_relevant_skills')
+
+
+def _peak_rss_mb():
+    # VmHWM resets on exec; ru_maxrss can carry over the parent's peak from the fork
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _prepare(case, root, scratch):
+    """
+    Import the pipeline against the synthetic tree; returns (fn, rows, reset) for the
+    timed call, where reset (or None) runs untimed before each repeat.
+    """
+    sys.path.insert(0, str(ANALYSIS_DIR))
+    # initial_data_exploration creates cwd-relative output dirs at import time
+    os.chdir(scratch)
+    import data_cache
+    import initial_data_exploration as ide
+    import skill_engine
+    from data_cache import read_dataset
+    from intern_focused_analysis import filter_intern_relevant_skills
+
+    data_cache.CACHE_DIR = Path(scratch) / "datasets"
+    ml_ready = synthetic_data.dataset_file(root, 'job_postings').parent
+    ide.DATA_DIR = ml_ready
+    ide.RESULTS_DIR = Path(scratch) / "results"
+    ide.RESULTS_DIR.mkdir(exist_ok=True)
+    ide.SKILL_CACHE_DIR = skill_engine.SKILL_CACHE_DIR = Path(scratch) / "skills"
+
+    def load(name, columns=None):
+        return read_dataset(name, data_dir=synthetic_data.dataset_file(root, name).parent,
+                            use_cache=False, columns=columns)[0]
+
+    if case == 'load_datasets':
+        return lambda: ide.load_datasets(use_cache=False), None, None
+    if case == 'load_datasets_cached':
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            ide.load_datasets(use_cache=True)
+        return lambda: ide.load_datasets(use_cache=True), None, None
+    if case == 'read_ai_jobs':
+        return lambda: load('ai_jobs'), None, None
+    if case == 'analyze_skills':
+        # The frame the exploration passes in, with its columnar cache warm and no skill store yet
+        df = load('job_skills')
+        read_dataset('job_skills', data_dir=ml_ready, columns=['job_link'])
+        return lambda: ide.analyze_skills(df), len(df), lambda: shutil.rmtree(ide.SKILL_CACHE_DIR, ignore_errors=True)
+    if case == 'analyze_job_postings':
+        df = load('job_postings')
+        return lambda: ide.analyze_job_postings(df), len(df), None
+    if case == 'filter_intern_relevant_skills':
+        skills = skill_engine.explode_skills(load('job_skills', columns=['job_skills'])['job_skills']).counts_frame()
+        return lambda: filter_intern_relevant_skills(skills), len(skills), None
+    raise ValueError(f"unknown benchmark case: {case}")
+
+
+def _run_case(case, root, repeats):
+    """Child-process entry point: best-of-`repeats` wall time, peak RSS and throughput"""
+    with tempfile.TemporaryDirectory(prefix='bdpa-bench-') as scratch:
+        fn, rows, reset = _prepare(case, root, scratch)
+        times = []
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            for _ in range(repeats):
+                if reset:
+                    reset()
+                start = time.perf_counter()
+                result = fn()
+                times.append(time.perf_counter() - start)
+        if rows is None:
+            rows = sum(len(df) for df in result.values()) if isinstance(result, dict) else len(result)
+        seconds = min(times)
+        return {'seconds': round(seconds, 4), 'peak_rss_mb': round(_peak_rss_mb(), 1),
+                'rows': rows, 'rows_per_s': round(rows / max(seconds, 1e-9))}
+
+
+def run_suite(scale, repeats=3, cases=CASES, seed=0):
+    """Generate (or reuse) the synthetic data for one scale and run every case in its own process"""
+    root = synthetic_data.SYNTHETIC_DIR / f"scale-{scale:g}x"
+    synthetic_data.generate(root, scale=scale, seed=seed)
+    results = {}
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results[case] = pool.submit(_run_case, case, str(root), repeats).result()
+        r = results[case]
+        print(f"  {case:32s} {r['seconds']:8.3f}s {r['peak_rss_mb']:8.1f} MB {r['rows']:>12,} rows "
+              f"{r['rows_per_s']:>12,} rows/s")
+    return results
+
+
+def compare(results, baseline):
+    """List of regression messages for cases slower or larger than the baseline"""
+    regressions = []
+    for case, r in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        time_limit = base['seconds'] * (1 + TIME_TOLERANCE) + TIME_FLOOR_S
+        if r['seconds'] > time_limit:
+            regressions.append(f"{case}: {r['seconds']:.3f}s vs baseline {base['seconds']:.3f}s "
+                               f"(limit {time_limit:.3f}s)")
+        rss_limit = base['peak_rss_mb'] * (1 + RSS_TOLERANCE) + RSS_FLOOR_MB
+        if r['peak_rss_mb'] > rss_limit:
+            regressions.append(f"{case}: {r['peak_rss_mb']:.0f} MB peak vs baseline {base['peak_rss_mb']:.0f} MB "
+                               f"(limit {rss_limit:.0f} MB)")
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'scales': {}}
+
+
+def save_baseline(baseline, path=BASELINE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline['machine'] = {'platform': platform.platform(), 'python': platform.python_version(),
+                           'cpus': os.cpu_count()}
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic data")
+    parser.add_argument('--scale', type=float, nargs='+', default=[1], help="Data scales to run (1, 10, 100)")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Record this run as the new baseline instead of comparing against it")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    regressions = []
+    for scale in args.scale:
+        key = f"{scale:g}x"
+        print(f"\n--- BENCHMARKS @ {key} ---")
+        results = run_suite(scale, repeats=args.repeats, cases=args.cases)
+        if args.update_baseline:
+            baseline['scales'].setdefault(key, {}).update(results)
+            continue
+        if key not in baseline['scales']:
+            print(f"⚠ No baseline for {key}; run with --update-baseline to record one")
+            continue
+        regressions += [f"[{key}] {message}" for message in compare(results, baseline['scales'][key])]
+
+    if args.update_baseline:
+        save_baseline(baseline, args.baseline)
+        print(f"\n✓ Baseline saved to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"\n✗ {len(regressions)} performance regression(s):")
+        for message in regressions:
+            print(f"  ✗ {message}")
+        return 1
+    print("\n✓ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
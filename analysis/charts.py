@@ -0,0 +1,158 @@
+"""
+Chart Rendering for BDPA Tech Job Market Analysis
+Renders each chart from a small pre-aggregated payload, in parallel, skipping charts whose data is unchanged
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+FINGERPRINT_FILE = ANALYSIS_DIR / "cache" / "chart_fingerprints.json"
+
+DPI = 300
+
+
+def _new_figure(figsize):
+    """Figure bound to the Agg canvas directly, so no pyplot global state is involved"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _save(fig, path):
+    fig.tight_layout()
+    fig.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+def render_salary_histogram(payload, path):
+    fig, ax = _new_figure((12, 6))
+    edges = payload['edges']
+    # Pre-binned counts drawn as a weighted histogram: one bar per bin
+    ax.hist(edges[:-1], bins=edges, weights=payload['counts'], edgecolor='black', alpha=0.7)
+    ax.set_xlabel('Salary (USD)')
+    ax.set_ylabel('Frequency')
+    ax.set_title('Salary Distribution for Tech Jobs')
+    ax.axvline(payload['median'], color='red', linestyle='--', label=f"Median: ${payload['median']:,.0f}")
+    ax.legend()
+    _save(fig, path)
+
+
+def render_top_skills(payload, path):
+    fig, ax = _new_figure((14, 8))
+    skills, counts = payload['skills'], payload['counts']
+    ax.barh(range(len(skills)), counts, color='steelblue')
+    ax.set_yticks(range(len(skills)), skills)
+    ax.set_xlabel('Number of Mentions')
+    ax.set_title('Top 20 Most In-Demand Skills')
+    ax.invert_yaxis()
+    _save(fig, path)
+
+
+def render_layoffs_trend(payload, path):
+    fig, ax = _new_figure((12, 6))
+    ax.plot(payload['years'], payload['totals'], marker='o', linewidth=2, markersize=8)
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Total Layoffs')
+    ax.set_title('Tech Industry Layoffs Over Time')
+    ax.grid(True, alpha=0.3)
+    _save(fig, path)
+
+
+def render_remote_pie(payload, path):
+    fig, ax = _new_figure((8, 8))
+    ax.pie(payload['counts'], labels=payload['labels'],
+           autopct='%1.1f%%', startangle=90, colors=['#ff9999', '#66b3ff'])
+    ax.set_title('Remote Work Distribution in Tech Jobs')
+    _save(fig, path)
+
+
+RENDERERS = {
+    'salary_histogram': render_salary_histogram,
+    'top_skills': render_top_skills,
+    'layoffs_trend': render_layoffs_trend,
+    'remote_pie': render_remote_pie,
+}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    try:
+        import seaborn as sns
+        matplotlib.rcParams.update(sns.axes_style('whitegrid'))
+    except ImportError:
+        pass
+
+
+def _render(kind, payload, path):
+    _init_worker()
+    RENDERERS[kind](payload, path)
+    return str(path)
+
+
+def chart_fingerprint(kind, payload):
+    """Hash of a chart's input aggregate, its renderer's code and the output dpi"""
+    blob = json.dumps({
+        'payload': payload,
+        'renderer': inspect.getsource(RENDERERS[kind]),
+        'dpi': DPI,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _load_fingerprints(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_charts(jobs, output_dir, max_workers=None, force=False, fingerprint_file=FINGERPRINT_FILE):
+    """
+    Render chart jobs into output_dir.
+
+    jobs is a list of (filename, kind, payload) where payload is a JSON-able
+    aggregate. A chart is skipped when its PNG exists and its fingerprint matches
+    the last render; the rest are rendered on a process pool.
+    Returns (rendered filenames, skipped filenames).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fingerprints = _load_fingerprints(fingerprint_file)
+
+    stale, skipped = [], []
+    for filename, kind, payload in jobs:
+        fingerprint = chart_fingerprint(kind, payload)
+        path = output_dir / filename
+        key = str(path.resolve())
+        if not force and path.exists() and fingerprints.get(key) == fingerprint:
+            skipped.append(filename)
+        else:
+            stale.append((filename, kind, payload, key, fingerprint))
+
+    if len(stale) == 1:
+        filename, kind, payload, _, _ = stale[0]
+        _render(kind, payload, output_dir / filename)
+    elif stale:
+        workers = max_workers or min(len(stale), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render, kind, payload, output_dir / filename)
+                       for filename, kind, payload, _, _ in stale]
+            for future in futures:
+                future.result()
+
+    for _, _, _, key, fingerprint in stale:
+        fingerprints[key] = fingerprint
+    Path(fingerprint_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(fingerprint_file, 'w') as f:
+        json.dump(fingerprints, f, indent=2)
+
+    return [job[0] for job in stale], skipped
@@ -0,0 +1,214 @@
+"""
+Cohort Gap Scoring for BDPA SkillGap
+Scores every student in a cohort against every intern role template in one vectorized pass
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from intern_focused_analysis import normalize_skill, normalized_industry_skills
+from market_artifact import load_skill_demand
+from skill_index import SkillDemandIndex
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = ANALYSIS_DIR / "results" / "cohort"
+
+# Missing skills reported per student x role, highest demand first
+MISSING_SKILLS = 5
+
+
+class RoleTemplates:
+    """
+    The intern role templates as a boolean role x skill matrix over one shared vocabulary.
+
+    Each skill's weight is 1 + log1p(market demand), so a skill with no market
+    data still counts as a gap while high-demand skills count for more without
+    drowning out the rest of the template.
+    """
+
+    def __init__(self, templates=None, demand=None):
+        templates = templates or normalized_industry_skills()
+        self.roles = np.array(list(templates), dtype=object)
+        self.vocab = np.array(list(dict.fromkeys(s for skills in templates.values() for s in skills)), dtype=object)
+        self.position = {skill: j for j, skill in enumerate(self.vocab)}
+
+        self.matrix = np.zeros((len(self.roles), len(self.vocab)), dtype=bool)
+        for i, skills in enumerate(templates.values()):
+            self.matrix[i, [self.position[s] for s in skills]] = True
+
+        if demand is None:
+            demand_table, _ = load_skill_demand()
+            index = SkillDemandIndex(demand_table.items())
+            demand = {skill: index.demand(skill) for skill in self.vocab}
+        self.demand = np.array([demand.get(skill, 0) for skill in self.vocab], dtype=np.int64)
+        self.weights = (1.0 + np.log1p(self.demand)).astype(np.float32)
+
+    def encode(self, profiles):
+        """Boolean student x skill matrix; skills outside the templates are ignored"""
+        held = np.zeros((len(profiles), len(self.vocab)), dtype=bool)
+        rows, cols = [], []
+        for i, skills in enumerate(profiles):
+            for skill in skills:
+                j = self.position.get(normalize_skill(skill))
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+        held[rows, cols] = True
+        return held
+
+
+def _score_arrays(templates, held, missing):
+    """Per student x role arrays shared by score_cohort() and score_profile()"""
+    n_students, n_roles = len(held), len(templates.roles)
+    held_f = held.astype(np.float32)
+    roles_f = templates.matrix.astype(np.float32)
+    weighted_roles = roles_f * templates.weights
+
+    coverage = (held_f @ roles_f.T) / roles_f.sum(axis=1)
+    weighted_coverage = (held_f @ weighted_roles.T) / weighted_roles.sum(axis=1)
+    n_missing = (templates.matrix.sum(axis=1) - held_f @ roles_f.T).astype(np.int32)
+
+    # Per role, its skill columns sorted by weight; the first `missing` unheld ones
+    # per student are found with one stable argsort over the boolean "missing" mask
+    missing_names = np.full((n_students, n_roles, missing), None, dtype=object)
+    for r in range(n_roles):
+        cols = np.flatnonzero(templates.matrix[r])
+        cols = cols[np.argsort(-templates.weights[cols], kind='stable')]
+        gaps = ~held[:, cols]
+        first = np.argsort(~gaps, axis=1, kind='stable')[:, :missing]
+        valid = np.take_along_axis(gaps, first, axis=1)
+        missing_names[:, r, :first.shape[1]] = np.where(valid, templates.vocab[cols][first], None)
+
+    rank = np.argsort(np.argsort(-weighted_coverage, axis=1, kind='stable'), axis=1) + 1
+    return coverage, weighted_coverage, n_missing, missing_names, rank
+
+
+def score_cohort(templates, held, student_ids, missing=MISSING_SKILLS):
+    """
+    Coverage, demand-weighted gap and ranked missing skills for every student x role.
+
+    coverage is the share of the role's skills held, weighted_coverage the same
+    share weighted by demand, and gap_score = 1 - weighted_coverage. The missing
+    skills are the role's unheld skills in descending demand order.
+    Returns a long DataFrame with one row per (student, role).
+    """
+    n_roles = len(templates.roles)
+    coverage, weighted_coverage, n_missing, missing_names, rank = _score_arrays(templates, held, missing)
+    frame = pd.DataFrame({
+        'student_id': np.repeat(np.asarray(student_ids, dtype=object), n_roles),
+        'role': np.tile(templates.roles, len(held)),
+        'coverage': coverage.ravel().round(4),
+        'weighted_coverage': weighted_coverage.ravel().round(4),
+        'gap_score': (1 - weighted_coverage).ravel().round(4),
+        'missing_count': n_missing.ravel(),
+        'role_rank': rank.ravel().astype(np.int16),
+    })
+    for m in range(missing):
+        frame[f'missing_{m + 1}'] = missing_names[:, :, m].ravel()
+    return frame
+
+
+def score_profile(templates, skills, missing=MISSING_SKILLS):
+    """One profile's scores as a list of role dicts, best fit first (no DataFrame overhead)"""
+    coverage, weighted_coverage, n_missing, missing_names, rank = _score_arrays(
+        templates, templates.encode([skills]), missing)
+    roles = [{
+        'role': role, 'rank': int(rank[0, r]),
+        'coverage': round(float(coverage[0, r]), 4),
+        'weighted_coverage': round(float(weighted_coverage[0, r]), 4),
+        'gap_score': round(float(1 - weighted_coverage[0, r]), 4),
+        'missing_count': int(n_missing[0, r]),
+        'missing': [s for s in missing_names[0, r] if s is not None],
+    } for r, role in enumerate(templates.roles)]
+    return sorted(roles, key=lambda role: role['rank'])
+
+
+def load_cohort(path):
+    """
+    Read a cohort as (student_ids, skill lists).
+
+    CSV: a student_id column and a skills column of comma-separated skills.
+    JSON: a list of objects with an id (student_id or id) and a skills list,
+    the same shape as the profile in demo_analysis_example.py.
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        with open(path) as f:
+            records = json.load(f)
+        ids = [r.get('student_id', r.get('id', i)) for i, r in enumerate(records)]
+        return ids, [r.get('skills') or [] for r in records]
+
+    df = pd.read_csv(path, dtype={'student_id': 'string', 'skills': 'string'})
+    skills = df['skills'].fillna('').str.split(',')
+    return df['student_id'].tolist(), skills.tolist()
+
+
+def synthetic_cohort(templates, n, seed=0):
+    """n random profiles drawn from the template vocabulary, for throughput measurement"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(2, 15, n)
+    picks = rng.integers(0, len(templates.vocab), sizes.sum())
+    profiles = np.split(templates.vocab[picks], np.cumsum(sizes)[:-1])
+    return [f"S{i:06d}" for i in range(n)], [p.tolist() for p in profiles]
+
+
+def write_scores(frame, out_path):
+    """Write the scores as Parquet, or CSV when no Parquet engine is installed"""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        frame.to_parquet(out_path, index=False)
+    except ImportError as e:
+        out_path = out_path.with_suffix('.csv')
+        print(f"⚠ Parquet unavailable ({e}), writing CSV")
+        frame.to_csv(out_path, index=False)
+    return out_path
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a student cohort against the intern role templates")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('cohort', nargs='?', type=Path, help="Cohort CSV (student_id, skills) or JSON")
+    source.add_argument('--synthetic', type=positive_int, metavar='N', help="Score N random profiles instead")
+    parser.add_argument('--out', type=Path, default=RESULTS_DIR / "cohort_gaps.parquet")
+    parser.add_argument('--missing', type=int, default=MISSING_SKILLS, help="Missing skills listed per role")
+    args = parser.parse_args(argv)
+
+    templates = RoleTemplates()
+    if args.synthetic is not None:
+        student_ids, profiles = synthetic_cohort(templates, args.synthetic)
+    else:
+        student_ids, profiles = load_cohort(args.cohort)
+    print(f"✓ {len(profiles):,} profiles × {len(templates.roles)} roles over {len(templates.vocab)} template skills")
+
+    start = time.perf_counter()
+    held = templates.encode(profiles)
+    encode_s = time.perf_counter() - start
+    frame = score_cohort(templates, held, student_ids, missing=args.missing)
+    total_s = time.perf_counter() - start
+
+    out = write_scores(frame, args.out)
+    print(f"✓ Scored {len(frame):,} student × role pairs in {total_s * 1000:.1f} ms "
+          f"(encode {encode_s * 1000:.1f} ms) → {len(profiles) / max(total_s, 1e-9):,.0f} profiles/s")
+    print(f"✓ Saved to {out}")
+
+    best = frame[frame['role_rank'] == 1]
+    print("\n🏆 BEST-FIT ROLE ACROSS THE COHORT:")
+    for role, count in best['role'].value_counts().items():
+        print(f"  • {role}: {count:,} students (median gap {best.loc[best['role'] == role, 'gap_score'].median():.2f})")
+
+
+if __name__ == "__main__":
+    main()
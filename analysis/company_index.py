@@ -0,0 +1,341 @@
+"""
+Company Index for BDPA Tech Job Market Analysis
+Resolves the differently spelled company names of every dataset to one persisted company ID,
+so layoff events can be joined to the same company's postings
+
+Names are normalized (case, punctuation, accents, '&', a leading 'the', trailing legal
+suffixes such as Inc/LLC/Corp) and reduced to a matching key that also drops trailing
+generic descriptors (Technologies, Systems, Group, ...). Identical keys are one company.
+Distinct keys are only compared when they share a blocking key (a distinctive token or the
+first letters of the key), and a candidate pair is linked when the character-trigram TF-IDF
+cosine of the keys reaches the threshold and any numbers in the names agree. Linked keys
+are grouped by connected components.
+
+IDs are stable across rebuilds: a company keeps the smallest ID already assigned to any of
+its names, and only new companies get new IDs.
+
+Usage:
+    python analysis/company_index.py                     # build or extend the ID map, join layoffs
+    python analysis/company_index.py --rebuild --threshold 0.9
+    python analysis/company_index.py --lookup "Meta Platforms, Inc."
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from data_cache import read_dataset
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+COMPANY_CACHE_DIR = ANALYSIS_DIR / "cache" / "companies"
+COMPANY_MAP_PATH = COMPANY_CACHE_DIR / "company_ids.parquet"
+RESULTS_DIR = ANALYSIS_DIR / "results" / "companies"
+
+# Dataset name -> company column; 'layoffs' is the side the postings are joined to
+COMPANY_SOURCES = {
+    'layoffs': 'company',
+    'job_postings': 'company_name',
+    'linkedin_postings': 'company',
+    'dice_jobs': 'company',
+    'unified_jobs': 'company_name',
+    'it_jobs': 'company_name',
+    'ai_jobs': 'company_name',
+}
+POSTING_SOURCES = [name for name in COMPANY_SOURCES if name != 'layoffs']
+
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company', 'plc',
+    'gmbh', 'ag', 'sa', 'lp', 'llp', 'pvt', 'pte', 'bv', 'nv', 'srl', 'oy', 'ab',
+})
+GENERIC_DESCRIPTORS = frozenset({
+    'technologies', 'technology', 'systems', 'solutions', 'services', 'labs', 'group', 'holdings',
+    'platforms', 'software', 'international', 'global', 'worldwide', 'enterprises', 'com',
+})
+
+DEFAULT_THRESHOLD = 0.8
+# Blocks larger than this are common stems rather than evidence of a match
+MAX_BLOCK = 100
+PREFIX_LENGTH = 4
+
+
+def normalize_company(names):
+    """Lowercase ASCII words of each name, without punctuation, a leading 'the' or trailing legal suffixes"""
+    text = (names.astype('string').str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.lower().str.replace('&', ' and ', regex=False)
+            .str.replace(r"['’]", '', regex=True).str.replace(r'[^a-z0-9]+', ' ', regex=True)
+            .str.strip().str.replace(r'^the ', '', regex=True))
+    return text.map(lambda s: _strip_trailing(s, LEGAL_SUFFIXES), na_action='ignore').astype('string')
+
+
+def _strip_trailing(name, words):
+    tokens = name.split()
+    while len(tokens) > 1 and tokens[-1] in words:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def company_key(normalized):
+    """Matching key of a normalized name: trailing generic descriptors dropped too"""
+    return normalized.map(lambda s: _strip_trailing(s, LEGAL_SUFFIXES | GENERIC_DESCRIPTORS),
+                          na_action='ignore').astype('string')
+
+
+def _trigram_matrix(keys):
+    """L2-normalized TF-IDF rows of the character trigrams of each key, padded and without spaces"""
+    squeezed = [f" {key.replace(' ', '')} " for key in keys]
+    grams = [[name[i:i + 3] for i in range(len(name) - 2)] for name in squeezed]
+    lengths = np.fromiter((len(g) for g in grams), dtype=np.int64, count=len(grams))
+    codes, vocab = pd.factorize(np.fromiter((g for row in grams for g in row), dtype=object, count=lengths.sum()))
+    matrix = sparse.csr_matrix((np.ones(len(codes)), codes, np.r_[0, np.cumsum(lengths)]),
+                               shape=(len(keys), len(vocab)))
+    matrix.sum_duplicates()
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocab))
+    matrix = matrix @ sparse.diags(np.log((1 + len(keys)) / (1 + document_frequency)) + 1)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sparse.csr_matrix(sparse.diags(1 / np.maximum(norms, 1e-12)) @ matrix)
+
+
+def blocking_keys(keys):
+    """(key row, block code) pairs: distinctive tokens plus a prefix of the squeezed key"""
+    rows, blocks = [], []
+    for i, key in enumerate(keys):
+        for token in set(key.split()):
+            if len(token) > 1 and token not in GENERIC_DESCRIPTORS:
+                rows.append(i)
+                blocks.append('t:' + token)
+        rows.append(i)
+        blocks.append('p:' + key.replace(' ', '')[:PREFIX_LENGTH])
+    block_codes, _ = pd.factorize(np.array(blocks, dtype=object))
+    return np.array(rows, dtype=np.int64), block_codes.astype(np.int64)
+
+
+def candidate_pairs(rows, blocks, max_block=MAX_BLOCK):
+    """Distinct (i, j), i < j, sharing a block of at most max_block keys"""
+    sizes = np.bincount(blocks)
+    keep = sizes[blocks] <= max_block
+    order = np.lexsort((rows[keep], blocks[keep]))
+    rows, blocks = rows[keep][order], blocks[keep][order]
+    left, right = [], []
+    # Every pair within a sorted block is (k, k + d) for some offset d below the block size
+    for d in range(1, min(max_block, len(rows))):
+        same = np.flatnonzero(blocks[d:] == blocks[:-d])
+        if len(same) == 0:
+            break
+        left.append(rows[same])
+        right.append(rows[same + d])
+    if not left:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    n = int(rows.max()) + 1
+    pairs = np.unique(np.concatenate(left) * n + np.concatenate(right))
+    return pairs // n, pairs % n
+
+
+def resolve_keys(keys, threshold=DEFAULT_THRESHOLD, max_block=MAX_BLOCK):
+    """Cluster label of each distinct key, plus the number of compared and linked pairs"""
+    keys = list(keys)
+    if not keys:
+        return np.zeros(0, dtype=np.int64), 0, 0
+    left, right = candidate_pairs(*blocking_keys(keys), max_block=max_block)
+    matrix = _trigram_matrix(keys)
+    score = np.asarray(matrix[left].multiply(matrix[right]).sum(axis=1)).ravel()
+    numbers, _ = pd.factorize(pd.Series(keys).str.findall(r'\d+').str.join(' '))
+    linked = (score >= threshold) & (numbers[left] == numbers[right])
+    graph = sparse.coo_matrix((np.ones(int(linked.sum())), (left[linked], right[linked])),
+                              shape=(len(keys), len(keys)))
+    _, labels = connected_components(graph, directed=False)
+    return labels.astype(np.int64), len(left), int(linked.sum())
+
+
+class CompanyIndex:
+    """
+    Raw company name -> company ID.
+
+    names has one row per distinct raw name: name, normalized, key, company_id
+    and count (rows carrying that spelling across the indexed datasets).
+    """
+
+    def __init__(self, names, threshold=DEFAULT_THRESHOLD, stats=None):
+        self.names = names.reset_index(drop=True)
+        self.threshold = threshold
+        self.stats = stats or {}
+        self._by_name = pd.Series(self.names['company_id'].to_numpy(), index=self.names['name'].to_numpy())
+        self._by_key = self.names.drop_duplicates('key').set_index('key')['company_id']
+
+    @classmethod
+    def build(cls, name_counts, previous=None, threshold=DEFAULT_THRESHOLD, max_block=MAX_BLOCK):
+        """Index {raw name: count}, keeping the IDs of a previous index for names it already covers"""
+        start = time.perf_counter()
+        counts = name_counts.groupby(level=0).sum()
+        if previous is not None:
+            # Spellings no longer present keep their ID (and last count) so the map only grows
+            counts = counts.combine_first(previous.names.set_index('name')['count'])
+        counts = counts[counts.index.notna()]
+        names = pd.DataFrame({'name': counts.index.astype(str), 'count': counts.to_numpy().astype(np.int64)})
+        names['normalized'] = normalize_company(names['name'])
+        names['key'] = company_key(names['normalized'])
+        names = names[names['key'].fillna('') != ''].reset_index(drop=True)
+
+        key_codes, keys = pd.factorize(names['key'])
+        labels, compared, linked = resolve_keys(keys, threshold, max_block)
+        cluster = labels[key_codes]
+
+        # Clusters inherit their smallest previous ID; the rest are numbered after the largest
+        prior = pd.Series(np.nan, index=names.index)
+        next_id = 0
+        if previous is not None and len(previous.names):
+            prior = names['name'].map(previous._by_name)
+            next_id = int(previous.names['company_id'].max()) + 1
+        inherited = prior.groupby(cluster).min()
+        fresh = inherited.index[inherited.isna()]
+        inherited[fresh] = np.arange(next_id, next_id + len(fresh))
+        names['company_id'] = inherited.to_numpy()[cluster].astype(np.int64)
+
+        stats = {'names': len(names), 'keys': len(keys), 'companies': int(names['company_id'].nunique()),
+                 'compared_pairs': compared, 'linked_pairs': linked,
+                 'seconds': round(time.perf_counter() - start, 3)}
+        return cls(names[['name', 'normalized', 'key', 'company_id', 'count']], threshold, stats)
+
+    def save(self, path=COMPANY_MAP_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.names.to_parquet(path, index=False)
+        path.with_suffix('.json').write_text(json.dumps({'threshold': self.threshold, **self.stats}, indent=2))
+
+    @classmethod
+    def load(cls, path=COMPANY_MAP_PATH):
+        path = Path(path)
+        meta = json.loads(path.with_suffix('.json').read_text())
+        return cls(pd.read_parquet(path), meta.pop('threshold'), meta)
+
+    @property
+    def canonical(self):
+        """Company ID -> its most frequent spelling"""
+        best = self.names.sort_values('count', ascending=False, kind='stable').drop_duplicates('company_id')
+        return best.set_index('company_id')['name'].sort_index()
+
+    def resolve(self, values):
+        """Company ID of each value (nullable Int64): exact spelling first, then the matching key"""
+        values = pd.Series(values)
+        codes, uniques = pd.factorize(values.astype('string'))
+        uniques = pd.Series(uniques, dtype='string')
+        ids = uniques.map(self._by_name).astype('Int64')
+        missing = ids.isna() & uniques.notna()
+        if missing.any():
+            keys = company_key(normalize_company(uniques[missing]))
+            ids[missing] = keys.map(self._by_key).astype('Int64')
+        resolved = ids.to_numpy(dtype='float64', na_value=np.nan)[codes]
+        resolved[codes < 0] = np.nan
+        return pd.Series(resolved, index=values.index).astype('Int64')
+
+    def variants(self, company_id):
+        return self.names[self.names['company_id'] == company_id].sort_values('count', ascending=False)
+
+
+def collect_names(datasets):
+    """Rows per raw company name across every COMPANY_SOURCES dataset present"""
+    counts = [datasets[name][column].value_counts(dropna=True)
+              for name, column in COMPANY_SOURCES.items()
+              if name in datasets and column in datasets[name].columns]
+    if not counts:
+        return pd.Series(dtype='int64')
+    counts = pd.concat([c.set_axis(c.index.astype(str)) for c in counts])
+    return counts.groupby(level=0).sum()
+
+
+def hiring_vs_layoffs(index, datasets):
+    """Per laid-off company: layoff events, employees laid off and postings in each dataset"""
+    layoffs = datasets['layoffs']
+    events = pd.DataFrame({'company_id': index.resolve(layoffs[COMPANY_SOURCES['layoffs']]),
+                           'total_layoffs': pd.to_numeric(layoffs['total_layoffs'], errors='coerce'),
+                           'year': layoffs['year'] if 'year' in layoffs.columns else pd.NA})
+    table = events.dropna(subset=['company_id']).groupby('company_id').agg(
+        layoff_events=('total_layoffs', 'size'), total_layoffs=('total_layoffs', 'sum'),
+        first_year=('year', 'min'), last_year=('year', 'max'))
+
+    for name in POSTING_SOURCES:
+        if name in datasets and COMPANY_SOURCES[name] in datasets[name].columns:
+            ids = index.resolve(datasets[name][COMPANY_SOURCES[name]]).dropna()
+            table[f"{name}_postings"] = ids.value_counts().reindex(table.index, fill_value=0)
+    posting_columns = [c for c in table.columns if c.endswith('_postings')]
+    table['total_postings'] = table[posting_columns].sum(axis=1)
+    table.insert(0, 'company', index.canonical.reindex(table.index))
+    return table.sort_values('total_layoffs', ascending=False)
+
+
+def print_hiring_vs_layoffs(table, top=15):
+    print("\n--- HIRING VS. LAYOFFS (TOP COMPANIES BY LAYOFFS) ---")
+    matched = int((table['total_postings'] > 0).sum())
+    print(f"{len(table):,} laid-off companies, {matched:,} with postings in the job datasets")
+    columns = ['company', 'layoff_events', 'total_layoffs', 'total_postings']
+    print(table[columns].head(top).to_string())
+
+
+def load_sources(sources=None):
+    datasets = {}
+    for name in sources or COMPANY_SOURCES:
+        columns = [COMPANY_SOURCES[name]] + (['total_layoffs', 'year'] if name == 'layoffs' else [])
+        try:
+            datasets[name], _ = read_dataset(name, columns=columns)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+    return datasets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve company names to IDs and join layoffs to postings")
+    parser.add_argument('--sources', nargs='+', choices=list(COMPANY_SOURCES), default=None)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Trigram cosine needed to link two company keys")
+    parser.add_argument('--rebuild', action='store_true', help="Ignore the stored map and renumber every company")
+    parser.add_argument('--map', type=Path, default=COMPANY_MAP_PATH)
+    parser.add_argument('--lookup', nargs='+', metavar='NAME', help="Resolve names with the stored map and exit")
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    if args.lookup:
+        try:
+            index = CompanyIndex.load(args.map)
+        except OSError:
+            print(f"✗ No company map at {args.map}; run without --lookup first")
+            return 1
+        for name, company_id in zip(args.lookup, index.resolve(pd.Series(args.lookup))):
+            if pd.isna(company_id):
+                print(f"✗ {name}: no match")
+                continue
+            variants = index.variants(company_id)['name'].head(5).tolist()
+            print(f"✓ {name} -> {company_id} {index.canonical[company_id]!r} (variants: {', '.join(variants)})")
+        return 0
+
+    datasets = load_sources(args.sources)
+    if not datasets:
+        print("✗ No company sources could be loaded")
+        return 1
+    previous = None
+    if not args.rebuild and args.map.exists():
+        previous = CompanyIndex.load(args.map)
+    index = CompanyIndex.build(collect_names(datasets), previous=previous, threshold=args.threshold)
+    index.save(args.map)
+    stats = index.stats
+    print(f"✓ {stats['names']:,} spellings -> {stats['keys']:,} keys -> {stats['companies']:,} companies "
+          f"({stats['compared_pairs']:,} blocked pairs scored, {stats['linked_pairs']:,} linked) "
+          f"in {stats['seconds']:.2f}s")
+    print(f"✓ Saved company map to {args.map}")
+
+    if 'layoffs' in datasets:
+        table = hiring_vs_layoffs(index, datasets)
+        print_hiring_vs_layoffs(table, args.top)
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        table.to_csv(RESULTS_DIR / 'hiring_vs_layoffs.csv')
+        print(f"\n✓ Saved {RESULTS_DIR / 'hiring_vs_layoffs.csv'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Skill Co-occurrence Engine for BDPA Tech Job Market Analysis
+Builds a sparse posting x skill matrix and mines companion skills and skill bundles from it
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from skill_engine import SKILL_SOURCES, PostingSkills, SkillStore
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = ANALYSIS_DIR / "results" / "cooccurrence"
+
+# Skill store datasets mined by default (any of skill_engine.SKILL_SOURCES can be chosen)
+DEFAULT_SOURCES = ('job_skills', 'ai_jobs')
+
+
+def load_posting_skills(sources=None):
+    """Each source's postings from the skill store, so sources share one canonical vocabulary"""
+    store = SkillStore()
+    mappings = {}
+    for name in sources or DEFAULT_SOURCES:
+        try:
+            mappings[name] = store.get(name)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            continue
+        print(f"✓ {name}: {mappings[name].n_postings:,} postings, "
+              f"{np.count_nonzero(mappings[name].counts()):,} distinct skills")
+    # Building a later source may have grown the vocabulary; give every mapping the final one
+    vocab = store.vocabulary.array()
+    return {name: PostingSkills(vocab, m.codes, m.offsets, m.posting_ids) for name, m in mappings.items()}
+
+
+def combine_posting_skills(mappings):
+    """Stack several PostingSkills into one over a merged vocabulary"""
+    mappings = list(mappings)
+    if len(mappings) == 1:
+        return mappings[0]
+    if all(m.vocab is mappings[0].vocab for m in mappings):
+        # Already over one vocabulary (the skill store): only the postings are stacked
+        offsets = [mappings[0].offsets[:1]]
+        mention_base = 0
+        for m in mappings:
+            offsets.append(m.offsets[1:] + mention_base)
+            mention_base += m.n_mentions
+        return PostingSkills(mappings[0].vocab, np.concatenate([m.codes for m in mappings]),
+                             np.concatenate(offsets),
+                             np.concatenate([np.asarray(m.posting_ids).astype(str) for m in mappings]))
+    codes_map, vocab = pd.factorize(np.concatenate([m.vocab for m in mappings]))
+    codes, offsets = [], [np.zeros(1, dtype=np.int64)]
+    vocab_base = mention_base = 0
+    for m in mappings:
+        codes.append(codes_map[vocab_base:vocab_base + len(m.vocab)][m.codes])
+        offsets.append(m.offsets[1:] + mention_base)
+        vocab_base += len(m.vocab)
+        mention_base += m.n_mentions
+    posting_ids = np.concatenate([m.posting_ids.astype(str) for m in mappings])
+    return PostingSkills(vocab, np.concatenate(codes), np.concatenate(offsets), posting_ids)
+
+
+def posting_skill_matrix(mapping, drop_empty=True):
+    """Binary CSR posting x skill matrix (repeated skills within a posting count once)"""
+    matrix = sparse.csr_matrix(
+        (np.ones(mapping.n_mentions, dtype=np.float32), mapping.codes.copy(), mapping.offsets.copy()),
+        shape=(mapping.n_postings, len(mapping.vocab)),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    vocab = mapping.vocab
+    if drop_empty:
+        empty = np.flatnonzero(vocab == '')
+        if len(empty):
+            keep = np.setdiff1d(np.arange(len(vocab)), empty)
+            matrix, vocab = matrix[:, keep], vocab[keep]
+    return matrix, vocab
+
+
+class CooccurrenceModel:
+    """
+    Skill x skill co-occurrence with PMI and lift.
+
+    counts[i, j] is the number of postings listing both skills; support[i] is the
+    number of postings listing skill i. Skills below min_support are dropped
+    before the product so the vocabulary's long tail does not densify it.
+    """
+
+    def __init__(self, matrix, vocab, min_support=5):
+        support = np.asarray(matrix.sum(axis=0)).ravel()
+        keep = np.flatnonzero(support >= min_support)
+        matrix = matrix[:, keep]
+
+        self.vocab = np.asarray(vocab)[keep]
+        self.n_postings = matrix.shape[0]
+        self.support = support[keep].astype(np.int64)
+        self.matrix = matrix
+        self._columns = matrix.tocsc()
+
+        counts = (matrix.T @ matrix).tocsr()
+        counts.setdiag(0)
+        counts.eliminate_zeros()
+        counts.data = counts.data.astype(np.int64)
+        self.counts = counts
+        self._position = {skill: i for i, skill in enumerate(self.vocab)}
+
+    def _pair_arrays(self):
+        coo = self.counts.tocoo()
+        expected = self.support[coo.row].astype(np.float64) * self.support[coo.col] / self.n_postings
+        lift = coo.data / expected
+        return coo.row, coo.col, coo.data, np.log(lift), lift
+
+    def top_companions(self, k=10, metric='count', min_cooccurrence=5):
+        """Top-k companion skills for every skill as a long DataFrame"""
+        rows, cols, counts, pmi, lift = self._pair_arrays()
+        scores = {'count': counts.astype(np.float64), 'pmi': pmi, 'lift': lift}[metric]
+
+        mask = counts >= min_cooccurrence
+        rows, cols, counts, pmi, lift, scores = (a[mask] for a in (rows, cols, counts, pmi, lift, scores))
+
+        # Sort by (skill, -score) once, then keep the first k entries of each skill's run
+        order = np.lexsort((-scores, rows))
+        rows, cols, counts, pmi, lift = (a[order] for a in (rows, cols, counts, pmi, lift))
+        run_start = np.searchsorted(rows, rows, side='left')
+        rank = np.arange(len(rows)) - run_start
+        keep = rank < k
+
+        return pd.DataFrame({
+            'skill': self.vocab[rows[keep]],
+            'companion': self.vocab[cols[keep]],
+            'rank': rank[keep] + 1,
+            'co_count': counts[keep],
+            'pmi': np.round(pmi[keep], 4),
+            'lift': np.round(lift[keep], 4),
+        })
+
+    def top_pairs(self, n=50, metric='count', min_cooccurrence=5):
+        """Globally strongest skill pairs (each unordered pair once)"""
+        rows, cols, counts, pmi, lift = self._pair_arrays()
+        scores = {'count': counts.astype(np.float64), 'pmi': pmi, 'lift': lift}[metric]
+        mask = (rows < cols) & (counts >= min_cooccurrence)
+        idx = np.flatnonzero(mask)
+        if len(idx) > n:
+            idx = idx[np.argpartition(-scores[idx], n - 1)[:n]]
+        idx = idx[np.argsort(-scores[idx], kind='stable')]
+        return pd.DataFrame({
+            'skill_a': self.vocab[rows[idx]], 'skill_b': self.vocab[cols[idx]],
+            'co_count': counts[idx], 'pmi': np.round(pmi[idx], 4), 'lift': np.round(lift[idx], 4),
+        })
+
+    def postings_with(self, skill):
+        """Sorted row ids of the postings listing skill"""
+        j = self._position[skill]
+        return self._columns.indices[self._columns.indptr[j]:self._columns.indptr[j + 1]]
+
+    def bundle_support(self, skills):
+        """Exact number of postings listing every skill in `skills`"""
+        rows = self.postings_with(skills[0])
+        for skill in skills[1:]:
+            rows = np.intersect1d(rows, self.postings_with(skill), assume_unique=True)
+        return len(rows)
+
+    def mine_bundles(self, n=25, seed_pairs=200, candidates=10, min_support=5):
+        """
+        Three-skill bundles grown from the strongest pairs.
+
+        For each of the top seed pairs (a, b), every skill c among both a's and
+        b's top companions is a candidate; its exact support is counted from the
+        posting matrix and the n best-supported distinct bundles are returned.
+        """
+        companions = self.top_companions(k=candidates, min_cooccurrence=min_support)
+        by_skill = companions.groupby('skill')['companion'].apply(set).to_dict()
+
+        seen, bundles = set(), []
+        for a, b in self.top_pairs(n=seed_pairs, min_cooccurrence=min_support)[['skill_a', 'skill_b']].itertuples(index=False):
+            pair_rows = None
+            for c in by_skill.get(a, set()) & by_skill.get(b, set()):
+                key = frozenset((a, b, c))
+                if key in seen:
+                    continue
+                seen.add(key)
+                if pair_rows is None:
+                    pair_rows = np.intersect1d(self.postings_with(a), self.postings_with(b), assume_unique=True)
+                support = len(np.intersect1d(pair_rows, self.postings_with(c), assume_unique=True))
+                if support >= min_support:
+                    bundles.append((sorted(key), support))
+
+        bundles.sort(key=lambda x: x[1], reverse=True)
+        return pd.DataFrame([
+            {'bundle': ' + '.join(skills), 'support': support,
+             'support_pct': round(support / self.n_postings * 100, 3)}
+            for skills, support in bundles[:n]
+        ])
+
+    def companions_json(self, k=10, metric='count', min_cooccurrence=5):
+        """{skill: [companion, ...]} in rank order, the shape the frontend's skillCombinations uses"""
+        top = self.top_companions(k=k, metric=metric, min_cooccurrence=min_cooccurrence)
+        return {skill: group['companion'].tolist() for skill, group in top.groupby('skill', sort=False)}
+
+
+def build_model(sources=None, min_support=5):
+    mappings = load_posting_skills(sources)
+    if not mappings:
+        raise RuntimeError("No skill sources could be loaded")
+    matrix, vocab = posting_skill_matrix(combine_posting_skills(mappings.values()))
+    return CooccurrenceModel(matrix, vocab, min_support=min_support)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine skill co-occurrence from job postings")
+    parser.add_argument('--sources', nargs='+', choices=sorted(SKILL_SOURCES), default=None)
+    parser.add_argument('--top-k', type=int, default=10, help="Companions kept per skill")
+    parser.add_argument('--min-support', type=int, default=5, help="Minimum postings per skill and per pair")
+    parser.add_argument('--metric', choices=['count', 'pmi', 'lift'], default='count')
+    parser.add_argument('--out-dir', type=Path, default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = build_model(args.sources, min_support=args.min_support)
+    print(f"✓ Co-occurrence over {model.n_postings:,} postings × {len(model.vocab):,} skills "
+          f"({model.counts.nnz:,} non-zero pairs) in {time.perf_counter() - start:.2f}s")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    companions = model.top_companions(k=args.top_k, metric=args.metric, min_cooccurrence=args.min_support)
+    companions.to_csv(args.out_dir / "skill_companions.csv", index=False)
+    model.top_pairs(n=100, metric=args.metric, min_cooccurrence=args.min_support).to_csv(
+        args.out_dir / "top_skill_pairs.csv", index=False)
+    bundles = model.mine_bundles(min_support=args.min_support)
+    bundles.to_csv(args.out_dir / "skill_bundles.csv", index=False)
+    with open(args.out_dir / "skill_combinations.json", "w") as f:
+        json.dump(model.companions_json(k=args.top_k, metric=args.metric, min_cooccurrence=args.min_support),
+                  f, indent=2)
+
+    print(f"✓ Saved companions, pairs, bundles and skill_combinations.json to {args.out_dir}")
+    print(f"Total time: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Columnar Dataset Cache for BDPA Tech Job Market Analysis
+Parses each ML_Ready CSV once into Parquet and reuses it until the source file changes
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+DATA_DIR = ANALYSIS_DIR.parent / "Kaggle Datasets" / "ML_Ready"
+JOB_MARKET_2025_DIR = ANALYSIS_DIR.parent / "2025 Job Market"
+CACHE_DIR = ANALYSIS_DIR / "cache" / "datasets"
+
+# Bump when the on-disk layout or schema handling changes so old caches are rebuilt
+CACHE_FORMAT_VERSION = 2
+
+# Dataset name -> source CSV inside DATA_DIR
+DATASET_FILES = {
+    'job_postings': 'tech_job_postings_clean.csv',
+    'job_skills': 'tech_job_skills_clean.csv',
+    'it_jobs': 'it_jobs_clean.csv',
+    'linkedin_postings': 'tech_linkedin_postings_clean.csv',
+    'layoffs': 'tech_layoffs_clean.csv',
+    'layoff_trends': 'layoff_trends_30y_clean.csv',
+    'dice_jobs': 'dice_jobs_clean.csv',
+    'unified_jobs': 'tech_jobs_unified.csv',
+}
+
+# Dataset name -> source CSV inside JOB_MARKET_2025_DIR (overlapping snapshots of AI job postings)
+JOB_MARKET_2025_FILES = {
+    'ai_jobs': 'ai_job_dataset.csv',
+    'ai_jobs_snapshot': 'ai_job_dataset1.csv',
+}
+
+_AI_JOBS_SCHEMA = {
+    'job_id': 'string[pyarrow]', 'job_title': 'category', 'salary_usd': 'float64',
+    'salary_currency': 'category', 'salary_local': 'float64',
+    'experience_level': 'category', 'employment_type': 'category',
+    'company_location': 'category', 'company_size': 'category',
+    'employee_residence': 'category', 'remote_ratio': 'Int8',
+    'required_skills': 'string[pyarrow]', 'education_required': 'category',
+    'years_experience': 'Int8', 'industry': 'category', 'posting_date': 'category',
+    'application_deadline': 'category', 'job_description_length': 'Int16',
+    'benefits_score': 'float32', 'company_name': 'category',
+}
+
+# Dtype plan per dataset (see Kaggle Datasets/ML_Ready/README.md), applied at read time:
+# - 'category' for repetitive text (locations, companies, levels, work types, dates),
+# - 'string[pyarrow]' for mostly-unique text (ids, links, titles, skill lists),
+# - the smallest nullable integer that holds years, months and small counts,
+# - float32 for counts and percentages; salaries stay float64 so reported figures don't move.
+# Columns not listed here are left to pandas' inference.
+DATASET_SCHEMAS = {
+    'job_postings': {
+        'job_id': 'string[pyarrow]', 'company_name': 'category', 'title': 'string[pyarrow]',
+        'location': 'category', 'min_salary': 'float64', 'max_salary': 'float64',
+        'med_salary': 'float64', 'normalized_salary': 'float64',
+        'pay_period': 'category', 'currency': 'category', 'views': 'float32',
+        'applies': 'float32', 'formatted_work_type': 'category',
+        'formatted_experience_level': 'category', 'remote_allowed': 'boolean',
+        'posted_year': 'Int16', 'posted_month': 'Int8', 'zip_code': 'category',
+    },
+    'job_skills': {
+        'job_link': 'string[pyarrow]', 'job_skills': 'string[pyarrow]',
+    },
+    'it_jobs': {
+        'job_title': 'string[pyarrow]', 'company_name': 'category', 'location': 'category',
+        'experience_min_years': 'float32', 'experience_max_years': 'float32',
+    },
+    'linkedin_postings': {
+        'job_link': 'string[pyarrow]', 'job_title': 'string[pyarrow]', 'company': 'category',
+        'job_location': 'category', 'search_city': 'category',
+        'search_country': 'category', 'job_level': 'category', 'job_type': 'category',
+        'first_seen': 'category', 'first_seen_year': 'Int16',
+        'first_seen_month': 'Int8',
+    },
+    'layoffs': {
+        'company': 'category', 'total_layoffs': 'float32',
+        'impacted_workforce_percentage': 'float32', 'reported_date': 'category',
+        'industry': 'category', 'headquarter_location': 'category',
+        'status': 'category', 'year': 'Int16', 'month': 'Int8',
+    },
+    'layoff_trends': {
+        'year': 'Int16', 'layoffs': 'float64', 'reason_for_layoffs': 'category',
+        'industry_focus': 'category', 'global_event': 'category',
+        'job_sector_growthmillions': 'float32', 'ai_job_percentagepct': 'float32',
+        'future_job_trends': 'category',
+    },
+    'dice_jobs': {
+        'jobid': 'string[pyarrow]', 'company': 'category', 'jobtitle': 'string[pyarrow]',
+        'joblocation_address': 'category', 'employmenttype_jobstatus': 'category',
+        'skills': 'string[pyarrow]', 'postdate': 'category', 'post_year': 'Int16',
+        'post_month': 'Int8',
+    },
+    'unified_jobs': {
+        'job_id': 'string[pyarrow]', 'source': 'category', 'job_title': 'string[pyarrow]',
+        'company_name': 'category', 'location': 'category',
+        'experience_min_years': 'float32', 'experience_max_years': 'float32',
+        'min_salary': 'float64', 'max_salary': 'float64', 'med_salary': 'float64',
+        'job_level': 'category', 'job_type': 'category', 'remote_allowed': 'boolean',
+        'posted_year': 'Int16', 'posted_month': 'Int8',
+    },
+    'ai_jobs': _AI_JOBS_SCHEMA,
+    'ai_jobs_snapshot': _AI_JOBS_SCHEMA,
+}
+
+# Dtypes that read_csv can produce directly while parsing (text); the rest are cast afterwards
+TEXT_DTYPES = ('string', 'string[pyarrow]', 'category')
+
+_BOOLEAN_VALUES = {
+    'true': True, 'false': False, '1': True, '0': False,
+    '1.0': True, '0.0': False, 'yes': True, 'no': False,
+}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def schema_fingerprint(schema):
+    """Stable hash of a column -> dtype mapping, stored alongside each cache entry"""
+    payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'schema': schema}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def apply_schema(df, schema):
+    """Cast the columns of df that appear in schema to their declared types"""
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'boolean':
+            normalized = df[col].astype('string').str.strip().str.lower()
+            df[col] = normalized.map(_BOOLEAN_VALUES).astype('boolean')
+        elif dtype.startswith(('float', 'Int')):
+            numeric = pd.to_numeric(df[col], errors='coerce').astype('float64')
+            df[col] = numeric.round().astype(dtype) if dtype.startswith('Int') else numeric.astype(dtype)
+        elif df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def text_dtypes(schema, columns):
+    """read_csv dtype argument for the text columns of schema present in columns"""
+    return {col: schema[col] for col in columns if schema.get(col) in TEXT_DTYPES}
+
+
+def default_dtype_memory(df):
+    """
+    Estimated bytes of df under pandas' default inference (object strings, 64-bit numbers).
+
+    Each object string costs an 8-byte pointer plus a str object of about 49 bytes
+    and its length; numeric and boolean columns cost 8 bytes per value.
+    """
+    total = 0
+    for col in df.columns:
+        column = df[col]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            sizes = 49 + column.cat.categories.astype(str).str.len().to_numpy(dtype=np.int64)
+            codes = column.cat.codes.to_numpy()
+            total += 8 * len(column) + int(sizes[codes[codes >= 0]].sum())
+        elif pd.api.types.is_string_dtype(column.dtype):
+            lengths = column.str.len()
+            total += 8 * len(column) + int((49 + lengths).sum())
+        else:
+            total += 8 * len(column)
+    return total
+
+
+def read_csv_with_schema(csv_path, schema, **read_kwargs):
+    """Read a CSV, parsing text columns straight into their planned dtypes and casting the rest after"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    df = pd.read_csv(csv_path, dtype=text_dtypes(schema, header), **read_kwargs)
+    return apply_schema(df, schema)
+
+
+def dataset_path(name, data_dir=None):
+    """Source CSV of a registered dataset (ML_Ready or 2025 Job Market)"""
+    if name in JOB_MARKET_2025_FILES:
+        return Path(data_dir or JOB_MARKET_2025_DIR) / JOB_MARKET_2025_FILES[name]
+    return Path(data_dir or DATA_DIR) / DATASET_FILES[name]
+
+
+def source_cache_dir(csv_path, cache_dir=None):
+    """
+    Where a source CSV's cache lives: cache_dir itself for the repo's own data
+    directories, and a subdirectory keyed on the source directory for any other
+    copy (synthetic trees, benchmarks, --data-dir runs), so those never replace
+    or thrash the real datasets' cache. cache_dir defaults to CACHE_DIR as it is
+    at call time, so a caller can redirect every cache by reassigning it.
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    parent = Path(csv_path).resolve().parent
+    if parent in (DATA_DIR.resolve(), JOB_MARKET_2025_DIR.resolve()):
+        return cache_dir
+    return cache_dir / "sources" / hashlib.sha256(str(parent).encode('utf-8')).hexdigest()[:12]
+
+
+def _manifest_path(name, cache_dir):
+    return Path(cache_dir) / f"{name}.json"
+
+
+def _parquet_path(name, cache_dir):
+    return Path(cache_dir) / f"{name}.parquet"
+
+
+def _read_manifest(name, cache_dir):
+    try:
+        with open(_manifest_path(name, cache_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(name, cache_dir, manifest):
+    with open(_manifest_path(name, cache_dir), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def cache_status(name, csv_path, cache_dir=None):
+    """
+    Decide whether the cached copy of a dataset is still valid.
+
+    Returns (is_valid, manifest). Size and mtime are checked first so warm runs
+    never hash the source; the content hash is only computed when the mtime moved,
+    which lets a touched-but-unchanged CSV keep its cache. A cache built from a
+    different source path is never valid.
+    """
+    cache_dir = source_cache_dir(csv_path, cache_dir)
+    schema = DATASET_SCHEMAS.get(name, {})
+    manifest = _read_manifest(name, cache_dir)
+    stat = Path(csv_path).stat()
+
+    if (manifest is None
+            or manifest.get('source') != str(Path(csv_path).resolve())
+            or manifest.get('schema') != schema_fingerprint(schema)
+            or manifest.get('size') != stat.st_size
+            or not _parquet_path(name, cache_dir).exists()):
+        return False, manifest
+
+    if manifest.get('mtime_ns') == stat.st_mtime_ns:
+        return True, manifest
+
+    if manifest.get('sha256') == file_sha256(csv_path):
+        manifest['mtime_ns'] = stat.st_mtime_ns
+        _write_manifest(name, cache_dir, manifest)
+        return True, manifest
+
+    return False, manifest
+
+
+def build_cache(name, csv_path, cache_dir=None):
+    """Parse the source CSV with its schema and write the Parquet copy plus manifest"""
+    cache_dir = source_cache_dir(csv_path, cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    schema = DATASET_SCHEMAS.get(name, {})
+
+    df = read_csv_with_schema(csv_path, schema)
+    stat = Path(csv_path).stat()
+
+    tmp_path = _parquet_path(name, cache_dir).with_suffix('.parquet.tmp')
+    df.to_parquet(tmp_path, index=False)
+    tmp_path.replace(_parquet_path(name, cache_dir))
+
+    _write_manifest(name, cache_dir, {
+        'dataset': name,
+        'source': str(Path(csv_path).resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(csv_path),
+        'schema': schema_fingerprint(schema),
+        'rows': len(df),
+    })
+    return df
+
+
+def read_dataset(name, data_dir=None, cache_dir=None, use_cache=True, columns=None):
+    """
+    Load one registered dataset by name (see DATASET_FILES and JOB_MARKET_2025_FILES).
+
+    Serves the Parquet copy when it is valid and rebuilds it from the CSV otherwise.
+    Returns (DataFrame, cache_hit).
+    """
+    csv_path = dataset_path(name, data_dir)
+    schema = DATASET_SCHEMAS.get(name, {})
+
+    if not use_cache:
+        df = read_csv_with_schema(csv_path, schema)
+        return (df[columns] if columns else df), False
+
+    is_valid, _ = cache_status(name, csv_path, cache_dir)
+    if is_valid:
+        try:
+            parquet_path = _parquet_path(name, source_cache_dir(csv_path, cache_dir))
+            return pd.read_parquet(parquet_path, columns=columns), True
+        except Exception as e:
+            print(f"⚠ Cache for {name} unreadable ({e}), rebuilding")
+
+    try:
+        df = build_cache(name, csv_path, cache_dir)
+    except ImportError as e:
+        # No Parquet engine installed: fall back to plain CSV parsing
+        print(f"⚠ Columnar cache disabled ({e})")
+        df = read_csv_with_schema(csv_path, schema)
+    return (df[columns] if columns else df), False
+
+
+def clear_cache(cache_dir=None):
+    """Remove every cached dataset and manifest, including those of other source directories"""
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    if not cache_dir.exists():
+        return 0
+    removed = 0
+    for path in cache_dir.rglob('*'):
+        if path.is_file() and path.suffix in ('.parquet', '.json', '.tmp'):
+            path.unlink()
+            removed += 1
+    return removed
@@ -0,0 +1,321 @@
+"""
+Sketch-Based Dataset Profiler for BDPA Tech Job Market Analysis
+Profiles every column of a dataset in one pass: null rate, approximate distinct count (HyperLogLog),
+quantiles for numeric columns (DDSketch) and heavy-hitter values for text columns (Misra-Gries)
+
+Every sketch is mergeable, so profiles of chunks, files or daily drops can be combined
+from their saved JSON without rereading the data.
+
+Usage:
+    python analysis/dataset_profiler.py [DATASET ...] [--chunksize 200000]
+    python analysis/dataset_profiler.py --merge day1.json day2.json --out merged.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import DATASET_FILES, DATASET_SCHEMAS, JOB_MARKET_2025_FILES, apply_schema, dataset_path, text_dtypes
+from sketches import HeavyHitters, HyperLogLog, QuantileSketch, RunningStats
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+PROFILE_PATH = ANALYSIS_DIR / "results" / "dataset_profiles.json"
+
+PROFILE_VERSION = 1
+HLL_PRECISION = 12
+QUANTILE_ACCURACY = 0.001
+QUANTILE_BUCKETS = 8192
+TOP_VALUES = 50
+REPORTED_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+DEFAULT_CHUNKSIZE = 200_000
+
+
+class ColumnProfile:
+    """Mergeable summary of one column; numeric columns get moments and quantiles, text columns top values"""
+
+    def __init__(self, name, kind, dtype=''):
+        self.name = name
+        self.kind = kind
+        self.dtype = dtype
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog(HLL_PRECISION)
+        if kind == 'numeric':
+            self.stats = RunningStats()
+            self.quantiles = QuantileSketch(QUANTILE_ACCURACY, QUANTILE_BUCKETS)
+        else:
+            self.top = HeavyHitters(TOP_VALUES)
+            self.lengths = RunningStats()
+
+    @staticmethod
+    def kind_of(series):
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or (pd.api.types.is_numeric_dtype(dtype)
+                                                  and not isinstance(dtype, pd.CategoricalDtype)):
+            return 'numeric'
+        return 'text'
+
+    def update(self, series):
+        self.count += len(series)
+        if self.kind == 'numeric':
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            self.nulls += len(series) - len(values)
+            # Hash as float64 so the same numbers match across int/float files
+            self.distinct.update_hashes(pd.util.hash_array(values, categorize=False))
+            self.stats.update(values)
+            self.quantiles.update(values)
+            return self
+
+        # One hash-table pass: codes over the distinct values, whose hashes, counts
+        # and lengths feed every text sketch without touching the rows again
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories.to_numpy(dtype=object)
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            uniques = np.asarray(uniques, dtype=object)
+        present = codes[codes >= 0]
+        self.nulls += len(codes) - len(present)
+        counts = np.bincount(present, minlength=len(uniques))
+        seen = counts > 0
+        uniques, counts = uniques[seen], counts[seen]
+        self.distinct.update_hashes(pd.util.hash_array(uniques, categorize=False))
+        self.top.update_counts(uniques, counts)
+        lengths = pd.Series(uniques, dtype=object).str.len().to_numpy(dtype=np.float64, na_value=0)
+        self.lengths.merge(_weighted_stats(lengths, counts))
+        return self
+
+    def merge(self, other):
+        if other.kind != self.kind:
+            raise ValueError(f"Column {self.name} is {self.kind} in one profile and {other.kind} in the other")
+        self.count += other.count
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.kind == 'numeric':
+            self.stats.merge(other.stats)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.top.merge(other.top)
+            self.lengths.merge(other.lengths)
+        return self
+
+    @property
+    def null_rate(self):
+        return self.nulls / self.count if self.count else 0.0
+
+    def _quantile(self, q):
+        """Sketch quantile clamped to the exact min/max, which its relative error can overshoot"""
+        return min(max(self.quantiles.quantile(q), self.stats.min), self.stats.max)
+
+    def summary(self):
+        """Human-readable figures for the profile file and console report"""
+        summary = {'dtype': self.dtype, 'kind': self.kind, 'count': self.count, 'nulls': self.nulls,
+                   'null_rate': round(self.null_rate, 6), 'approx_distinct': round(self.distinct.estimate())}
+        if self.kind == 'numeric':
+            stats = self.stats
+            summary.update({'min': stats.min if stats.count else None, 'max': stats.max if stats.count else None,
+                            'mean': stats.mean if stats.count else None,
+                            'std': None if stats.count < 2 else stats.std,
+                            'quantiles': {f"p{round(q * 100)}": self._quantile(q)
+                                          for q in REPORTED_QUANTILES} if stats.count else {}})
+        else:
+            summary.update({'mean_length': round(self.lengths.mean, 2) if self.lengths.count else None,
+                            'max_length': self.lengths.max if self.lengths.count else None,
+                            'top_values': self.top.top(10), 'top_error': self.top.error})
+        return summary
+
+    def to_dict(self):
+        data = {'name': self.name, 'kind': self.kind, 'dtype': self.dtype, 'count': self.count, 'nulls': self.nulls,
+                'distinct': self.distinct.to_dict()}
+        if self.kind == 'numeric':
+            data.update(stats=self.stats.to_dict(), quantiles=self.quantiles.to_dict())
+        else:
+            data.update(top=self.top.to_dict(), lengths=self.lengths.to_dict())
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        column = cls(data['name'], data['kind'], data.get('dtype', ''))
+        column.count, column.nulls = data['count'], data['nulls']
+        column.distinct = HyperLogLog.from_dict(data['distinct'])
+        if column.kind == 'numeric':
+            column.stats = RunningStats.from_dict(data['stats'])
+            column.quantiles = QuantileSketch.from_dict(data['quantiles'])
+        else:
+            column.top = HeavyHitters.from_dict(data['top'])
+            column.lengths = RunningStats.from_dict(data['lengths'])
+        return column
+
+
+def _weighted_stats(values, weights):
+    """RunningStats of values repeated weights times, without materializing the repeats"""
+    stats = RunningStats()
+    total = int(weights.sum())
+    if total == 0:
+        return stats
+    values = values.astype(np.float64)
+    stats.count = total
+    stats.mean = float((values * weights).sum() / total)
+    stats.m2 = float((weights * (values - stats.mean) ** 2).sum())
+    stats.min, stats.max = float(values.min()), float(values.max())
+    return stats
+
+
+class DatasetProfile:
+    """Column profiles of one dataset, built chunk by chunk and mergeable across chunks or files"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.columns = {}
+        self.sources = []
+
+    def update(self, frame):
+        self.rows += len(frame)
+        for col in frame.columns:
+            series = frame[col]
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile(col, ColumnProfile.kind_of(series), str(series.dtype))
+            self.columns[col].update(series)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col, column in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(column)
+            else:
+                self.columns[col] = ColumnProfile.from_dict(column.to_dict())
+        self.sources += other.sources
+        return self
+
+    def summary(self):
+        return {'rows': self.rows, 'columns': {col: column.summary() for col, column in self.columns.items()}}
+
+    def to_dict(self):
+        return {'name': self.name, 'rows': self.rows, 'sources': self.sources,
+                'summary': self.summary(),
+                'sketches': [column.to_dict() for column in self.columns.values()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data['name'])
+        profile.rows = data['rows']
+        profile.sources = list(data.get('sources', []))
+        for column in data['sketches']:
+            profile.columns[column['name']] = ColumnProfile.from_dict(column)
+        return profile
+
+
+def profile_frame(name, frame, chunk_rows=DEFAULT_CHUNKSIZE):
+    """Profile an in-memory frame, one row block at a time to bound temporary memory"""
+    profile = DatasetProfile(name)
+    for start in range(0, len(frame), chunk_rows):
+        profile.update(frame.iloc[start:start + chunk_rows])
+    return profile
+
+
+def profile_csv(name, csv_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Profile a registered dataset straight from its CSV, reading chunksize rows at a time"""
+    csv_path = Path(csv_path or dataset_path(name))
+    schema = DATASET_SCHEMAS.get(name, {})
+    header = pd.read_csv(csv_path, nrows=0).columns
+    profile = DatasetProfile(name)
+    for chunk in pd.read_csv(csv_path, dtype=text_dtypes(schema, header), chunksize=chunksize):
+        profile.update(apply_schema(chunk, schema))
+    profile.sources.append(str(csv_path))
+    return profile
+
+
+def write_profiles(profiles, path=PROFILE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'version': PROFILE_VERSION, 'datasets': {p.name: p.to_dict() for p in profiles}}
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(payload, f, default=_json_default)
+    tmp.replace(path)
+    return path
+
+
+def load_profiles(path):
+    with open(path) as f:
+        payload = json.load(f)
+    return [DatasetProfile.from_dict(data) for data in payload['datasets'].values()]
+
+
+def merge_profile_files(paths):
+    """Merge saved profile files dataset by dataset (e.g. one file per daily drop)"""
+    merged = {}
+    for path in paths:
+        for profile in load_profiles(path):
+            if profile.name in merged:
+                merged[profile.name].merge(profile)
+            else:
+                merged[profile.name] = profile
+    return list(merged.values())
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def print_profile(profile):
+    print(f"\n{profile.name.upper()}")
+    print("-" * 80)
+    print(f"Rows: {profile.rows:,} | Columns: {len(profile.columns)}")
+    for col, column in profile.columns.items():
+        s = column.summary()
+        line = (f"  • {col:32s} | {s['dtype']:15s} | {s['null_rate'] * 100:5.1f}% missing "
+                f"| ~{s['approx_distinct']:,} distinct")
+        if column.kind == 'numeric' and s['quantiles']:
+            line += f" | p50 {s['quantiles']['p50']:,.4g} [{s['min']:,.4g} … {s['max']:,.4g}]"
+        elif column.kind == 'text' and s['top_values']:
+            value, count = s['top_values'][0]
+            line += f" | top {str(value)[:30]!r} ({count:,})"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Single-pass sketch profiles of the job market datasets")
+    parser.add_argument('datasets', nargs='*', help="Datasets to profile (default: every ML_Ready and 2025 dataset)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--merge', nargs='+', type=Path, metavar='PROFILE_JSON',
+                        help="Merge saved profile files instead of reading data")
+    parser.add_argument('--out', type=Path, default=PROFILE_PATH)
+    args = parser.parse_args(argv)
+
+    available = list(DATASET_FILES) + list(JOB_MARKET_2025_FILES)
+    unknown = [name for name in args.datasets if name not in available]
+    if unknown:
+        parser.error(f"unknown dataset(s) {', '.join(unknown)} (available: {', '.join(available)})")
+
+    start = time.perf_counter()
+    if args.merge:
+        profiles = merge_profile_files(args.merge)
+        print(f"✓ Merged {len(args.merge)} profile files")
+    else:
+        profiles = []
+        for name in args.datasets or available:
+            try:
+                profiles.append(profile_csv(name, chunksize=args.chunksize))
+            except Exception as e:
+                print(f"✗ Skipping {name}: {e}")
+                continue
+            print(f"✓ Profiled {name}: {profiles[-1].rows:,} rows")
+
+    for profile in profiles:
+        print_profile(profile)
+    out = write_profiles(profiles, args.out)
+    print(f"\n✓ Saved {len(profiles)} profiles to {out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -178,41 +178,47 @@ market_analysis_results = {
     }
 }
 
-print("📊 MARKET-DRIVEN GAP ANALYSIS EXAMPLE")
-print("="*50)
-print(f"User Profile: {example_user_profile['year']} {example_user_profile['major']} student")
-print(f"Target Role: Backend SWE Intern")
-print(f"Current Skills: {', '.join(example_user_profile['skills'])}")
-print()
+def main():
+    """Print the example gap analysis"""
+    print("📊 MARKET-DRIVEN GAP ANALYSIS EXAMPLE")
+    print("="*50)
+    print(f"User Profile: {example_user_profile['year']} {example_user_profile['major']} student")
+    print(f"Target Role: Backend SWE Intern")
+    print(f"Current Skills: {', '.join(example_user_profile['skills'])}")
+    print()
+
+    print("🎯 CRITICAL SKILL GAPS IDENTIFIED:")
+    for gap in market_analysis_results['gap_analysis']['critical_gaps']:
+        print(f"• {gap['skill'].upper()}")
+        print(f"  Market Demand: {gap['market_demand']:,} job mentions")
+        print(f"  Time to Learn: {gap['time_to_learn']}")
+        print(f"  Impact: {gap['career_impact']}")
+        print()
 
-print("🎯 CRITICAL SKILL GAPS IDENTIFIED:")
-for gap in market_analysis_results['gap_analysis']['critical_gaps']:
-    print(f"• {gap['skill'].upper()}")
-    print(f"  Market Demand: {gap['market_demand']:,} job mentions")
-    print(f"  Time to Learn: {gap['time_to_learn']}")
-    print(f"  Impact: {gap['career_impact']}")
+    print("⚡ QUICK WINS:")
+    for win in market_analysis_results['gap_analysis']['quick_wins']:
+        print(f"• {win['skill']}: {win['action']}")
     print()
 
-print("⚡ QUICK WINS:")
-for win in market_analysis_results['gap_analysis']['quick_wins']:
-    print(f"• {win['skill']}: {win['action']}")
-print()
+    print("💡 KEY RECOMMENDATIONS:")
+    print("Immediate (1-2 weeks):")
+    for rec in market_analysis_results['actionable_recommendations']['immediate']:
+        print(f"  • {rec['action']}")
+    print()
+
+    print("📈 MARKET POSITION:")
+    print(f"• {market_analysis_results['market_insights']['industry_position']}")
+    print(f"• {market_analysis_results['market_insights']['salary_impact']}")
+    print(f"• {market_analysis_results['market_insights']['career_trajectory']}")
+    print()
 
-print("💡 KEY RECOMMENDATIONS:")
-print("Immediate (1-2 weeks):")
-for rec in market_analysis_results['actionable_recommendations']['immediate']:
-    print(f"  • {rec['action']}")
-print()
+    print("📅 4-WEEK STUDY PLAN:")
+    for week, tasks in market_analysis_results['4_week_learning_plan'].items():
+        print(f"{week.replace('_', ' ').title()}:")
+        for task in tasks:
+            print(f"  • {task}")
+        print()
 
-print("📈 MARKET POSITION:")
-print(f"• {market_analysis_results['market_insights']['industry_position']}")
-print(f"• {market_analysis_results['market_insights']['salary_impact']}")
-print(f"• {market_analysis_results['market_insights']['career_trajectory']}")
-print()
 
-print("📅 4-WEEK STUDY PLAN:")
-for week, tasks in market_analysis_results['4_week_learning_plan'].items():
-    print(f"{week.replace('_', ' ').title()}:")
-    for task in tasks:
-        print(f"  • {task}")
-    print()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
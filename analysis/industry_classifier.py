@@ -0,0 +1,282 @@
+"""
+Industry Classifier for BDPA Tech Job Market Analysis
+Labels every posting with a skill list as one of the seven intern industries, so industry
+demand, salary and trend figures come from real posting counts
+
+Each industry's INTERN_SKILL_MAPPING template is matched against the shared skill
+vocabulary through normalize_skill's aliases. A posting's score for an industry is the
+weighted share of that template it lists, where a skill several templates share (python,
+git) splits its weight between them; all postings are scored at once with two sparse
+matrix products. The best industry is the label when its score reaches --min-similarity
+and the posting lists at least --min-skills of its template; confidence is that score's
+share of the posting's total score.
+
+Postings come from the skill store (skill_engine.SkillStore). unified_jobs has no skill
+lists, and linkedin_postings is classified through its job_skills rows. ai_jobs_snapshot
+overlaps ai_jobs (same job_id range), so it is only classified when asked for, and postings
+that share an id with one already counted are dropped before the figures are aggregated.
+
+Usage:
+    python analysis/industry_classifier.py [--sources job_skills dice_jobs ai_jobs] [--min-similarity 0.05] [--min-skills 2]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from cooccurrence import posting_skill_matrix
+from data_cache import read_dataset
+from intern_focused_analysis import ALIAS_TO_CANONICAL, normalized_industry_skills
+from skill_engine import SkillStore
+from skill_trends import month_label, posting_months
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+LABELS_DIR = ANALYSIS_DIR / "cache" / "industries"
+RESULTS_PATH = ANALYSIS_DIR / "results" / "intern_analysis" / "industry_postings.json"
+
+# Skill store dataset -> salary column, date columns (see skill_trends.posting_months),
+# (dataset, key) the salary and date columns are joined from when it has none itself, and the
+# id column under which snapshots of the same postings share a value (None when unique)
+CLASSIFY_SOURCES = {
+    'job_skills': {'salary': None, 'dates': ('first_seen_year', 'first_seen_month'),
+                   'join': ('linkedin_postings', 'job_link'), 'id': None},
+    'dice_jobs': {'salary': None, 'dates': ('post_year', 'post_month'), 'join': None, 'id': None},
+    'ai_jobs': {'salary': 'salary_usd', 'dates': ('posting_date',), 'join': None, 'id': 'job_id'},
+    'ai_jobs_snapshot': {'salary': 'salary_usd', 'dates': ('posting_date',), 'join': None, 'id': 'job_id'},
+}
+# One snapshot per posting table: ai_jobs_snapshot repeats the ai_jobs postings (AI00001-AI15000)
+DEFAULT_SOURCES = ('job_skills', 'dice_jobs', 'ai_jobs')
+
+UNCLASSIFIED = -1
+DEFAULT_MIN_SIMILARITY = 0.05
+# Template skills a posting must list before it can be labelled with that industry, so a
+# lone generic skill (problem solving, git) is not enough
+DEFAULT_MIN_SKILLS = 2
+# Months compared for each industry's recent growth, and the postings the earlier window
+# needs before a growth rate is reported
+TREND_WINDOW = 3
+MIN_TREND_POSTINGS = 30
+
+
+class IndustryTemplates:
+    """Industry x template-skill weights and the map from vocabulary skills to template skills"""
+
+    def __init__(self, vocab):
+        templates = normalized_industry_skills()
+        self.industries = list(templates)
+        template_skills = list(dict.fromkeys(s for skills in templates.values() for s in skills))
+        position = {skill: i for i, skill in enumerate(template_skills)}
+        membership = np.zeros((len(template_skills), len(self.industries)), dtype=np.float32)
+        for j, skills in enumerate(templates.values()):
+            membership[[position[s] for s in skills], j] = 1
+
+        # Store vocabulary is already case-folded, so only the alias map remains to apply
+        normalized = pd.Series(vocab, dtype=object)
+        normalized = normalized.map(ALIAS_TO_CANONICAL).fillna(normalized)
+        skill_of = normalized.map(position).to_numpy(dtype='float64')
+        matched = np.flatnonzero(np.isfinite(skill_of))
+        self.to_template = sparse.csr_matrix(
+            (np.ones(len(matched), dtype=np.float32), (matched, skill_of[matched].astype(np.int64))),
+            shape=(len(vocab), len(template_skills)),
+        )
+        # Skills several templates share (python, git) split their weight between them;
+        # dividing by the template total makes every industry's score a 0-1 coverage
+        self.membership = membership
+        weights = membership / membership.sum(axis=1, keepdims=True)
+        self.weights = weights / weights.sum(axis=0, keepdims=True)
+        self.matched_skills = len(matched)
+
+    def scores(self, matrix, min_skills=DEFAULT_MIN_SKILLS):
+        """
+        Weighted share of each industry template covered by every row of a binary posting x
+        skill matrix; zero where the posting lists fewer than min_skills of the template's skills
+        """
+        covered = sparse.csr_matrix(matrix @ self.to_template)
+        # Several vocabulary spellings of one template skill count once
+        covered.data[:] = 1
+        scores = np.asarray(covered @ self.weights, dtype=np.float32)
+        scores[np.asarray(covered @ self.membership) < min_skills] = 0
+        return scores
+
+
+def assign_labels(scores, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """(label, confidence) per posting; UNCLASSIFIED where no template reaches min_similarity"""
+    label = scores.argmax(axis=1).astype(np.int8)
+    best = scores[np.arange(len(scores)), label]
+    total = scores.sum(axis=1)
+    confidence = np.divide(best, total, out=np.zeros_like(best), where=total > 0)
+    unclassified = best < min_similarity
+    label[unclassified] = UNCLASSIFIED
+    confidence[unclassified] = 0
+    return label, confidence
+
+
+def posting_attributes(name, posting_ids):
+    """
+    Salary (NaN where unknown), month ordinal (-1 where unknown) and id (None when the
+    dataset has no shared id column) of the given posting rows
+    """
+    spec = CLASSIFY_SOURCES[name]
+    if spec['join']:
+        other, key = spec['join']
+        keys, _ = read_dataset(name, columns=[key])
+        joined, _ = read_dataset(other, columns=[key, *spec['dates']])
+        frame = keys.iloc[posting_ids].merge(joined.drop_duplicates(key), on=key, how='left')
+    else:
+        columns = [c for c in (spec['salary'], *spec['dates'], spec['id']) if c]
+        frame, _ = read_dataset(name, columns=columns)
+        frame = frame.iloc[posting_ids].reset_index(drop=True)
+    salary = (pd.to_numeric(frame[spec['salary']], errors='coerce').to_numpy(dtype=np.float64)
+              if spec['salary'] else np.full(len(frame), np.nan))
+    ids = frame[spec['id']].astype(object).to_numpy() if spec['id'] else np.full(len(frame), None, dtype=object)
+    return salary, posting_months(frame, spec['dates']), ids
+
+
+def classify_sources(sources=None, min_similarity=DEFAULT_MIN_SIMILARITY, min_skills=DEFAULT_MIN_SKILLS, store=None):
+    """
+    Classify each source's postings (DEFAULT_SOURCES when not given); returns
+    ({dataset: frame}, templates, seconds spent scoring)
+    """
+    store = store or SkillStore()
+    mappings = {}
+    for name in sources or DEFAULT_SOURCES:
+        try:
+            mappings[name] = store.get(name)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+    if not mappings:
+        raise RuntimeError("No classifiable sources could be loaded")
+
+    vocab = store.vocabulary.array()
+    matrices = {name: posting_skill_matrix(m, drop_empty=False)[0] for name, m in mappings.items()}
+    for name, matrix in matrices.items():
+        if matrix.shape[1] < len(vocab):
+            matrices[name] = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                               shape=(matrix.shape[0], len(vocab)))
+    templates = IndustryTemplates(vocab)
+
+    start = time.perf_counter()
+    labels = {name: assign_labels(templates.scores(matrix, min_skills), min_similarity) for name, matrix in matrices.items()}
+    seconds = time.perf_counter() - start
+
+    frames = {}
+    for name, (label, confidence) in labels.items():
+        posting_ids = np.asarray(mappings[name].posting_ids)
+        try:
+            salary, months, ids = posting_attributes(name, posting_ids)
+        except Exception as e:
+            print(f"⚠ {name}: no salary/date columns ({e})")
+            salary, months = np.full(len(label), np.nan), np.full(len(label), -1)
+            ids = np.full(len(label), None, dtype=object)
+        frames[name] = pd.DataFrame({'posting_id': posting_ids, 'label': label, 'confidence': confidence,
+                                     'salary': salary, 'month': months, 'id': ids})
+    return frames, templates, seconds
+
+
+def save_labels(frames, industries, directory=LABELS_DIR):
+    """One .npz per dataset: posting row, industry code, confidence and the industry names"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, frame in frames.items():
+        np.savez(directory / f"{name}.npz", posting_ids=frame['posting_id'].to_numpy(),
+                 labels=frame['label'].to_numpy(), confidence=frame['confidence'].to_numpy(),
+                 industries=np.asarray(industries, dtype=str))
+
+
+def industry_figures(frames, industries):
+    """
+    Per-industry posting counts, share, confidence, salary and monthly trend across every source.
+    A posting whose id was already seen in an earlier source (another snapshot) is counted once.
+    """
+    postings = pd.concat([f.assign(dataset=name) for name, f in frames.items()], ignore_index=True)
+    if 'id' in postings:
+        repeated = postings['id'].notna() & postings['id'].duplicated()
+        duplicates = int(repeated.sum())
+        postings = postings[~repeated]
+    else:
+        duplicates = 0
+    classified = postings[postings['label'] != UNCLASSIFIED]
+    figures = {}
+    for code, industry in enumerate(industries):
+        rows = classified[classified['label'] == code]
+        salary = rows['salary'].dropna()
+        monthly = rows.loc[rows['month'] >= 0, 'month'].value_counts().sort_index()
+        growth = None
+        if len(monthly) >= 2 * TREND_WINDOW:
+            recent = monthly.iloc[-TREND_WINDOW:].sum()
+            before = monthly.iloc[-2 * TREND_WINDOW:-TREND_WINDOW].sum()
+            growth = round(float(recent / before - 1), 4) if before >= MIN_TREND_POSTINGS else None
+        figures[industry] = {
+            'postings': int(len(rows)),
+            'share': round(len(rows) / max(len(classified), 1), 4),
+            'by_dataset': {name: int(n) for name, n in rows['dataset'].value_counts().items()},
+            'mean_confidence': round(float(rows['confidence'].mean()), 4) if len(rows) else None,
+            'salary': {'postings': int(len(salary)),
+                       'median': round(float(salary.median()), 2) if len(salary) else None,
+                       'p25': round(float(salary.quantile(0.25)), 2) if len(salary) else None,
+                       'p75': round(float(salary.quantile(0.75)), 2) if len(salary) else None},
+            'monthly_postings': {month_label(int(m)): int(n) for m, n in monthly.items()},
+            'recent_growth': growth,
+        }
+    return {'postings': int(len(postings)), 'classified': int(len(classified)),
+            'duplicate_postings': duplicates, 'industries': figures}
+
+
+def print_figures(summary):
+    print("\n--- POSTINGS BY INTERN INDUSTRY ---")
+    print(f"{summary['classified']:,} of {summary['postings']:,} postings classified "
+          f"({summary['classified'] / max(summary['postings'], 1):.1%})")
+    if summary.get('duplicate_postings'):
+        print(f"⚠ {summary['duplicate_postings']:,} postings repeated across snapshots were counted once")
+    ranked = sorted(summary['industries'].items(), key=lambda item: item[1]['postings'], reverse=True)
+    for i, (industry, figures) in enumerate(ranked, 1):
+        salary = figures['salary']['median']
+        growth = figures['recent_growth']
+        print(f"{i}. {industry:10s} {figures['postings']:>10,} postings ({figures['share']:.1%}) "
+              f"| confidence {figures['mean_confidence'] or 0:.2f}"
+              + (f" | median salary ${salary:,.0f}" if salary is not None else "")
+              + (f" | {TREND_WINDOW}-month growth {growth:+.1%}" if growth is not None else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify postings into the seven intern industries")
+    parser.add_argument('--sources', nargs='+', choices=list(CLASSIFY_SOURCES), default=None,
+                        help=f"Datasets to classify (default: {' '.join(DEFAULT_SOURCES)})")
+    parser.add_argument('--min-similarity', type=float, default=DEFAULT_MIN_SIMILARITY,
+                        help="Template share a posting needs with its best industry template to be labelled")
+    parser.add_argument('--min-skills', type=int, default=DEFAULT_MIN_SKILLS,
+                        help="Template skills a posting must list to be labelled with that industry")
+    parser.add_argument('--out', type=Path, default=RESULTS_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        frames, templates, seconds = classify_sources(args.sources, args.min_similarity, args.min_skills)
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        return 1
+    n_postings = sum(len(f) for f in frames.values())
+    print(f"✓ Templates matched {templates.matched_skills:,} vocabulary skills; scored {n_postings:,} postings "
+          f"in {seconds:.2f}s ({n_postings / max(seconds, 1e-9) * 60 / 1e6:,.1f}M postings/minute)")
+
+    save_labels(frames, templates.industries)
+    summary = industry_figures(frames, templates.industries)
+    summary['min_similarity'] = args.min_similarity
+    summary['min_skills'] = args.min_skills
+    print_figures(summary)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n✓ Saved labels to {LABELS_DIR} and figures to {args.out} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
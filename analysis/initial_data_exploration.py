@@ -5,15 +5,36 @@ This script provides a comprehensive overview of all cleaned datasets
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+import argparse
 import warnings
+from collections import Counter
+
+# Whole modules are what the pipeline stages hash for their cache keys
+import charts
+import company_index
+import data_cache
+import dataset_profiler
+import near_duplicates
+import sketches
+import skill_engine
+import streaming
+from charts import RENDERERS, render_charts
+from company_index import (COMPANY_MAP_PATH, CompanyIndex, collect_names, hiring_vs_layoffs,
+                           print_hiring_vs_layoffs, resolve_keys)
+from data_cache import DATASET_FILES, default_dtype_memory, read_dataset
+from dataset_profiler import print_profile, profile_frame, write_profiles
+from instrumentation import RunMetrics, record_cache
+from near_duplicates import (clustering_params, clusters_path, dedup_view, find_near_duplicates,
+                             source_fingerprint)
+from pipeline import Pipeline, Stage, StopPipeline
+from skill_engine import SKILL_CACHE_DIR, SkillStore, canonical_postings, explode_skills
+from streaming import DEFAULT_CHUNKSIZE, print_streaming_report, stream_job_postings
+
 warnings.filterwarnings('ignore')
 
-# Set up plotting style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+# Plotting style (seaborn whitegrid) is applied by the chart workers in charts.py,
+# so matplotlib and seaborn are only imported when charts are actually rendered
 
 # Define dataset paths
 DATA_DIR = Path("Kaggle Datasets/ML_Ready")
@@ -24,8 +45,8 @@ VIZ_DIR = Path("analysis/visualizations")
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 VIZ_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_datasets():
-    """Load all cleaned datasets"""
+def load_datasets(use_cache=True, exclude=()):
+    """Load all cleaned datasets, reusing the columnar cache when the CSVs are unchanged"""
     print("=" * 80)
     print("LOADING DATASETS")
     print("=" * 80)
@@ -33,74 +54,42 @@ def load_datasets():
     datasets = {}
 
     # Load each dataset
-    try:
-        datasets['job_postings'] = pd.read_csv(DATA_DIR / "tech_job_postings_clean.csv")
-        print(f"✓ Loaded tech_job_postings_clean.csv: {len(datasets['job_postings']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading job_postings: {e}")
-
-    try:
-        datasets['job_skills'] = pd.read_csv(DATA_DIR / "tech_job_skills_clean.csv")
-        print(f"✓ Loaded tech_job_skills_clean.csv: {len(datasets['job_skills']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading job_skills: {e}")
-
-    try:
-        datasets['it_jobs'] = pd.read_csv(DATA_DIR / "it_jobs_clean.csv")
-        print(f"✓ Loaded it_jobs_clean.csv: {len(datasets['it_jobs']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading it_jobs: {e}")
-
-    try:
-        datasets['linkedin_postings'] = pd.read_csv(DATA_DIR / "tech_linkedin_postings_clean.csv")
-        print(f"✓ Loaded tech_linkedin_postings_clean.csv: {len(datasets['linkedin_postings']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading linkedin_postings: {e}")
-
-    try:
-        datasets['layoffs'] = pd.read_csv(DATA_DIR / "tech_layoffs_clean.csv")
-        print(f"✓ Loaded tech_layoffs_clean.csv: {len(datasets['layoffs']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading layoffs: {e}")
-
-    try:
-        datasets['layoff_trends'] = pd.read_csv(DATA_DIR / "layoff_trends_30y_clean.csv")
-        print(f"✓ Loaded layoff_trends_30y_clean.csv: {len(datasets['layoff_trends']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading layoff_trends: {e}")
-
-    try:
-        datasets['dice_jobs'] = pd.read_csv(DATA_DIR / "dice_jobs_clean.csv")
-        print(f"✓ Loaded dice_jobs_clean.csv: {len(datasets['dice_jobs']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading dice_jobs: {e}")
-
-    try:
-        datasets['unified_jobs'] = pd.read_csv(DATA_DIR / "tech_jobs_unified.csv")
-        print(f"✓ Loaded tech_jobs_unified.csv: {len(datasets['unified_jobs']):,} rows")
-    except Exception as e:
-        print(f"✗ Error loading unified_jobs: {e}")
+    for name, filename in DATASET_FILES.items():
+        if name in exclude:
+            continue
+        try:
+            datasets[name], cache_hit = read_dataset(name, data_dir=DATA_DIR, use_cache=use_cache)
+            record_cache(name, cache_hit)
+            source = "cache" if cache_hit else "csv"
+            print(f"✓ Loaded {filename}: {len(datasets[name]):,} rows ({source})")
+        except Exception as e:
+            print(f"✗ Error loading {name}: {e}")
 
     print(f"\nTotal datasets loaded: {len(datasets)}")
     return datasets
 
 
 def explore_dataset_structure(datasets):
-    """Explore the structure of each dataset"""
+    """Profile every dataset in one sketch pass per column and save the mergeable profiles"""
     print("\n" + "=" * 80)
     print("DATASET STRUCTURES")
     print("=" * 80)
 
+    profiles = []
+    total_memory = total_default = 0
     for name, df in datasets.items():
-        print(f"\n{name.upper()}")
-        print("-" * 80)
-        print(f"Shape: {df.shape[0]:,} rows × {df.shape[1]} columns")
-        print(f"\nColumns:")
-        for col in df.columns:
-            dtype = df[col].dtype
-            non_null = df[col].notna().sum()
-            null_pct = (df[col].isna().sum() / len(df)) * 100
-            print(f"  • {col:40s} | {str(dtype):15s} | {non_null:,} non-null ({null_pct:.1f}% missing)")
+        profiles.append(profile_frame(name, df))
+        print_profile(profiles[-1])
+        memory, default = df.memory_usage(deep=True).sum(), default_dtype_memory(df)
+        total_memory += memory
+        total_default += default
+        print(f"Memory: {memory / 1024**2:,.1f} MB (≈{default / 1024**2:,.1f} MB with default dtypes, "
+              f"{default / max(memory, 1):.1f}× smaller)")
+
+    print(f"\nTotal memory: {total_memory / 1024**2:,.1f} MB with the dtype plans vs "
+          f"≈{total_default / 1024**2:,.1f} MB with default dtypes ({total_default / max(total_memory, 1):.1f}× smaller)")
+    write_profiles(profiles, RESULTS_DIR / "dataset_profiles.json")
+    print(f"✓ Saved dataset profiles to {RESULTS_DIR / 'dataset_profiles.json'}")
 
 
 def analyze_job_postings(df):
@@ -118,7 +107,7 @@ def analyze_job_postings(df):
         # Salary by experience level
         if 'formatted_experience_level' in df.columns:
             print("\n--- MEDIAN SALARY BY EXPERIENCE LEVEL ---")
-            salary_by_exp = df.groupby('formatted_experience_level')['normalized_salary'].agg([
+            salary_by_exp = df.groupby('formatted_experience_level', observed=True)['normalized_salary'].agg([
                 'count', 'median', 'mean'
             ]).sort_values('median', ascending=False)
             print(salary_by_exp)
@@ -149,41 +138,60 @@ def analyze_job_postings(df):
         print(work_type_dist)
 
 
+def job_skills_postings(df):
+    """
+    df's posting -> skill mapping over the vocabulary every analysis shares.
+
+    Read from the skill store when df's rows are provably rows of the stored
+    job_skills dataset (integer labels that are positions in it, with the same
+    job_link there), and parsed from df['job_skills'] otherwise, so re-indexed
+    or in-memory frames are counted from their own column.
+    """
+    store = SkillStore(SKILL_CACHE_DIR / "store", data_dir=DATA_DIR)
+    if 'job_link' in df.columns and pd.api.types.is_integer_dtype(df.index):
+        positions = df.index.to_numpy()
+        try:
+            stored = store.get('job_skills')
+            links = read_dataset('job_skills', data_dir=DATA_DIR, columns=['job_link'])[0]['job_link']
+        except (OSError, ValueError, KeyError):
+            pass
+        else:
+            in_range = positions.size == 0 or (positions.min() >= 0 and positions.max() < len(links))
+            if in_range and np.array_equal(links.iloc[positions].astype(object).to_numpy(),
+                                           df['job_link'].astype(object).to_numpy()):
+                return stored.select(positions)
+    return canonical_postings(explode_skills(df['job_skills']), store.vocabulary)
+
+
 def analyze_skills(df):
     """Analyze skills data"""
     print("\n" + "=" * 80)
     print("SKILLS ANALYSIS")
     print("=" * 80)
 
-    # Parse skills from the job_skills column
-    all_skills = []
-
     if 'job_skills' in df.columns:
         print(f"\nTotal job postings with skills: {len(df):,}")
 
-        # Extract individual skills
-        for skills_str in df['job_skills'].dropna():
-            if isinstance(skills_str, str):
-                skills = [s.strip() for s in skills_str.split(',')]
-                all_skills.extend(skills)
-
-        print(f"Total skill mentions: {len(all_skills):,}")
-        print(f"Unique skills: {len(set(all_skills)):,}")
+        posting_skills = job_skills_postings(df)
+        all_skill_counts = posting_skills.skill_counts()
+        all_skill_counts = all_skill_counts[all_skill_counts > 0]
 
-        # Top skills
-        from collections import Counter
-        skill_counts = Counter(all_skills)
+        print("Counts are postings per skill: spellings are case-folded to the shared vocabulary "
+              "and a skill listed twice on one posting counts once")
+        print(f"Total skill mentions: {posting_skills.n_mentions:,}")
+        print(f"Unique skills: {len(all_skill_counts):,}")
 
         print("\n--- TOP 30 MOST DEMANDED SKILLS ---")
-        for i, (skill, count) in enumerate(skill_counts.most_common(30), 1):
+        for i, (skill, count) in enumerate(all_skill_counts.head(30).items(), 1):
             print(f"{i:2d}. {skill:50s} - {count:,} mentions")
 
-        # Save top skills to file
-        top_skills_df = pd.DataFrame(skill_counts.most_common(100), columns=['skill', 'count'])
-        top_skills_df.to_csv(RESULTS_DIR / "top_100_skills.csv", index=False)
+        # Save top skills and the exact count of every skill
+        all_skill_counts.head(100).reset_index().to_csv(RESULTS_DIR / "top_100_skills.csv", index=False)
         print(f"\n✓ Saved top 100 skills to {RESULTS_DIR / 'top_100_skills.csv'}")
+        all_skill_counts.reset_index().to_csv(RESULTS_DIR / "skill_counts.csv", index=False)
+        print(f"✓ Saved all {len(all_skill_counts):,} skill counts to {RESULTS_DIR / 'skill_counts.csv'}")
 
-        return skill_counts
+        return Counter(all_skill_counts.to_dict())
 
     return None
 
@@ -212,86 +220,66 @@ def analyze_layoffs(df):
     # By industry
     if 'industry' in df.columns:
         print("\n--- TOP 10 INDUSTRIES BY LAYOFFS ---")
-        industry_layoffs = df.groupby('industry')['total_layoffs'].sum().sort_values(ascending=False).head(10)
+        industry_layoffs = df.groupby('industry', observed=True)['total_layoffs'].sum().sort_values(ascending=False).head(10)
         print(industry_layoffs)
 
     # Top companies with layoffs
     if 'company' in df.columns and 'total_layoffs' in df.columns:
         print("\n--- TOP 15 COMPANIES BY TOTAL LAYOFFS ---")
-        company_layoffs = df.groupby('company')['total_layoffs'].sum().sort_values(ascending=False).head(15)
+        company_layoffs = df.groupby('company', observed=True)['total_layoffs'].sum().sort_values(ascending=False).head(15)
         print(company_layoffs)
 
 
-def create_visualizations(datasets, skill_counts=None):
-    """Create initial visualizations"""
+def create_visualizations(datasets, skill_counts=None, force=False):
+    """Create initial visualizations
+
+    Each chart is reduced to a small aggregate here (histogram bins, top-20 list,
+    yearly totals, value counts) and rendered by charts.render_charts(), which
+    skips charts whose aggregate is unchanged and renders the rest in parallel.
+    """
     print("\n" + "=" * 80)
     print("CREATING VISUALIZATIONS")
     print("=" * 80)
 
+    jobs = []
+
     # 1. Salary distribution
     if 'job_postings' in datasets and 'normalized_salary' in datasets['job_postings'].columns:
-        plt.figure(figsize=(12, 6))
-        salary_data = datasets['job_postings']['normalized_salary'].dropna()
+        salary_data = datasets['job_postings']['normalized_salary'].dropna().to_numpy(dtype=float)
         salary_data = salary_data[(salary_data > 0) & (salary_data < 500000)]  # Filter outliers
-
-        plt.hist(salary_data, bins=50, edgecolor='black', alpha=0.7)
-        plt.xlabel('Salary (USD)')
-        plt.ylabel('Frequency')
-        plt.title('Salary Distribution for Tech Jobs')
-        plt.axvline(salary_data.median(), color='red', linestyle='--', label=f'Median: ${salary_data.median():,.0f}')
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(VIZ_DIR / 'salary_distribution.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved salary_distribution.png")
-        plt.close()
+        if len(salary_data):
+            counts, edges = np.histogram(salary_data, bins=50)
+            jobs.append(('salary_distribution.png', 'salary_histogram', {
+                'counts': counts.tolist(), 'edges': edges.tolist(), 'median': float(np.median(salary_data)),
+            }))
 
     # 2. Top skills bar chart
     if skill_counts:
-        plt.figure(figsize=(14, 8))
-        top_20_skills = dict(sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:20])
-
-        skills = list(top_20_skills.keys())
-        counts = list(top_20_skills.values())
-
-        plt.barh(range(len(skills)), counts, color='steelblue')
-        plt.yticks(range(len(skills)), skills)
-        plt.xlabel('Number of Mentions')
-        plt.title('Top 20 Most In-Demand Skills')
-        plt.gca().invert_yaxis()
-        plt.tight_layout()
-        plt.savefig(VIZ_DIR / 'top_20_skills.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved top_20_skills.png")
-        plt.close()
+        top_20_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+        jobs.append(('top_20_skills.png', 'top_skills', {
+            'skills': [skill for skill, _ in top_20_skills], 'counts': [int(count) for _, count in top_20_skills],
+        }))
 
     # 3. Layoffs by year
     if 'layoffs' in datasets and 'year' in datasets['layoffs'].columns:
-        plt.figure(figsize=(12, 6))
         yearly_data = datasets['layoffs'].groupby('year')['total_layoffs'].sum().sort_index()
-
-        plt.plot(yearly_data.index, yearly_data.values, marker='o', linewidth=2, markersize=8)
-        plt.xlabel('Year')
-        plt.ylabel('Total Layoffs')
-        plt.title('Tech Industry Layoffs Over Time')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(VIZ_DIR / 'layoffs_trend.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved layoffs_trend.png")
-        plt.close()
+        jobs.append(('layoffs_trend.png', 'layoffs_trend', {
+            'years': [int(year) for year in yearly_data.index], 'totals': [float(v) for v in yearly_data.values],
+        }))
 
     # 4. Remote work distribution
     if 'job_postings' in datasets and 'remote_allowed' in datasets['job_postings'].columns:
-        plt.figure(figsize=(8, 8))
         remote_counts = datasets['job_postings']['remote_allowed'].value_counts()
+        jobs.append(('remote_work_distribution.png', 'remote_pie', {
+            # Create labels based on actual data
+            'labels': [f"{idx}" for idx in remote_counts.index], 'counts': [int(v) for v in remote_counts.values],
+        }))
 
-        # Create labels based on actual data
-        labels = [f"{idx}" for idx in remote_counts.index]
-        plt.pie(remote_counts.values, labels=labels,
-                autopct='%1.1f%%', startangle=90, colors=['#ff9999', '#66b3ff'])
-        plt.title('Remote Work Distribution in Tech Jobs')
-        plt.tight_layout()
-        plt.savefig(VIZ_DIR / 'remote_work_distribution.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved remote_work_distribution.png")
-        plt.close()
+    rendered, skipped = render_charts(jobs, VIZ_DIR, force=force)
+    for filename in rendered:
+        print(f"✓ Saved {filename}")
+    for filename in skipped:
+        print(f"✓ {filename} unchanged, skipped")
 
 
 def generate_summary_report(datasets):
@@ -342,39 +330,125 @@ def generate_summary_report(datasets):
     print(f"\n✓ Saved summary report to {RESULTS_DIR / 'summary_report.txt'}")
 
 
-def main():
-    """Main execution function"""
-    print("\n" + "=" * 80)
-    print("BDPA TECH JOB MARKET - INITIAL DATA EXPLORATION")
-    print("=" * 80)
+def dataset_fingerprint():
+    """Size and mtime of every source CSV, so the pipeline notices changed data"""
+    fingerprint = {}
+    for name, filename in DATASET_FILES.items():
+        path = DATA_DIR / filename
+        stat = path.stat() if path.exists() else None
+        fingerprint[name] = (stat.st_size, stat.st_mtime_ns) if stat else None
+    return fingerprint
+
+
+def dedup_fingerprint():
+    """Size and mtime of the saved job_skills clusters, which the deduplicated skills stage may reuse"""
+    fingerprint = {}
+    for path in (clusters_path('job_skills'), clusters_path('job_skills').with_suffix('.json')):
+        stat = path.stat() if path.exists() else None
+        fingerprint[path.name] = (stat.st_size, stat.st_mtime_ns) if stat else None
+    return fingerprint
 
-    # Load datasets
-    datasets = load_datasets()
 
+def run_load_stage(use_cache=True, exclude=()):
+    """Dataset loading; ends the run when nothing could be loaded"""
+    datasets = load_datasets(use_cache=use_cache, exclude=exclude)
     if not datasets:
-        print("No datasets loaded. Exiting.")
-        return
+        raise StopPipeline("No datasets loaded. Exiting.")
+    return datasets
 
-    # Explore structures
-    explore_dataset_structure(datasets)
 
-    # Analyze specific datasets
-    if 'job_postings' in datasets:
+def run_postings_stage(datasets, stream=False, chunksize=DEFAULT_CHUNKSIZE):
+    """Postings analysis, in memory or streamed from the CSV"""
+    if stream:
+        postings_csv = DATA_DIR / DATASET_FILES['job_postings']
+        print_streaming_report(stream_job_postings([postings_csv], chunksize=chunksize))
+    elif 'job_postings' in datasets:
         analyze_job_postings(datasets['job_postings'])
 
+
+def run_skills_stage(datasets, dedup=False):
+    """Skills analysis, optionally over one posting per near-duplicate cluster; returns the skill counts"""
     if 'job_skills' in datasets:
-        skill_counts = analyze_skills(datasets['job_skills'])
-    else:
-        skill_counts = None
+        df = datasets['job_skills']
+        if dedup:
+            df = dedup_view('job_skills', df, datasets)
+        return analyze_skills(df)
+    return None
+
 
+def run_layoffs_stage(datasets):
+    """Layoffs analysis, joined to each company's postings through the persisted company ID map"""
     if 'layoffs' in datasets:
         analyze_layoffs(datasets['layoffs'])
+        previous = CompanyIndex.load() if COMPANY_MAP_PATH.exists() else None
+        index = CompanyIndex.build(collect_names(datasets), previous=previous)
+        index.save()
+        print_hiring_vs_layoffs(hiring_vs_layoffs(index, datasets))
+
+
+def build_pipeline(stream=False, chunksize=DEFAULT_CHUNKSIZE, use_cache=True, dedup=False):
+    """The exploration workflow as memoized stages"""
+    return Pipeline([
+        # Loading is never persisted (the columnar cache covers it); it runs only
+        # when a later stage misses, and is keyed on the source files so any data
+        # change invalidates everything downstream
+        Stage('load', run_load_stage, persist=False, fingerprint=dataset_fingerprint,
+              params={'use_cache': use_cache, 'exclude': ('job_postings',) if stream else ()},
+              code=[data_cache]),
+        Stage('structure', explore_dataset_structure, inputs=['load'],
+              code=[dataset_profiler, sketches, data_cache],
+              outputs=[RESULTS_DIR / "dataset_profiles.json"]),
+        Stage('postings', run_postings_stage, inputs=['load'],
+              params={'stream': stream, 'chunksize': chunksize},
+              code=[streaming, sketches, data_cache]),
+        Stage('skills', run_skills_stage, inputs=['load'], params={'dedup': dedup},
+              fingerprint=dedup_fingerprint if dedup else None,
+              code=[skill_engine, near_duplicates, data_cache],
+              outputs=[RESULTS_DIR / "top_100_skills.csv", RESULTS_DIR / "skill_counts.csv"]),
+        Stage('layoffs', run_layoffs_stage, inputs=['load'],
+              code=[company_index, data_cache],
+              outputs=[COMPANY_MAP_PATH]),
+        Stage('visualizations', create_visualizations, inputs=['load', 'skills'],
+              code=[charts],
+              outputs=[charts.FINGERPRINT_FILE]
+              + [VIZ_DIR / name for name in ('salary_distribution.png', 'top_20_skills.png',
+                                             'layoffs_trend.png', 'remote_work_distribution.png')]),
+        Stage('report', generate_summary_report, inputs=['load'],
+              outputs=[RESULTS_DIR / 'summary_report.txt']),
+    ])
+
+
+def main(argv=None):
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="BDPA tech job market exploration")
+    parser.add_argument('--stream', action='store_true',
+                        help="Analyze job postings in chunks instead of loading them into memory")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Rows per chunk in --stream mode")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-parse the source CSVs")
+    parser.add_argument('--dedup', action='store_true',
+                        help="Count skills over one posting per near-duplicate cluster (see near_duplicates.py)")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help="Run only these stages")
+    parser.add_argument('--from', dest='start', metavar='STAGE', help="Run this stage and every later one")
+    parser.add_argument('--force', action='store_true', help="Recompute selected stages even if cached")
+    parser.add_argument('--profile', metavar='STAGE', help="Run this stage under a profiler")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record each stage's tracemalloc peak (slows allocation-heavy stages several times)")
+    args = parser.parse_args(argv)
 
-    # Create visualizations
-    create_visualizations(datasets, skill_counts)
+    print("\n" + "=" * 80)
+    print("BDPA TECH JOB MARKET - INITIAL DATA EXPLORATION")
+    print("=" * 80)
 
-    # Generate summary report
-    generate_summary_report(datasets)
+    # (in streaming mode the postings are never materialized)
+    pipeline = build_pipeline(stream=args.stream, chunksize=args.chunksize, use_cache=not args.no_cache,
+                              dedup=args.dedup)
+    if args.profile and args.profile not in pipeline.stages:
+        parser.error(f"unknown stage '{args.profile}' (available: {', '.join(pipeline.order)})")
+    with RunMetrics('explore', RESULTS_DIR / 'explore_metrics.json', profile_stage=args.profile,
+                    trace_memory=args.trace_memory) as metrics:
+        pipeline.run(only=args.only, start=args.start, force=args.force, metrics=metrics)
+    metrics.write()
 
     print("\n" + "=" * 80)
     print("ANALYSIS COMPLETE")
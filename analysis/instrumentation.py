@@ -0,0 +1,261 @@
+"""
+Per-Stage Instrumentation for BDPA Tech Job Market Analysis
+Records wall time, CPU time, peak traced memory, rows in/out and cache hits for every stage
+of a run, writes them as JSON and flags stages that got slower than the previous run
+
+One stage can also be run under a profiler (pyinstrument's sampling profiler when
+installed, cProfile otherwise); its report is saved next to the metrics file.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# A stage is flagged when it is this much slower than in the previous run (and by more than the floor)
+REGRESSION_RATIO = 1.25
+REGRESSION_FLOOR_S = 0.1
+HISTORY_LIMIT = 200
+
+# The run currently being recorded, so deep helpers can report cache hits without extra arguments
+_active_run = None
+
+
+def count_rows(value):
+    """Row count of a stage input/output: frames and arrays by length, dicts of frames summed"""
+    if value is None:
+        return None
+    if isinstance(value, dict) and value and all(hasattr(v, 'shape') for v in value.values()):
+        return sum(len(v) for v in value.values())
+    if isinstance(value, (list, tuple)) and value and all(hasattr(v, 'shape') or isinstance(v, dict) for v in value):
+        counts = [count_rows(v) for v in value]
+        return sum(c for c in counts if c is not None)
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def peak_rss_mb():
+    """High-water resident memory of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def record_cache(key, hit):
+    """Note a cache hit or miss (e.g. one dataset's columnar cache) on the stage being recorded"""
+    if _active_run is not None and _active_run.current is not None:
+        _active_run.current['cache'][key] = 'hit' if hit else 'miss'
+
+
+class StageRecord(dict):
+    """Metrics of one stage; call output() with the stage's result to record rows out"""
+
+    def output(self, result):
+        self['rows_out'] = count_rows(result)
+        return result
+
+
+class RunMetrics:
+    """
+    Collects StageRecords for one run.
+
+    Use stage() as a context manager around each stage's work; stages served
+    from a cache are recorded with skipped(). write() saves the run as JSON,
+    appends it to a history file and reports stages slower than last time.
+
+    peak_mem_mb is the stage's tracemalloc peak above what was already allocated
+    when it started (Python and NumPy buffers; Arrow memory is not traced), and
+    peak_rss_mb the process high-water mark once the stage finished. Tracing is
+    opt-in (trace_memory) because it slows allocation-heavy stages several times
+    over; runs are only compared with earlier runs traced the same way.
+    """
+
+    def __init__(self, run, path, profile_stage=None, trace_memory=False):
+        self.run = run
+        self.path = Path(path)
+        self.profile_stage = profile_stage
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.current = None
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._started_tracing = False
+
+    def __enter__(self):
+        global _active_run
+        _active_run = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        global _active_run
+        _active_run = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    @contextmanager
+    def stage(self, name, inputs=None):
+        record = StageRecord(stage=name, status='ran', rows_in=count_rows(inputs), rows_out=None,
+                             wall_s=None, cpu_s=None, peak_mem_mb=None, peak_rss_mb=None, cache={})
+        self.stages.append(record)
+        self.current = record
+        profiler = _Profiler(name, self.path.parent) if name == self.profile_stage else None
+        traced_before = 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            if profiler:
+                with profiler:
+                    yield record
+            else:
+                yield record
+        except BaseException:
+            record['status'] = 'failed'
+            raise
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall, 4)
+            record['cpu_s'] = round(time.process_time() - cpu, 4)
+            if tracemalloc.is_tracing():
+                record['peak_mem_mb'] = round((tracemalloc.get_traced_memory()[1] - traced_before) / 1024 / 1024, 2)
+            record['peak_rss_mb'] = round(peak_rss_mb(), 1)
+            if profiler:
+                record['profile'] = str(profiler.report_path)
+            self.current = None
+
+    def skipped(self, name, status='cached'):
+        self.stages.append(StageRecord(stage=name, status=status, rows_in=None, rows_out=None,
+                                       wall_s=0.0, cpu_s=0.0, peak_mem_mb=None, peak_rss_mb=None, cache={}))
+
+    def to_dict(self):
+        return {
+            'run': self.run,
+            'started_at': self.started_at,
+            'wall_s': round(time.perf_counter() - self._start, 4),
+            'cpu_s': round(time.process_time() - self._cpu_start, 4),
+            'memory_traced': self.trace_memory,
+            'stages': self.stages,
+        }
+
+    def history_path(self):
+        return self.path.with_name(f"{self.path.stem}_history.jsonl")
+
+    def previous_run(self):
+        """The latest recorded run with the same memory tracing as this one (timings differ otherwise)"""
+        try:
+            with open(self.history_path()) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        for line in reversed(lines):
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            if run.get('memory_traced') == self.trace_memory:
+                return run
+        return None
+
+    def regressions(self, previous):
+        """Stages that ran both times and got slower by more than the ratio and floor"""
+        if not previous or previous.get('memory_traced') != self.trace_memory:
+            return []
+        before = {s['stage']: s for s in previous.get('stages', []) if s.get('status') == 'ran'}
+        slower = []
+        for record in self.stages:
+            old = before.get(record['stage'])
+            if record['status'] != 'ran' or old is None:
+                continue
+            if (record['wall_s'] > old['wall_s'] * REGRESSION_RATIO
+                    and record['wall_s'] - old['wall_s'] > REGRESSION_FLOOR_S):
+                slower.append((record['stage'], old['wall_s'], record['wall_s']))
+        return slower
+
+    def write(self, verbose=True):
+        """Save this run to the metrics file and its history; returns the run dict"""
+        payload = self.to_dict()
+        previous = self.previous_run()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(payload, f, indent=2)
+
+        history = self.history_path()
+        try:
+            lines = history.read_text().splitlines()[-(HISTORY_LIMIT - 1):]
+        except OSError:
+            lines = []
+        lines.append(json.dumps(payload, separators=(',', ':')))
+        history.write_text('\n'.join(lines) + '\n')
+
+        if verbose:
+            print_stage_metrics(payload)
+            for stage, old, new in self.regressions(previous):
+                print(f"⚠ {stage} took {new:.2f}s, up from {old:.2f}s in the previous run")
+            print(f"✓ Saved run metrics to {self.path}")
+        return payload
+
+
+class _Profiler:
+    """Sampling profiler (pyinstrument) when installed, deterministic cProfile otherwise"""
+
+    def __init__(self, stage, out_dir):
+        self.stage = stage
+        self.out_dir = Path(out_dir) / "profiles"
+        try:
+            from pyinstrument import Profiler
+            self._profiler, self.kind = Profiler(), 'pyinstrument'
+        except ImportError:
+            self._profiler, self.kind = cProfile.Profile(), 'cprofile'
+        self.report_path = self.out_dir / f"{stage}.{'html' if self.kind == 'pyinstrument' else 'txt'}"
+
+    def __enter__(self):
+        if self.kind == 'pyinstrument':
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self.kind == 'pyinstrument':
+            self._profiler.stop()
+            self.report_path.write_text(self._profiler.output_html())
+        else:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.report_path.with_suffix('.prof'))
+            text = io.StringIO()
+            pstats.Stats(self._profiler, stream=text).sort_stats('cumulative').print_stats(40)
+            self.report_path.write_text(text.getvalue())
+        print(f"✓ Profiled stage '{self.stage}' with {self.kind} → {self.report_path}")
+        return False
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '-'
+
+
+def print_stage_metrics(payload):
+    print("\n--- STAGE METRICS ---")
+    print(f"  {'stage':16s} {'status':8s} {'wall s':>8s} {'cpu s':>8s} {'peak MB':>8s} {'RSS MB':>8s} "
+          f"{'rows in':>11s} {'rows out':>11s}  cache")
+    for s in payload['stages']:
+        hits = sum(1 for v in s['cache'].values() if v == 'hit')
+        cache = f"{hits}/{len(s['cache'])} hit" if s['cache'] else ''
+        print(f"  {s['stage']:16s} {s['status']:8s} {_fmt(s['wall_s'], '8.2f'):>8s} {_fmt(s['cpu_s'], '8.2f'):>8s} "
+              f"{_fmt(s['peak_mem_mb'], '8.1f'):>8s} {_fmt(s['peak_rss_mb'], '8.0f'):>8s} "
+              f"{_fmt(s['rows_in'], ',d'):>11s} {_fmt(s['rows_out'], ',d'):>11s}  {cache}")
+    print(f"  {'total':16s} {'':8s} {payload['wall_s']:8.2f} {payload['cpu_s']:8.2f}")
@@ -4,12 +4,18 @@ BDPA SkillGap - Intern-Focused Analysis
 Filters and analyzes skills data for 7 target intern industries only
 """
 
-import pandas as pd
-import numpy as np
+# pandas/numpy are only imported on the --full-vocabulary path; the default
+# top-100 run is pure Python so it starts quickly
 from collections import Counter
+import argparse
+import csv
 import json
+import numbers
 import os
 
+from instrumentation import RunMetrics, record_cache
+from skill_index import SkillDemandIndex
+
 # Define skill mapping for 7 target intern industries
 INTERN_SKILL_MAPPING = {
     'AI/ML': [
@@ -71,22 +77,56 @@ SKILL_ALIASES = {
     'excel': ['excel', 'microsoft excel', 'spreadsheet', 'xlsx']
 }
 
+# Alias -> canonical lookup compiled once at import (first listed canonical wins)
+ALIAS_TO_CANONICAL = {}
+for _canonical, _aliases in SKILL_ALIASES.items():
+    for _alias in _aliases:
+        ALIAS_TO_CANONICAL.setdefault(_alias.lower(), _canonical)
+
 def normalize_skill(skill):
     """Normalize skill names using alias mapping"""
     skill_lower = skill.lower().strip()
-    for canonical, aliases in SKILL_ALIASES.items():
-        if skill_lower in [alias.lower() for alias in aliases]:
-            return canonical
-    return skill_lower
+    return ALIAS_TO_CANONICAL.get(skill_lower, skill_lower)
+
+def normalized_industry_skills():
+    """Each industry's skill template after normalization, in template order without duplicates"""
+    return {
+        industry: list(dict.fromkeys(normalize_skill(skill) for skill in skill_list))
+        for industry, skill_list in INTERN_SKILL_MAPPING.items()
+    }
 
-def load_skills_data():
-    """Load and combine all available skills datasets"""
+# Instrumented stages of main(), in order
+INTERN_STAGES = ('load', 'filter', 'demand_scores', 'classify', 'recommendations', 'skill_matrix')
+
+def load_skills_data(full_vocabulary=False):
+    """Load and combine all available skills datasets
+
+    Returns a list of (skill, count) pairs read from the top 100 summary, or with
+    full_vocabulary=True a skill/count DataFrame of job_skills postings per skill
+    (served from the skill store, which is only rebuilt when the dataset changes).
+    """
     data_dir = "../Kaggle Datasets/ML_Ready/"
     
+    if full_vocabulary:
+        try:
+            from skill_engine import SkillStore
+
+            store = SkillStore(data_dir=data_dir)
+            cache_hit = store.is_current('job_skills')
+            record_cache('job_skills', cache_hit)
+            skill_counts = store.get('job_skills').counts_frame()
+            skill_counts = skill_counts[skill_counts['count'] > 0]
+            source = "skill store" if cache_hit else "csv"
+            print(f"Loaded {len(skill_counts):,} skills from job_skills ({source})")
+            return skill_counts
+        except Exception as e:
+            print(f"Error loading job_skills dataset: {e}, falling back to top 100 skills")
+    
     # Try to load available CSV files that have skills data
     try:
-        # Load top 100 skills from previous analysis
-        top_skills = pd.read_csv("results/top_100_skills.csv")
+        # Load top 100 skills from previous analysis as (skill, count) pairs
+        with open("results/top_100_skills.csv", newline='') as f:
+            top_skills = [(row['skill'], int(row['count'])) for row in csv.DictReader(f)]
         print(f"Loaded {len(top_skills)} skills from top_100_skills.csv")
         return top_skills
     except Exception as e:
@@ -94,31 +134,22 @@ def load_skills_data():
         return None
 
 def filter_intern_relevant_skills(skills_df):
-    """Filter skills to only those relevant to 7 target intern industries"""
+    """Filter skills to only those relevant to 7 target intern industries
+
+    The dataset's skill column is indexed once; each template skill is then a
+    case-insensitive substring lookup instead of a full scan of the frame.
+    """
     if skills_df is None:
         return {}
     
-    # Get all relevant skills for interns
-    all_intern_skills = set()
-    for industry_skills in INTERN_SKILL_MAPPING.values():
-        all_intern_skills.update([normalize_skill(skill) for skill in industry_skills])
+    demand_index = SkillDemandIndex(skills_df)
     
     # Filter and categorize skills
     intern_relevant = {}
     
-    for industry, skill_list in INTERN_SKILL_MAPPING.items():
-        intern_relevant[industry] = {}
-        normalized_skills = [normalize_skill(skill) for skill in skill_list]
-        
-        for skill in normalized_skills:
-            # Find matching skills in dataset (case insensitive partial match)
-            matches = skills_df[skills_df['skill'].str.lower().str.contains(skill, na=False)]
-            if not matches.empty:
-                total_count = matches['count'].sum()
-                intern_relevant[industry][skill] = total_count
-            else:
-                # If no match found, mark as 0 but keep for learning resources
-                intern_relevant[industry][skill] = 0
+    for industry, normalized_skills in normalized_industry_skills().items():
+        # Skills with no match are kept at 0 for learning resources
+        intern_relevant[industry] = {skill: demand_index.demand(skill) for skill in normalized_skills}
     
     return intern_relevant
 
@@ -145,6 +176,22 @@ def calculate_industry_demand_scores(filtered_skills):
     
     return industry_scores
 
+def add_market_postings(demand_scores):
+    """Add each industry's classified posting count, share, salary and growth to its demand scores"""
+    from industry_classifier import classify_sources, industry_figures
+
+    frames, templates, _ = classify_sources()
+    figures = industry_figures(frames, templates.industries)['industries']
+    for industry, scores in demand_scores.items():
+        market = figures[industry]
+        scores.update({
+            'market_postings': market['postings'],
+            'market_share': market['share'],
+            'median_salary': market['salary']['median'],
+            'recent_growth': market['recent_growth'],
+        })
+    return demand_scores
+
 def generate_learning_recommendations(filtered_skills):
     """Generate learning path recommendations based on skill demand"""
     recommendations = {}
@@ -169,42 +216,62 @@ def generate_learning_recommendations(filtered_skills):
 
 def create_intern_skill_matrix():
     """Create a matrix showing skill overlap across industries"""
-    all_skills = set()
-    for skills in INTERN_SKILL_MAPPING.values():
-        all_skills.update([normalize_skill(s) for s in skills])
+    industry_skill_sets = {industry: set(skills) for industry, skills in normalized_industry_skills().items()}
+    all_skills = set().union(*industry_skill_sets.values())
     
     matrix = {}
     for skill in all_skills:
-        matrix[skill] = {}
-        for industry, industry_skills in INTERN_SKILL_MAPPING.items():
-            normalized_industry_skills = [normalize_skill(s) for s in industry_skills]
-            matrix[skill][industry] = skill in normalized_industry_skills
+        matrix[skill] = {industry: skill in skills for industry, skills in industry_skill_sets.items()}
     
     return matrix
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BDPA SkillGap intern-focused analysis")
+    parser.add_argument('--full-vocabulary', action='store_true',
+                        help="Match against every skill in job_skills instead of the top 100")
+    parser.add_argument('--classify', action='store_true',
+                        help="Add posting counts, salary and trend from industry_classifier to the demand scores")
+    parser.add_argument('--profile', metavar='STAGE', choices=INTERN_STAGES,
+                        help="Run this stage under a profiler")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record each stage's tracemalloc peak (slows allocation-heavy stages several times)")
+    args = parser.parse_args(argv)
+
     print("🎯 BDPA SkillGap - Intern-Focused Analysis")
     print("=" * 50)
-    
-    # Load skills data
-    print("\n📊 Loading skills data...")
-    skills_data = load_skills_data()
-    
-    # Filter for intern-relevant skills
-    print("🔍 Filtering for intern-relevant skills...")
-    intern_skills = filter_intern_relevant_skills(skills_data)
-    
-    # Calculate demand scores
-    print("📈 Calculating industry demand scores...")
-    demand_scores = calculate_industry_demand_scores(intern_skills)
-    
-    # Generate recommendations
-    print("💡 Generating learning recommendations...")
-    recommendations = generate_learning_recommendations(intern_skills)
-    
-    # Create skill overlap matrix
-    print("🔗 Creating skill overlap matrix...")
-    skill_matrix = create_intern_skill_matrix()
+
+    metrics = RunMetrics('intern', "results/intern_metrics.json", profile_stage=args.profile,
+                         trace_memory=args.trace_memory)
+    with metrics:
+        # Load skills data
+        print("\n📊 Loading skills data...")
+        with metrics.stage('load') as record:
+            skills_data = record.output(load_skills_data(full_vocabulary=args.full_vocabulary))
+
+        # Filter for intern-relevant skills
+        print("🔍 Filtering for intern-relevant skills...")
+        with metrics.stage('filter', inputs=skills_data) as record:
+            intern_skills = record.output(filter_intern_relevant_skills(skills_data))
+
+        # Calculate demand scores
+        print("📈 Calculating industry demand scores...")
+        with metrics.stage('demand_scores', inputs=intern_skills) as record:
+            demand_scores = record.output(calculate_industry_demand_scores(intern_skills))
+
+        if args.classify:
+            print("🏷️  Classifying postings into industries...")
+            with metrics.stage('classify') as record:
+                record.output(add_market_postings(demand_scores))
+
+        # Generate recommendations
+        print("💡 Generating learning recommendations...")
+        with metrics.stage('recommendations', inputs=intern_skills) as record:
+            recommendations = record.output(generate_learning_recommendations(intern_skills))
+
+        # Create skill overlap matrix
+        print("🔗 Creating skill overlap matrix...")
+        with metrics.stage('skill_matrix') as record:
+            skill_matrix = record.output(create_intern_skill_matrix())
     
     # Output results
     print("\n" + "="*50)
@@ -221,6 +288,8 @@ def main():
         print(f"{i}. {industry}: {scores['total_demand']:,} total mentions")
         print(f"   📊 Avg per skill: {scores['avg_demand_per_skill']:,}")
         print(f"   📈 Data coverage: {scores['data_coverage']}%")
+        if 'market_postings' in scores:
+            print(f"   🏷️  Classified postings: {scores['market_postings']:,} ({scores['market_share']:.1%} of market)")
         top_3 = [f"{skill}({count:,})" for skill, count in scores['top_skills'][:3] if count > 0]
         if top_3:
             print(f"   🔥 Top skills: {', '.join(top_3)}")
@@ -246,7 +315,7 @@ def main():
     # Convert numpy types to native Python types for JSON serialization
     intern_skills_json = {}
     for industry, skills in intern_skills.items():
-        intern_skills_json[industry] = {k: int(v) if isinstance(v, np.integer) else v for k, v in skills.items()}
+        intern_skills_json[industry] = {k: int(v) if isinstance(v, numbers.Integral) else v for k, v in skills.items()}
     
     # Save filtered skills data
     with open("results/intern_analysis/intern_skills_by_industry.json", "w") as f:
@@ -271,5 +340,7 @@ def main():
     print("  • learning_recommendations.json - Personalized learning paths")
     print("  • skill_overlap_matrix.json - Cross-industry skill matrix")
 
+    metrics.write()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
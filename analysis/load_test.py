@@ -0,0 +1,136 @@
+"""
+Load Test for the Local Analysis Service
+Replays a mix of demand, combination, industry and gap requests over keep-alive connections
+and reports throughput and p50/p99 latency per endpoint
+
+Usage:
+    python analysis/analysis_service.py &
+    python analysis/load_test.py [--requests 5000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from analysis_service import DEFAULT_HOST, DEFAULT_PORT
+from intern_focused_analysis import INTERN_SKILL_MAPPING
+
+SAMPLE_SKILLS = sorted({s for skills in INTERN_SKILL_MAPPING.values() for s in skills})
+
+
+def make_requests(n, seed=0, unique_profiles=200):
+    """n (label, method, target, body) tuples; gap profiles repeat so the cache is exercised"""
+    rng = random.Random(seed)
+    profiles = [rng.sample(SAMPLE_SKILLS, rng.randint(2, 10)) for _ in range(unique_profiles)]
+    industries = list(INTERN_SKILL_MAPPING)
+    requests = []
+    for _ in range(n):
+        kind = rng.choices(['demand', 'combinations', 'industries', 'gap'], weights=[4, 2, 1, 3])[0]
+        if kind == 'demand':
+            target = '/demand?' + '&'.join(f"skill={s}" for s in rng.sample(SAMPLE_SKILLS, 3))
+            requests.append((kind, 'GET', target.replace(' ', '%20'), b''))
+        elif kind == 'combinations':
+            requests.append((kind, 'GET', f"/combinations?skill={rng.choice(SAMPLE_SKILLS)}".replace(' ', '%20'), b''))
+        elif kind == 'industries':
+            requests.append((kind, 'GET', f"/industries?name={rng.choice(industries)}".replace(' ', '%20'), b''))
+        else:
+            profile = rng.choice(profiles)
+            rng.shuffle(profile)
+            requests.append((kind, 'POST', '/gap', json.dumps({'skills': profile}).encode('utf-8')))
+    return requests
+
+
+async def _request(reader, writer, host, method, target, body):
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def run_load(requests, host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=32):
+    """Send requests from `concurrency` keep-alive connections; returns (latencies by label, errors, seconds)"""
+    queue = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+    latencies, errors = defaultdict(list), defaultdict(int)
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while True:
+                try:
+                    label, method, target, body = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                status = await _request(reader, writer, host, method, target, body)
+                latencies[label].append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    errors[label] += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1] if len(values) > 1 else values[0]
+
+
+def print_report(latencies, errors, seconds):
+    total = sum(len(v) for v in latencies.values())
+    everything = [ms for values in latencies.values() for ms in values]
+    print(f"\n--- LOAD TEST: {total:,} requests in {seconds:.2f}s ({total / seconds:,.0f} req/s) ---")
+    print(f"  {'endpoint':14s} {'count':>7s} {'p50 ms':>8s} {'p99 ms':>8s} {'errors':>7s}")
+    for label in sorted(latencies):
+        values = latencies[label]
+        print(f"  {label:14s} {len(values):7,d} {percentile(values, 50):8.2f} {percentile(values, 99):8.2f} "
+              f"{errors[label]:7d}")
+    print(f"  {'all':14s} {total:7,d} {percentile(everything, 50):8.2f} {percentile(everything, 99):8.2f} "
+          f"{sum(errors.values()):7d}")
+
+
+async def _fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+        response = await reader.read()
+        return json.loads(response.split(b'\r\n\r\n', 1)[1])
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the local analysis service")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests, seed=args.seed)
+    latencies, errors, seconds = asyncio.run(run_load(requests, args.host, args.port, args.concurrency))
+    print_report(latencies, errors, seconds)
+    cache = asyncio.run(_fetch_stats(args.host, args.port))['cache']
+    print(f"  cache: {cache['size']:,}/{cache['maxsize']:,} entries, hit rate {cache['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
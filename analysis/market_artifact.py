@@ -0,0 +1,153 @@
+"""
+Market Data Artifact for BDPA Tech Job Market Analysis
+Compiles the skill demand table, skill combinations, industry scores and emerging tech
+into one versioned JSON file that the frontend's /api/market-data route serves as is
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = ANALYSIS_DIR / "results"
+ARTIFACT_PATH = RESULTS_DIR / "market_data.json"
+
+# Bump when the artifact's keys or their meaning change
+ARTIFACT_VERSION = 2
+
+DEMAND_SOURCES = (RESULTS_DIR / "skill_counts.csv", RESULTS_DIR / "top_100_skills.csv")
+# Skills kept in marketData; skill_counts.csv holds the whole vocabulary, which is far
+# more than the frontend uses and would make every response megabytes long
+DEMAND_TOP = 200
+COMBINATIONS_PATH = RESULTS_DIR / "cooccurrence" / "skill_combinations.json"
+INDUSTRY_SCORES_PATH = RESULTS_DIR / "intern_analysis" / "industry_demand_scores.json"
+TRENDS_PATH = RESULTS_DIR / "skill_trends.json"
+
+# Fallback when no skill trends have been computed: technologies flagged as emerging when
+# they appear in the demand table (same patterns as RealMarketAnalysisEngine.detectEmergingTech)
+EMERGING_TECH_PATTERNS = [
+    'kubernetes', 'terraform', 'graphql', 'microservices', 'pytorch',
+    'spark', 'kafka', 'prometheus', 'grafana',
+]
+
+
+def load_skill_demand(paths=DEMAND_SOURCES, min_count=1, top=None):
+    """
+    Read the first existing skill,count CSV into {lowercased skill: count}, largest first.
+
+    The tables are written largest first, so reading stops at the first count
+    below min_count and, with `top`, at the first skill past the top-th.
+    """
+    for path in paths:
+        if not Path(path).exists():
+            continue
+        demand = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                skill = (row.get('skill') or '').strip().lower()
+                try:
+                    count = int(float(row['count']))
+                except (TypeError, ValueError):
+                    continue
+                if count < min_count:
+                    break
+                if not skill:
+                    continue
+                if top is not None and skill not in demand and len(demand) >= top:
+                    break
+                demand[skill] = demand.get(skill, 0) + count
+        ordered = dict(sorted(demand.items(), key=lambda item: (-item[1], item[0])))
+        return ordered, Path(path)
+    raise FileNotFoundError(f"No skill demand table found (looked for {', '.join(str(p) for p in paths)})")
+
+
+def load_json(path, default):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f), Path(path)
+    except (OSError, ValueError):
+        return default, None
+
+
+def detect_emerging_tech(demand, patterns=EMERGING_TECH_PATTERNS):
+    """Skills in the demand table that contain one of the emerging-tech patterns, by demand"""
+    return [skill for skill in demand if any(pattern in skill for pattern in patterns)]
+
+
+def trending_emerging_tech(trends):
+    """Emerging skills from skill_trends.py output (surging or growing month over month), strongest first"""
+    return [entry['skill'] for entry in trends.get('emerging', [])]
+
+
+def content_hash(payload):
+    """Hash of the canonical JSON encoding, used as the artifact version and HTTP ETag"""
+    blob = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def build_artifact(min_count=1, top=DEMAND_TOP, combinations_path=COMBINATIONS_PATH,
+                   industry_scores_path=INDUSTRY_SCORES_PATH, trends_path=TRENDS_PATH):
+    """
+    Assemble the artifact as a dict in the /api/market-data response shape.
+
+    marketData holds the `top` most demanded skills; the route merges its
+    built-in core skills under them.
+
+    Missing optional inputs (co-occurrence output, intern industry scores) are
+    left empty so the route can fall back for just those fields. Emerging tech
+    comes from the monthly skill trends when they exist and from the name
+    patterns otherwise.
+    """
+    demand, demand_source = load_skill_demand(min_count=min_count, top=top)
+    combinations, combinations_source = load_json(combinations_path, {})
+    industry_scores, industry_source = load_json(industry_scores_path, {})
+    trends, trends_source = load_json(trends_path, {})
+
+    payload = {
+        'marketData': demand,
+        'skillCombinations': {skill: companions for skill, companions in combinations.items() if skill in demand},
+        'emergingTech': trending_emerging_tech(trends) if trends_source else detect_emerging_tech(demand),
+        'industryDemandScores': industry_scores,
+        'totalSkills': len(demand),
+        'sources': {
+            name: path.relative_to(ANALYSIS_DIR).as_posix() if path else None
+            for name, path in (('marketData', demand_source),
+                               ('skillCombinations', combinations_source),
+                               ('emergingTech', trends_source),
+                               ('industryDemandScores', industry_source))
+        },
+    }
+    return {'version': ARTIFACT_VERSION, 'etag': content_hash(payload), **payload}
+
+
+def write_artifact(artifact, path=ARTIFACT_PATH):
+    """Write the artifact compactly and atomically; returns the number of bytes written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blob = json.dumps(artifact, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    tmp = path.with_suffix('.json.tmp')
+    tmp.write_bytes(blob)
+    tmp.replace(path)
+    return len(blob)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the frontend market-data artifact")
+    parser.add_argument('--out', type=Path, default=ARTIFACT_PATH)
+    parser.add_argument('--min-count', type=int, default=1, help="Drop skills with fewer mentions")
+    parser.add_argument('--top', type=int, default=DEMAND_TOP, help="Most demanded skills kept in marketData")
+    args = parser.parse_args(argv)
+
+    artifact = build_artifact(min_count=args.min_count, top=args.top)
+    size = write_artifact(artifact, args.out)
+    print(f"✓ Market data v{artifact['version']} [{artifact['etag']}]: {artifact['totalSkills']:,} skills, "
+          f"{len(artifact['skillCombinations'])} combinations, {len(artifact['industryDemandScores'])} industries, "
+          f"{len(artifact['emergingTech'])} emerging ({size / 1024:.1f} KB) -> {args.out}")
+    for name, source in artifact['sources'].items():
+        print(f"  • {name:22s} {source or 'not available'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""
+Near-Duplicate Posting Detection for BDPA Tech Job Market Analysis
+Clusters reposted and syndicated postings with MinHash signatures and LSH banding so skill
+counts can be taken over one posting per cluster
+
+Each posting becomes a set of shingles: the words and full value of its normalized title,
+company and location, plus one shingle per listed skill (read from the skill store).
+Postings whose MinHash signatures agree on every row of at least one LSH band are
+candidates; candidates whose estimated Jaccard similarity reaches the threshold are
+linked, and the connected components are the duplicate clusters. The threshold sets
+precision; the band layout (chosen from the threshold and --recall-weight, or given with
+--bands) sets how many true pairs are found.
+
+Usage:
+    python analysis/near_duplicates.py [DATASET ...] [--threshold 0.8] [--num-perm 128]
+    python analysis/near_duplicates.py job_skills --recall-weight 0.7
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from data_cache import cache_status, dataset_path, file_sha256, read_dataset
+from skill_engine import SkillStore, explode_skills
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+DEDUP_CACHE_DIR = ANALYSIS_DIR / "cache" / "dedup"
+RESULTS_DIR = ANALYSIS_DIR / "results" / "dedup"
+
+# Dataset name -> posting key, text fields, skill list field, and (dataset, join column)
+# supplying the text fields when the dataset itself only has skills
+DEDUP_SOURCES = {
+    'unified_jobs': {'key': 'job_id', 'text': ('job_title', 'company_name', 'location'),
+                     'skills': None, 'join': None},
+    'dice_jobs': {'key': 'jobid', 'text': ('jobtitle', 'company', 'joblocation_address'),
+                  'skills': 'skills', 'join': None},
+    'ai_jobs': {'key': 'job_id', 'text': ('job_title', 'company_name', 'company_location'),
+                'skills': 'required_skills', 'join': None},
+    'job_skills': {'key': 'job_link', 'text': ('job_title', 'company', 'job_location'),
+                   'skills': 'job_skills', 'join': ('linkedin_postings', 'job_link')},
+}
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+# Permutations and (row, shingle) pairs per signing block; bound its working memory
+PERM_BLOCK = 32
+PAIR_BLOCK = 1 << 19
+
+_EMPTY = np.iinfo(np.uint32).max
+
+
+def _mix(values):
+    """splitmix64 finalizer: a fast, well-spread 64-bit hash of uint64 values"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xbf58476d1ce4e5b9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94d049bb133111eb)
+    return values ^ (values >> np.uint64(31))
+
+
+def _sorted_unique(values):
+    """np.unique for int64 keys via one in-place sort (much faster than its hash path here)"""
+    values = np.sort(values)
+    return values[np.r_[True, values[1:] != values[:-1]]] if len(values) else values
+
+
+def normalize_text(values):
+    """Lowercase, keep letters, digits, '+' and '#', and collapse everything else to single spaces"""
+    return (values.astype('string').str.lower()
+            .str.replace(r'[^0-9a-z+#]+', ' ', regex=True).str.strip())
+
+
+def _field_shingles(values, prefix, sep):
+    """
+    (row, shingle code) pairs and the shingle vocabulary of one column.
+
+    Values are factorized first and only the distinct ones are split, so a title
+    or company repeated across thousands of postings is tokenized once.
+    """
+    text = normalize_text(values) if sep == ' ' else values.astype('string').str.lower()
+    value_codes, uniques = pd.factorize(text)
+    parts = explode_skills(pd.Series(uniques, dtype=object), sep=sep)
+    vocab = parts.vocab
+    per_value = [parts.codes.astype(np.int64)]
+    value_of = [parts.posting_rows().astype(np.int64)]
+    labels = [f"{prefix}:" + vocab.astype(str)]
+    if sep == ' ':
+        # The whole value is a shingle too, so identical titles weigh more than shared words
+        per_value.append(np.arange(len(uniques), dtype=np.int64) + len(vocab))
+        value_of.append(np.arange(len(uniques), dtype=np.int64))
+        labels.append(f"{prefix}=" + np.asarray(uniques, dtype=str))
+    codes, owners = np.concatenate(per_value), np.concatenate(value_of)
+    labels = np.concatenate(labels).astype(object)
+    valid = np.r_[vocab != '', np.ones(len(labels) - len(vocab), dtype=bool)][codes]
+    codes, owners = codes[valid], owners[valid]
+
+    # Expand each distinct value's shingles to every row holding that value
+    order = np.argsort(owners, kind='stable')
+    codes = codes[order]
+    per_unique = np.bincount(owners, minlength=len(uniques))
+    starts = np.cumsum(per_unique) - per_unique
+    rows = np.flatnonzero(value_codes >= 0)
+    counts = per_unique[value_codes[rows]]
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(rows, counts), codes[np.repeat(starts[value_codes[rows]], counts) + offsets], labels
+
+
+def _store_shingles(skills):
+    """(row, shingle code) pairs and labels of a skill-store mapping whose posting_ids are row positions"""
+    used, codes = np.unique(np.asarray(skills.codes), return_inverse=True)
+    rows = np.asarray(skills.posting_ids, dtype=np.int64)[skills.posting_rows()]
+    return rows, codes.astype(np.int64), ("skill:" + skills.vocab[used].astype(str)).astype(object)
+
+
+def shingles(df, text_fields, skills_field=None, skills=None):
+    """
+    (rows, codes, hashes): every posting's (row, shingle code) pairs, sorted by row
+    and without repeats, and the 64-bit hash of each shingle code.
+
+    Text fields contribute their words and their whole normalized value, each
+    tagged with the field name; the skills contribute one shingle per skill, taken
+    from `skills` (a skill-store PostingSkills indexed by df's row positions) when
+    given and split from skills_field otherwise.
+    """
+    df = df.reset_index(drop=True)
+    fields = [(df[field], field, ' ') for field in text_fields]
+    if skills_field and skills is None:
+        fields.append((df[skills_field], 'skill', ','))
+
+    rows, codes, labels, base = [], [], [], 0
+    parts = [_field_shingles(values, prefix, sep) for values, prefix, sep in fields]
+    if skills is not None:
+        parts.append(_store_shingles(skills))
+    for field_rows, field_codes, field_labels in parts:
+        rows.append(field_rows)
+        codes.append(field_codes + base)
+        labels.append(field_labels)
+        base += len(field_labels)
+    rows, codes = np.concatenate(rows), np.concatenate(codes)
+
+    pairs = _sorted_unique(rows * base + codes)
+    return pairs // base, pairs % base, pd.util.hash_array(np.concatenate(labels))
+
+
+def minhash_signatures(rows, codes, hashes, n_rows, num_perm=DEFAULT_NUM_PERM, seed=0):
+    """
+    uint32 MinHash signature of every row from its sorted (row, shingle code) pairs.
+
+    Permutation i maps a shingle hash h to the top 32 bits of a_i * h + b_i (multiply-shift
+    hashing with odd a_i). Each distinct shingle is hashed once per permutation and the
+    per-row minima are taken with one reduceat per block. Rows without shingles keep the
+    all-max signature and are left out of the LSH step.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, np.iinfo(np.int64).max, num_perm, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, np.iinfo(np.int64).max, num_perm, dtype=np.int64).astype(np.uint64)
+    signatures = np.full((n_rows, num_perm), _EMPTY, dtype=np.uint32)
+    if len(rows) == 0:
+        return signatures
+
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    # Row-aligned pair blocks: each block covers whole rows and about PAIR_BLOCK pairs
+    bounds = np.unique(np.r_[np.searchsorted(starts, np.arange(0, len(rows), PAIR_BLOCK)), len(starts)])
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    for p in range(0, num_perm, PERM_BLOCK):
+        perms = slice(p, min(p + PERM_BLOCK, num_perm))
+        table = hashes[None, :] * multipliers[perms, None]
+        table += offsets[perms, None]
+        table = (table >> np.uint64(32)).astype(np.uint32)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            lo = starts[first]
+            hi = starts[last] if last < len(starts) else len(rows)
+            # take() keeps the gathered block C-ordered; fancy indexing would not,
+            # and reduceat along a strided axis is an order of magnitude slower
+            values = np.take(table, codes[lo:hi], axis=1)
+            signatures[rows[starts[first:last]], perms] = np.minimum.reduceat(values, starts[first:last] - lo, axis=1).T
+    return signatures
+
+
+def candidate_probability(similarity, bands, rows_per_band):
+    """Chance that two postings with this Jaccard similarity share at least one band"""
+    return 1 - (1 - similarity ** rows_per_band) ** bands
+
+
+def choose_bands(num_perm, threshold, recall_weight=0.5):
+    """
+    Band count (a divisor of num_perm) minimizing the weighted false-positive and
+    false-negative areas around the threshold; a higher recall_weight trades more
+    candidate pairs to verify for fewer missed duplicates.
+    """
+    grid = np.linspace(0, 1, 1001)
+    below, above = grid <= threshold, grid >= threshold
+    best, best_cost = 1, np.inf
+    for bands in (b for b in range(1, num_perm + 1) if num_perm % b == 0):
+        p = candidate_probability(grid, bands, num_perm // bands)
+        false_pos = np.trapezoid(p[below], grid[below])
+        false_neg = np.trapezoid(1 - p[above], grid[above])
+        cost = (1 - recall_weight) * false_pos + recall_weight * false_neg
+        if cost < best_cost:
+            best, best_cost = bands, cost
+    return best
+
+
+def candidate_pairs(signatures, bands):
+    """
+    Unique (a, b) row pairs, a < b, that share all values of at least one band.
+
+    Each band's bucket links its members to the bucket's first row rather than
+    to each other, so large buckets cost linear rather than quadratic work.
+    """
+    num_perm = signatures.shape[1]
+    rows_per_band = num_perm // bands
+    valid = np.flatnonzero(signatures[:, 0] != _EMPTY)
+    sig = signatures[valid]
+    edges = []
+    for band in range(bands):
+        key = np.zeros(len(sig), dtype=np.uint64)
+        for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+            key = _mix(key ^ sig[:, column].astype(np.uint64))
+        order = np.argsort(key, kind='stable')
+        sorted_keys = key[order]
+        new_bucket = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        first = order[np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))]
+        members = ~new_bucket
+        edges.append(np.stack([valid[first[members]], valid[order[members]]], axis=1))
+    if not edges:
+        return np.zeros((0, 2), dtype=np.int64)
+    edges = np.concatenate(edges)
+    edges.sort(axis=1)
+    unique = _sorted_unique(edges[:, 0] * len(signatures) + edges[:, 1])
+    return np.stack([unique // len(signatures), unique % len(signatures)], axis=1)
+
+
+def estimated_similarity(signatures, pairs, block=1 << 16):
+    """MinHash estimate of the Jaccard similarity of each row pair"""
+    similarity = np.empty(len(pairs), dtype=np.float32)
+    for start in range(0, len(pairs), block):
+        a, b = pairs[start:start + block, 0], pairs[start:start + block, 1]
+        similarity[start:start + block] = (signatures[a] == signatures[b]).mean(axis=1)
+    return similarity
+
+
+class DuplicateClusters:
+    """
+    Cluster assignment of every posting of one dataset.
+
+    cluster_id[i] is shared by all near-duplicates of row i (singletons get their
+    own id); representative[i] marks the first row of each cluster, which is the
+    one kept by dedup(). sources maps each dataset the postings were read from to
+    the SHA-256 of its CSV, so saved clusters can be checked against the data.
+    """
+
+    def __init__(self, keys, cluster_id, params=None, stats=None, sources=None):
+        self.keys = np.asarray(keys, dtype=object)
+        self.cluster_id = np.asarray(cluster_id, dtype=np.int64)
+        self.cluster_size = np.bincount(self.cluster_id)[self.cluster_id]
+        first = np.full(self.cluster_id.max(initial=-1) + 1, len(self.cluster_id), dtype=np.int64)
+        np.minimum.at(first, self.cluster_id, np.arange(len(self.cluster_id)))
+        self.representative = np.zeros(len(self.cluster_id), dtype=bool)
+        self.representative[first[first < len(self.cluster_id)]] = True
+        self.params = params or {}
+        self.stats = stats or {}
+        self.sources = sources
+
+    @property
+    def n_postings(self):
+        return len(self.cluster_id)
+
+    @property
+    def n_clusters(self):
+        return int(self.representative.sum())
+
+    @property
+    def n_duplicates(self):
+        return self.n_postings - self.n_clusters
+
+    def frame(self):
+        return pd.DataFrame({'key': self.keys, 'cluster_id': self.cluster_id,
+                             'cluster_size': self.cluster_size, 'representative': self.representative})
+
+    def dedup(self, df, key):
+        """Rows of df whose key is a cluster representative (rows with unknown keys are kept)"""
+        duplicates = pd.Index(self.keys[~self.representative])
+        return df[~df[key].astype(object).isin(duplicates)]
+
+    def largest(self, n=10):
+        """(cluster id, size) of the n largest clusters"""
+        sizes = pd.Series(self.cluster_size[self.representative], index=self.cluster_id[self.representative])
+        sizes = sizes[sizes > 1]
+        return list(sizes.nlargest(n).items())
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.frame().to_parquet(path)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'params': self.params, 'stats': self.stats, 'sources': self.sources}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        frame = pd.read_parquet(path)
+        with open(path.with_suffix('.json')) as f:
+            meta = json.load(f)
+        return cls(frame['key'].to_numpy(dtype=object), frame['cluster_id'].to_numpy(),
+                   meta['params'], meta['stats'], meta.get('sources'))
+
+
+def clustering_params(text_fields, skills_field=None, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                      bands=None, recall_weight=0.5, seed=0):
+    """The parameters recorded with clusters built from these arguments (bands resolved from the threshold)"""
+    bands = bands or choose_bands(num_perm, threshold, recall_weight)
+    return {'threshold': threshold, 'num_perm': num_perm, 'bands': bands,
+            'rows_per_band': num_perm // bands, 'recall_weight': recall_weight, 'seed': seed,
+            'text_fields': list(text_fields), 'skills_field': skills_field}
+
+
+def find_near_duplicates(df, key, text_fields, skills_field=None, threshold=DEFAULT_THRESHOLD,
+                         num_perm=DEFAULT_NUM_PERM, bands=None, recall_weight=0.5, seed=0, skills=None):
+    """Cluster the postings of df; returns DuplicateClusters aligned with df's rows"""
+    timings = {}
+    start = time.perf_counter()
+    rows, codes, hashes = shingles(df, text_fields, skills_field, skills)
+    timings['shingle_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    signatures = minhash_signatures(rows, codes, hashes, len(df), num_perm=num_perm, seed=seed)
+    timings['minhash_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    params = clustering_params(text_fields, skills_field, threshold, num_perm, bands, recall_weight, seed)
+    pairs = candidate_pairs(signatures, params['bands'])
+    similarity = estimated_similarity(signatures, pairs)
+    linked = pairs[similarity >= threshold]
+    graph = sparse.coo_matrix((np.ones(len(linked), dtype=np.int8), (linked[:, 0], linked[:, 1])),
+                              shape=(len(df), len(df)))
+    _, labels = connected_components(graph, directed=False)
+    timings['lsh_s'] = time.perf_counter() - start
+
+    stats = {'shingles': len(rows), 'candidate_pairs': len(pairs), 'linked_pairs': len(linked),
+             **{name: round(seconds, 3) for name, seconds in timings.items()}}
+    return DuplicateClusters(df[key].astype(object).to_numpy(), labels, params, stats)
+
+
+def load_source(name, datasets=None):
+    """The key, text and skill columns of a dataset, joined to its text source when it needs one"""
+    spec = DEDUP_SOURCES[name]
+    datasets = datasets or {}
+
+    def get(dataset, columns):
+        if dataset in datasets:
+            return datasets[dataset][columns]
+        return read_dataset(dataset, columns=columns)[0]
+
+    own = [spec['key']] + ([spec['skills']] if spec['skills'] else [])
+    if spec['join'] is None:
+        return get(name, own + list(spec['text']))
+    other, on = spec['join']
+    text = get(other, [on, *spec['text']]).drop_duplicates(on)
+    return get(name, own).merge(text, on=on, how='left')
+
+
+def source_skills(name):
+    """The dataset's postings from the skill store (row positions match load_source), or None without skills"""
+    return SkillStore().get(name) if DEDUP_SOURCES[name]['skills'] else None
+
+
+def source_fingerprint(name):
+    """SHA-256 of the dataset's CSV and of its join source's (None when missing), saved with its clusters"""
+    spec = DEDUP_SOURCES[name]
+    fingerprint = {}
+    for dataset in [name] + ([spec['join'][0]] if spec['join'] else []):
+        path = dataset_path(dataset)
+        if not path.exists():
+            fingerprint[dataset] = None
+            continue
+        valid, manifest = cache_status(dataset, path)
+        fingerprint[dataset] = manifest['sha256'] if valid else file_sha256(path)
+    return fingerprint
+
+
+def clusters_path(name, cache_dir=DEDUP_CACHE_DIR):
+    """Where the CLI saves a dataset's clusters (parameters and source fingerprint go next to it as .json)"""
+    return Path(cache_dir) / f"{name}_clusters.parquet"
+
+
+def cluster_dataset(name, datasets=None, **params):
+    spec = DEDUP_SOURCES[name]
+    df = load_source(name, datasets)
+    return find_near_duplicates(df, spec['key'], spec['text'], spec['skills'], skills=source_skills(name), **params)
+
+
+def dedup_view(name, df, datasets=None, cache_dir=DEDUP_CACHE_DIR, **params):
+    """
+    df with all but one posting of each near-duplicate cluster removed.
+
+    Uses the clusters saved by this module's CLI when they were built from the
+    same source data with the same parameters (the defaults when none are given)
+    and cover every key in df, and clusters df's dataset otherwise.
+    """
+    spec = DEDUP_SOURCES[name]
+    params = {k: v for k, v in params.items() if v is not None}
+    path = clusters_path(name, cache_dir)
+    clusters = None
+    if path.exists():
+        try:
+            clusters = DuplicateClusters.load(path)
+        except (OSError, ValueError, KeyError):
+            clusters = None
+        if clusters is not None and (clusters.params != clustering_params(spec['text'], spec['skills'], **params)
+                                     or clusters.sources != source_fingerprint(name)
+                                     or not df[spec['key']].astype(object).isin(pd.Index(clusters.keys)).all()):
+            print(f"⚠ Saved {name} clusters are stale (other source data or parameters), re-clustering")
+            clusters = None
+    if clusters is None:
+        clusters = cluster_dataset(name, datasets, **params)
+    view = clusters.dedup(df, spec['key'])
+    print(f"✓ Near-duplicate filter on {name}: kept {len(view):,} of {len(df):,} postings "
+          f"({len(df) - len(view):,} duplicates in {clusters.n_clusters:,} clusters)")
+    return view
+
+
+def print_clusters(name, clusters, df=None, examples=3):
+    p, s = clusters.params, clusters.stats
+    print(f"\n--- NEAR DUPLICATES: {name} ---")
+    print(f"  Postings: {clusters.n_postings:,} | Clusters: {clusters.n_clusters:,} | "
+          f"Duplicates: {clusters.n_duplicates:,} ({clusters.n_duplicates / max(clusters.n_postings, 1):.1%})")
+    print(f"  Threshold {p['threshold']} | {p['num_perm']} permutations in {p['bands']} bands × "
+          f"{p['rows_per_band']} rows | {s['candidate_pairs']:,} candidates → {s['linked_pairs']:,} linked")
+    print(f"  Shingling {s['shingle_s']:.2f}s | MinHash {s['minhash_s']:.2f}s | LSH + clustering {s['lsh_s']:.2f}s")
+    if df is None:
+        return
+    fields = [DEDUP_SOURCES[name]['key'], *DEDUP_SOURCES[name]['text']]
+    for cluster, size in clusters.largest(examples):
+        rows = np.flatnonzero(clusters.cluster_id == cluster)[:3]
+        print(f"  • cluster {cluster} ({size:,} postings), e.g.:")
+        for row in df.iloc[rows][fields].itertuples(index=False):
+            print(f"      {' | '.join(str(v) for v in row)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate job postings with MinHash LSH")
+    parser.add_argument('datasets', nargs='*', metavar='DATASET',
+                        help=f"Datasets to cluster ({', '.join(sorted(DEDUP_SOURCES))}; default unified_jobs)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum estimated Jaccard similarity for two postings to be duplicates")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM, help="MinHash permutations")
+    parser.add_argument('--bands', type=int, default=None,
+                        help="LSH bands (must divide --num-perm; chosen from the threshold by default)")
+    parser.add_argument('--recall-weight', type=float, default=0.5,
+                        help="0-1; higher finds more duplicates at the cost of more candidate pairs")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.bands and args.num_perm % args.bands:
+        parser.error("--bands must divide --num-perm")
+    unknown = [name for name in args.datasets if name not in DEDUP_SOURCES]
+    if unknown:
+        parser.error(f"unknown dataset(s) {', '.join(unknown)} (available: {', '.join(sorted(DEDUP_SOURCES))})")
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    summary = {}
+    for name in args.datasets or ['unified_jobs']:
+        start = time.perf_counter()
+        try:
+            sources = source_fingerprint(name)
+            df = load_source(name)
+            skills = source_skills(name)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            continue
+        spec = DEDUP_SOURCES[name]
+        clusters = find_near_duplicates(df, spec['key'], spec['text'], spec['skills'], threshold=args.threshold,
+                                        num_perm=args.num_perm, bands=args.bands,
+                                        recall_weight=args.recall_weight, seed=args.seed, skills=skills)
+        clusters.sources = sources
+        clusters.save(clusters_path(name))
+        print_clusters(name, clusters, df)
+        summary[name] = {'postings': clusters.n_postings, 'clusters': clusters.n_clusters,
+                         'duplicates': clusters.n_duplicates, 'params': clusters.params, 'stats': clusters.stats,
+                         'largest': [[int(c), int(size)] for c, size in clusters.largest(20)]}
+        print(f"✓ {name}: clustered in {time.perf_counter() - start:.2f}s → "
+              f"{clusters_path(name)}")
+
+    if not summary:
+        return 1
+    with open(RESULTS_DIR / "near_duplicates.json", 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"✓ Saved summary to {RESULTS_DIR / 'near_duplicates.json'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
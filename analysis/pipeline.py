@@ -0,0 +1,211 @@
+"""
+Memoizing Stage Runner for BDPA Tech Job Market Analysis
+Runs analysis stages in order and only recomputes the ones whose inputs or code changed
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import pickle
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+STAGE_CACHE_DIR = ANALYSIS_DIR / "cache" / "stages"
+
+
+class StopPipeline(Exception):
+    """Raised by a stage to end the run early; the message is printed"""
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    func is called with the results of `inputs` (earlier stage names, in order)
+    followed by `params` as keyword arguments. The cache key hashes the full source
+    of the module defining func and of every module in `code` (modules, or any
+    object defined in one), the params, the keys of the input stages and, if
+    given, `fingerprint()` for external inputs such as data files. Hashing whole
+    modules means a change to any helper or class they define invalidates the
+    stage without it having to be listed. `outputs` are all the files the stage
+    writes; a cached result is only reused while they all still exist. Stages
+    with persist=False are always executed.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, code=(), fingerprint=None, persist=True):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = [Path(p) for p in outputs]
+        self.params = params or {}
+        self.code = [func, *code]
+        self.fingerprint = fingerprint
+        self.persist = persist
+
+    def sources(self):
+        """Source files of the distinct modules that make up the code hash"""
+        files = set()
+        for obj in self.code:
+            module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+            try:
+                files.add(Path(inspect.getsourcefile(module)).resolve())
+            except TypeError:
+                # Built-in or dynamically created: nothing to read
+                continue
+        return sorted(files)
+
+    def code_hash(self):
+        # Keyed by file rather than module name so running a script as __main__ hashes the same
+        digest = hashlib.sha256()
+        for path in self.sources():
+            digest.update(path.name.encode('utf-8'))
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+
+class _Tee(io.TextIOBase):
+    """Write to the real stdout while keeping a copy for replay on cache hits"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer_ = io.StringIO()
+
+    def write(self, text):
+        self.stream.write(text)
+        return self.buffer_.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def getvalue(self):
+        return self.buffer_.getvalue()
+
+
+class Pipeline:
+    """Ordered collection of stages with a content-addressed result cache"""
+
+    def __init__(self, stages, cache_dir=STAGE_CACHE_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+        self.cache_dir = Path(cache_dir)
+        self._keys = {}
+        for stage in stages:
+            unknown = [name for name in stage.inputs if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown or later stage(s): {unknown}")
+
+    def key(self, name):
+        """Content-addressed key of a stage (memoized for the lifetime of the pipeline)"""
+        if name not in self._keys:
+            stage = self.stages[name]
+            payload = {
+                'stage': name,
+                'code': stage.code_hash(),
+                'params': repr(sorted(stage.params.items())),
+                'inputs': [self.key(dep) for dep in stage.inputs],
+                'external': stage.fingerprint() if stage.fingerprint else None,
+            }
+            blob = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+            self._keys[name] = hashlib.sha256(blob).hexdigest()[:20]
+        return self._keys[name]
+
+    def _cache_path(self, name):
+        return self.cache_dir / f"{name}-{self.key(name)}.pkl"
+
+    def _load_cached(self, name):
+        stage = self.stages[name]
+        path = self._cache_path(name)
+        if not stage.persist or not path.exists() or not all(p.exists() for p in stage.outputs):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _store(self, name, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.cache_dir.glob(f"{name}-*.pkl"):
+            stale.unlink()
+        path = self._cache_path(name)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    def select(self, only=None, start=None):
+        """Stage names to run: everything, just `only`, or `start` and every stage after it"""
+        for name in list(only or []) + ([start] if start else []):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'. Available: {', '.join(self.order)}")
+        if only:
+            return [name for name in self.order if name in only]
+        if start:
+            return self.order[self.order.index(start):]
+        return list(self.order)
+
+    def run(self, only=None, start=None, force=False, verbose=True, metrics=None):
+        """
+        Run the selected stages and return {stage name: result}.
+
+        Selected stages are served from cache when their key is unchanged (unless
+        force=True); their captured console output is replayed so the run reads
+        the same. Inputs are only evaluated when a stage misses the cache, so a
+        fully cached run never loads data. Unselected stages run silently.
+        With `metrics` (an instrumentation.RunMetrics), every stage's timing,
+        memory and row counts are recorded, and cached stages are noted as such.
+        """
+        selected = self.select(only, start)
+        results, status = {}, {}
+
+        def resolve(name):
+            if name in results:
+                return results[name]
+            stage = self.stages[name]
+            is_selected = name in selected
+
+            cached = None if (force and is_selected) else self._load_cached(name)
+            if cached is not None:
+                if is_selected:
+                    sys.stdout.write(cached['stdout'])
+                results[name], status[name] = cached['result'], 'cached'
+                if metrics is not None:
+                    metrics.skipped(name)
+                return results[name]
+
+            # Inputs are only materialized when this stage actually has to run
+            args = [resolve(dep) for dep in stage.inputs]
+
+            start_time = time.perf_counter()
+            capture = _Tee(sys.stdout) if is_selected else io.StringIO()
+            with redirect_stdout(capture):
+                if metrics is None:
+                    result = stage.func(*args, **stage.params)
+                else:
+                    with metrics.stage(name, inputs=args or None) as record:
+                        result = record.output(stage.func(*args, **stage.params))
+
+            if stage.persist:
+                self._store(name, {'result': result, 'stdout': capture.getvalue()})
+            results[name] = result
+            status[name] = f"ran in {time.perf_counter() - start_time:.2f}s"
+            return result
+
+        try:
+            for name in selected:
+                # Non-persisted stages run on demand unless explicitly requested
+                if self.stages[name].persist or (only and name in only):
+                    resolve(name)
+        except StopPipeline as stop:
+            print(stop)
+
+        if verbose:
+            print("\n--- PIPELINE STAGES ---")
+            for name in self.order:
+                print(f"  • {name:16s} {status.get(name, 'skipped')}  [{self.key(name)}]")
+        self.last_status = status
+        return results
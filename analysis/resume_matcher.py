@@ -0,0 +1,327 @@
+"""
+Resume-to-Posting Matcher for BDPA Tech Job Market Analysis
+Fits TF-IDF once over the job postings and ranks resumes against every posting with one sparse product
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from data_cache import dataset_path, read_dataset
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+MATCHER_CACHE_DIR = ANALYSIS_DIR / "cache" / "matcher"
+
+# Dataset name -> columns used for the posting id, title, company and matchable text
+POSTING_SOURCES = {
+    'unified_jobs': {
+        'id': 'job_id', 'title': 'job_title', 'company': 'company_name',
+        'text': ['job_title', 'job_level', 'job_type'],
+    },
+    'ai_jobs': {
+        'id': 'job_id', 'title': 'job_title', 'company': 'company_name',
+        'text': ['job_title', 'required_skills', 'experience_level', 'industry'],
+    },
+    'ai_jobs_snapshot': {
+        'id': 'job_id', 'title': 'job_title', 'company': 'company_name',
+        'text': ['job_title', 'required_skills', 'experience_level', 'industry'],
+    },
+    'linkedin_postings': {
+        'id': 'job_link', 'title': 'job_title', 'company': 'company',
+        'text': ['job_title', 'job_level', 'job_type'],
+    },
+}
+
+# Sources the resume matcher is fitted on by default
+MATCH_SOURCES = ('unified_jobs', 'ai_jobs')
+
+# Same tokenizer rules as TextProcessor in frontend/bdpafrontend-main/lib/ml-engine.ts
+TOKEN_PATTERN = re.compile(r"[\w+#.-]+")
+STOP_WORDS = frozenset("""
+    the a an and or but in on at to for of with by from up about into through during before after
+    above below between among within without against toward across behind beyond this that these
+    those i you he she it we they me him her us them my your his its our their mine yours ours
+    theirs myself yourself himself herself itself ourselves yourselves themselves what which who
+    whom whose where when why how all any both each few more most other some such no nor not only
+    own same so than too very can will just should now also have has had be been being is are was
+    were do does did doing get got getting
+""".split())
+
+
+def tokenize(text):
+    """Lowercased tech-aware tokens without stop words, single characters or pure numbers"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOP_WORDS and not token.isdigit()]
+
+
+def analyze(text, ngram_range=(1, 2)):
+    """Tokens plus their n-grams for every n in ngram_range"""
+    tokens = tokenize(text)
+    lo, hi = ngram_range
+    terms = list(tokens) if lo <= 1 else []
+    for n in range(max(lo, 2), hi + 1):
+        terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return terms
+
+
+def _as_text(column):
+    """Plain str values with missing as '' (categorical columns reject fillna(''))"""
+    return column.astype(object).fillna('').astype(str)
+
+
+def load_postings(sources=None):
+    """One row per posting with posting_id, source, title, company and the text to match against"""
+    frames = []
+    for name in sources or MATCH_SOURCES:
+        spec = POSTING_SOURCES[name]
+        columns = list(dict.fromkeys([spec['id'], spec['title'], spec['company'], *spec['text']]))
+        try:
+            df, _ = read_dataset(name, columns=columns)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            continue
+        text = _as_text(df[spec['text'][0]])
+        for col in spec['text'][1:]:
+            text = text + ' ' + _as_text(df[col])
+        frames.append(pd.DataFrame({
+            'posting_id': _as_text(df[spec['id']]).to_numpy(),
+            'source': name,
+            'title': _as_text(df[spec['title']]).to_numpy(),
+            'company': _as_text(df[spec['company']]).to_numpy(),
+            'text': text.to_numpy(),
+        }))
+        print(f"✓ {name}: {len(df):,} postings")
+    if not frames:
+        raise RuntimeError("No posting sources could be loaded")
+    return pd.concat(frames, ignore_index=True)
+
+
+def _l2_normalize(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+class TfidfMatcher:
+    """
+    TF-IDF index over job postings.
+
+    Term weights follow TFIDFVectorizer in lib/ml-engine.ts: (1 + log tf) * log(N / df).
+    Rows are L2-normalized, so the cosine similarity of a batch of resumes with
+    every posting is the single sparse product Q @ X.T.
+    """
+
+    def __init__(self, ngram_range=(1, 2), min_df=2, max_features=None):
+        self.ngram_range = tuple(ngram_range)
+        self.min_df = min_df
+        self.max_features = max_features
+        self.vocabulary = {}
+        self.idf = None
+        self.matrix = None
+        self.postings = None
+        self._matrix_t = None
+
+    def _count(self, documents, vocabulary, grow):
+        """Sparse term-count matrix; new terms are added to vocabulary when grow is set"""
+        indices, indptr, data = [], [0], []
+        for doc in documents:
+            counts = {}
+            for term in analyze(doc, self.ngram_range):
+                j = vocabulary.get(term)
+                if j is None:
+                    if not grow:
+                        continue
+                    j = vocabulary[term] = len(vocabulary)
+                counts[j] = counts.get(j, 0) + 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+
+    def _weight(self, counts):
+        counts = counts.copy()
+        counts.data = 1.0 + np.log(counts.data)
+        return _l2_normalize(counts.multiply(self.idf).tocsr().astype(np.float32))
+
+    def fit(self, postings):
+        """Fit on a postings frame from load_postings() (or any frame with a 'text' column)"""
+        vocabulary = {}
+        counts = self._count(postings['text'], vocabulary, grow=True)
+
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        keep = np.flatnonzero(df >= self.min_df)
+        if self.max_features and len(keep) > self.max_features:
+            keep = keep[np.argsort(-df[keep], kind='stable')[:self.max_features]]
+            keep.sort()
+        terms = np.array(list(vocabulary), dtype=object)[keep]
+
+        self.vocabulary = {term: j for j, term in enumerate(terms)}
+        self.idf = np.log(len(postings) / df[keep]).astype(np.float32)
+        self.matrix = self._weight(counts[:, keep])
+        self.postings = postings.drop(columns=['text']).reset_index(drop=True)
+        self._matrix_t = None
+        return self
+
+    def transform(self, texts):
+        """L2-normalized TF-IDF rows for resume texts, in the fitted vocabulary"""
+        return self._weight(self._count(texts, self.vocabulary, grow=False))
+
+    def top_k(self, texts, k=10, batch_size=256):
+        """
+        Best k postings for each text as (indices, scores), both shaped (len(texts), k).
+
+        Each batch is one sparse product against every posting; the k best
+        columns of every row are picked with argpartition and then sorted.
+        """
+        if self._matrix_t is None:
+            self._matrix_t = self.matrix.T.tocsr()
+        k = min(k, self.matrix.shape[0])
+        queries = self.transform(texts)
+        indices = np.empty((queries.shape[0], k), dtype=np.int64)
+        scores = np.empty((queries.shape[0], k), dtype=np.float32)
+
+        for start in range(0, queries.shape[0], batch_size):
+            block = (queries[start:start + batch_size] @ self._matrix_t).toarray()
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            indices[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+        return indices, scores
+
+    def match(self, text, k=10):
+        """Top-k postings for one resume as a DataFrame with a 'score' column"""
+        indices, scores = self.top_k([text], k=k)
+        matches = self.postings.iloc[indices[0]].reset_index(drop=True)
+        matches['score'] = np.round(scores[0], 4)
+        return matches
+
+    def save(self, path):
+        """Store the index as one .npz (sparse matrix, idf, vocabulary and posting metadata)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp,
+            data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape), idf=self.idf,
+            terms=np.array(list(self.vocabulary), dtype=str),
+            params=np.array(json.dumps({'ngram_range': self.ngram_range, 'min_df': self.min_df,
+                                        'max_features': self.max_features})),
+            **{f"posting_{col}": self.postings[col].to_numpy(dtype=str) for col in self.postings.columns},
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            params = json.loads(str(npz['params']))
+            matcher = cls(ngram_range=params['ngram_range'], min_df=params['min_df'],
+                          max_features=params['max_features'])
+            matcher.matrix = sparse.csr_matrix((npz['data'], npz['indices'], npz['indptr']), shape=tuple(npz['shape']))
+            matcher.idf = npz['idf']
+            matcher.vocabulary = {term: j for j, term in enumerate(npz['terms'].tolist())}
+            matcher.postings = pd.DataFrame({key[len('posting_'):]: npz[key] for key in npz.files
+                                             if key.startswith('posting_')})
+        return matcher
+
+
+def index_path(sources=None, cache_dir=MATCHER_CACHE_DIR, **params):
+    """Cache file for an index, keyed on the source files' size/mtime and the fit parameters"""
+    sources = list(sources or MATCH_SOURCES)
+    stats = {}
+    for name in sources:
+        path = dataset_path(name)
+        stat = path.stat() if path.exists() else None
+        stats[name] = (stat.st_size, stat.st_mtime_ns) if stat else None
+    blob = json.dumps({'sources': stats, 'params': params, 'spec': {n: POSTING_SOURCES[n] for n in sources}},
+                      sort_keys=True, default=str)
+    return Path(cache_dir) / f"tfidf-{hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]}.npz"
+
+
+def load_or_fit(sources=None, refit=False, cache_dir=MATCHER_CACHE_DIR, **params):
+    """Reuse the cached index for these sources and parameters, fitting (and caching) it otherwise"""
+    path = index_path(sources, cache_dir, **params)
+    if path.exists() and not refit:
+        try:
+            return TfidfMatcher.load(path), True
+        except Exception as e:
+            print(f"⚠ Matcher cache unreadable ({e}), refitting")
+    matcher = TfidfMatcher(**params).fit(load_postings(sources))
+    for stale in Path(cache_dir).glob("tfidf-*.npz"):
+        stale.unlink()
+    matcher.save(path)
+    return matcher, False
+
+
+def benchmark(matcher, n_resumes=1000, k=10, seed=0):
+    """Latency in ms per resume for one-at-a-time and batched scoring, using posting texts as resumes"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(matcher.matrix.shape[0], size=min(n_resumes, matcher.matrix.shape[0]), replace=False)
+    # Rebuild pseudo-resumes from the fitted terms of sampled postings
+    terms = np.array(list(matcher.vocabulary), dtype=object)
+    texts = [' '.join(t for t in terms[matcher.matrix.indices[matcher.matrix.indptr[i]:matcher.matrix.indptr[i + 1]]]
+                      if ' ' not in t) for i in rows]
+
+    single = texts[:min(100, len(texts))]
+    start = time.perf_counter()
+    for text in single:
+        matcher.top_k([text], k=k)
+    single_ms = (time.perf_counter() - start) * 1000 / len(single)
+
+    start = time.perf_counter()
+    indices, _ = matcher.top_k(texts, k=k)
+    batch_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+    return {
+        'postings': matcher.matrix.shape[0], 'terms': len(matcher.vocabulary), 'resumes': len(texts),
+        'single_ms': single_ms, 'batch_ms': batch_ms,
+        'self_in_top_k': float(np.mean([row in top for row, top in zip(rows, indices)])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank job postings against resumes with TF-IDF")
+    parser.add_argument('resumes', nargs='*', type=Path, help="Resume text files")
+    parser.add_argument('--text', help="Resume text given inline")
+    parser.add_argument('--sources', nargs='+', choices=sorted(POSTING_SOURCES), default=None)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--min-df', type=int, default=2)
+    parser.add_argument('--refit', action='store_true', help="Ignore the cached index")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=0,
+                        help="Time scoring of N pseudo-resumes sampled from the postings")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matcher, cache_hit = load_or_fit(args.sources, refit=args.refit, min_df=args.min_df)
+    print(f"✓ TF-IDF index: {matcher.matrix.shape[0]:,} postings × {len(matcher.vocabulary):,} terms "
+          f"({'cached' if cache_hit else 'fitted'} in {time.perf_counter() - start:.2f}s)")
+
+    texts = [(str(path), path.read_text(encoding='utf-8', errors='ignore')) for path in args.resumes]
+    if args.text:
+        texts.append(('--text', args.text))
+    for label, text in texts:
+        print(f"\n--- TOP {args.top_k} POSTINGS FOR {label} ---")
+        print(matcher.match(text, k=args.top_k)[['score', 'title', 'company', 'source']].to_string(index=False))
+
+    if args.benchmark:
+        r = benchmark(matcher, n_resumes=args.benchmark, k=args.top_k)
+        print(f"\n--- MATCHER BENCHMARK ({r['resumes']:,} resumes vs {r['postings']:,} postings, "
+              f"{r['terms']:,} terms) ---")
+        print(f"  • one at a time: {r['single_ms']:.2f} ms/resume")
+        print(f"  • batched:       {r['batch_ms']:.3f} ms/resume")
+        print(f"  • source posting in top {args.top_k}: {r['self_in_top_k']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
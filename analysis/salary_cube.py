@@ -0,0 +1,420 @@
+"""
+Salary Cube for BDPA Tech Job Market Analysis
+Precomputes posting counts and salary quantile sketches for every combination of experience
+level, location, work type, remote status and skill, so slice and roll-up queries are lookups
+
+Every dimension also has an "all" member ('*'), and all 32 roll-ups are materialized at build
+time, so "median salary of remote entry-level Python roles in Seattle" is one binary search
+over the sorted cell keys plus a read of precomputed quantiles. Each cell also keeps its
+sparse DDSketch buckets, so cells can be merged for queries that list several members of a
+dimension (e.g. Seattle or Portland) and any quantile can be read back.
+
+Locations are reduced to the part before the first comma (city for US postings, country
+for the 2025 AI datasets). Skills come from the AI datasets' required_skills, normalized
+through the shared alias map; the tech postings have no skill list and only count towards
+skill='*'.
+
+Usage:
+    python analysis/salary_cube.py                       # build from every source
+    python analysis/salary_cube.py --query experience=entry remote=remote skill=python
+"""
+
+import argparse
+import itertools
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import read_dataset
+from intern_focused_analysis import normalize_skill
+from sketches import QuantileSketch
+from skill_engine import SkillStore
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+CUBE_PATH = ANALYSIS_DIR / "cache" / "cube" / "salary_cube.npz"
+
+# Bump when the stored arrays change so old cubes are rebuilt instead of misread
+CUBE_FORMAT_VERSION = 1
+
+DIMENSIONS = ('experience', 'location', 'work_type', 'remote', 'skill')
+ALL = '*'
+UNKNOWN = 'unknown'
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+QUANTILE_LABELS = tuple(f"p{round(q * 100)}" for q in QUANTILES)
+RELATIVE_ACCURACY = 0.01
+
+# Dataset name -> source column of each dimension and of the salary
+CUBE_SOURCES = {
+    'job_postings': {'experience': 'formatted_experience_level', 'location': 'location',
+                     'work_type': 'formatted_work_type', 'remote': 'remote_allowed',
+                     'skill': None, 'salary': 'normalized_salary'},
+    'ai_jobs': {'experience': 'experience_level', 'location': 'company_location',
+                'work_type': 'employment_type', 'remote': 'remote_ratio',
+                'skill': 'required_skills', 'salary': 'salary_usd'},
+}
+
+# Source labels -> shared members (LinkedIn levels and the AI datasets' EN/MI/SE/EX codes)
+EXPERIENCE_LEVELS = {
+    'internship': 'intern', 'entry level': 'entry', 'en': 'entry', 'associate': 'mid', 'mi': 'mid',
+    'mid-senior level': 'senior', 'se': 'senior', 'director': 'executive', 'executive': 'executive',
+    'ex': 'executive',
+}
+WORK_TYPES = {
+    'full-time': 'full-time', 'ft': 'full-time', 'part-time': 'part-time', 'pt': 'part-time',
+    'contract': 'contract', 'ct': 'contract', 'fl': 'freelance', 'freelance': 'freelance',
+    'temporary': 'temporary', 'internship': 'internship', 'volunteer': 'volunteer', 'other': 'other',
+}
+
+
+def _members(values, mapping=None):
+    """Lowercased dimension members of a column, mapped to shared labels when a mapping is given"""
+    text = values.astype('string').str.strip().str.lower()
+    if mapping is not None:
+        text = text.map(mapping, na_action='ignore').astype('string')
+    return text.fillna(UNKNOWN).replace('', UNKNOWN)
+
+
+def remote_members(values):
+    """'remote' / 'hybrid' / 'onsite' from a remote_allowed flag or a 0-100 remote_ratio"""
+    if pd.api.types.is_bool_dtype(values.dtype):
+        flag = values.astype('boolean')
+        return pd.Series(np.where(flag.isna(), UNKNOWN, np.where(flag.fillna(False), 'remote', 'onsite')),
+                         index=values.index, dtype='string')
+    ratio = pd.to_numeric(values, errors='coerce').astype('float64')
+    return pd.Series(np.select([ratio >= 100, ratio > 0, ratio == 0], ['remote', 'hybrid', 'onsite'], UNKNOWN),
+                     index=values.index, dtype='string')
+
+
+def cube_frame(name, df):
+    """One source's postings as dimension members and salary (skills come from the skill store)"""
+    columns = CUBE_SOURCES[name]
+    return pd.DataFrame({
+        'experience': _members(df[columns['experience']], EXPERIENCE_LEVELS),
+        'location': _members(df[columns['location']].astype('string').str.split(',').str[0]),
+        'work_type': _members(df[columns['work_type']], WORK_TYPES),
+        'remote': remote_members(df[columns['remote']]),
+        'salary': pd.to_numeric(df[columns['salary']], errors='coerce').astype('float64'),
+    })
+
+
+def _factorize_sorted(keys):
+    """(codes, sorted unique keys) of an int64 array via a hash factorize"""
+    codes, uniques = pd.factorize(keys)
+    order = np.argsort(uniques)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[codes], uniques[order]
+
+
+class SalaryCube:
+    """
+    Fully materialized cube over DIMENSIONS.
+
+    keys[i] is the mixed-radix code of cell i (member code times stride per
+    dimension, code 0 being ALL); counts, salary_count and salary_sum are the
+    cell's postings, postings with a salary and their total, quantiles[i] the
+    QUANTILES of its salaries, and buckets[indptr[i]:indptr[i + 1]] with
+    bucket_counts its sparse DDSketch store.
+    """
+
+    def __init__(self, vocab, keys, counts, salary_count, salary_sum, quantiles, indptr, buckets, bucket_counts,
+                 relative_accuracy=RELATIVE_ACCURACY, sources=()):
+        self.vocab = {dim: np.asarray(vocab[dim], dtype=object) for dim in DIMENSIONS}
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.salary_count = np.asarray(salary_count, dtype=np.int64)
+        self.salary_sum = np.asarray(salary_sum, dtype=np.float64)
+        self.quantiles = np.asarray(quantiles, dtype=np.float32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.buckets = np.asarray(buckets, dtype=np.int32)
+        self.bucket_counts = np.asarray(bucket_counts, dtype=np.int64)
+        self.relative_accuracy = relative_accuracy
+        self.sources = list(sources)
+        self.strides = np.cumprod([1] + [len(self.vocab[dim]) for dim in DIMENSIONS[:-1]]).astype(np.int64)
+        self._codes = {dim: {member: code for code, member in enumerate(self.vocab[dim])} for dim in DIMENSIONS}
+
+    @classmethod
+    def build(cls, frames, skills=None, relative_accuracy=RELATIVE_ACCURACY):
+        """
+        Materialize every roll-up of the postings in {source: cube_frame(...)}; skills maps
+        a source to its skill-store PostingSkills, whose posting_ids are rows of its frame
+        """
+        postings = pd.concat(frames.values(), ignore_index=True)
+        vocab, codes = {}, {}
+        for dim in DIMENSIONS[:-1]:
+            dim_codes, members = pd.factorize(postings[dim])
+            vocab[dim] = np.r_[[ALL], np.asarray(members, dtype=object)]
+            codes[dim] = dim_codes.astype(np.int64) + 1
+
+        # Store skills are already case-folded; aliases are merged so they share one member
+        pair_posting, pair_code, offset = [], [], 0
+        for name, frame in frames.items():
+            mapping = (skills or {}).get(name)
+            if mapping is not None:
+                pair_posting.append(offset + np.asarray(mapping.posting_ids, dtype=np.int64)[mapping.posting_rows()])
+                pair_code.append(np.asarray(mapping.codes, dtype=np.int64))
+            offset += len(frame)
+        pair_posting = np.concatenate(pair_posting) if pair_posting else np.zeros(0, dtype=np.int64)
+        used, pair_code = np.unique(np.concatenate(pair_code) if pair_code else np.zeros(0, dtype=np.int64),
+                                    return_inverse=True)
+        vocab_array = next((m.vocab for m in (skills or {}).values()), np.zeros(0, dtype=object))
+        canonical, members = pd.factorize(np.array([normalize_skill(s) for s in vocab_array[used]], dtype=object))
+        vocab['skill'] = np.r_[[ALL], np.asarray(members, dtype=object)]
+        pair_skill = canonical[pair_code].astype(np.int64) + 1
+        pairs = np.unique(pair_posting * len(vocab['skill']) + pair_skill)
+        pair_posting, pair_skill = pairs // len(vocab['skill']), pairs % len(vocab['skill'])
+
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        salary = postings['salary'].to_numpy()
+        has_salary = np.isfinite(salary) & (salary > 0)
+        bucket = np.zeros(len(salary), dtype=np.int64)
+        bucket[has_salary] = np.ceil(np.log(salary[has_salary]) / math.log(gamma)).astype(np.int64)
+
+        strides = np.cumprod([1] + [len(vocab[dim]) for dim in DIMENSIONS[:-1]]).astype(np.int64)
+        keys, rows = [], []
+        for mask in itertools.product((False, True), repeat=len(DIMENSIONS) - 1):
+            base = np.zeros(len(postings), dtype=np.int64)
+            for dim, stride, keep in zip(DIMENSIONS, strides, mask):
+                if keep:
+                    base += codes[dim] * stride
+            keys += [base, base[pair_posting] + pair_skill * strides[-1]]
+            rows += [np.arange(len(postings)), pair_posting]
+        keys, rows = np.concatenate(keys), np.concatenate(rows)
+
+        cell, cell_keys = _factorize_sorted(keys)
+        n_cells = len(cell_keys)
+        counts = np.bincount(cell, minlength=n_cells)
+        paid = has_salary[rows]
+        salary_count = np.bincount(cell[paid], minlength=n_cells)
+        salary_sum = np.bincount(cell[paid], weights=salary[rows[paid]], minlength=n_cells)
+
+        # Sparse sketch entries: one (cell, bucket) run per distinct pair, ordered by cell then bucket
+        lo = bucket[has_salary].min(initial=0)
+        span = bucket[has_salary].max(initial=0) - lo + 1
+        entries = np.sort(cell[paid] * span + (bucket[rows[paid]] - lo))
+        starts = np.flatnonzero(np.r_[True, entries[1:] != entries[:-1]]) if len(entries) else np.zeros(0, np.int64)
+        bucket_counts = np.diff(np.r_[starts, len(entries)])
+        entry_cell, entry_bucket = entries[starts] // span, entries[starts] % span + lo
+        indptr = np.r_[0, np.cumsum(np.bincount(entry_cell, minlength=n_cells))]
+
+        quantiles = _cell_quantiles(indptr, entry_bucket, bucket_counts, salary_count, gamma)
+        return cls(vocab, cell_keys, counts, salary_count, salary_sum, quantiles, indptr,
+                   entry_bucket, bucket_counts, relative_accuracy, sources=list(frames))
+
+    def save(self, path=CUBE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path, format=CUBE_FORMAT_VERSION, relative_accuracy=self.relative_accuracy,
+            sources=np.asarray(self.sources, dtype=str), keys=self.keys,
+            counts=self.counts.astype(np.int32), salary_count=self.salary_count.astype(np.int32),
+            salary_sum=self.salary_sum, quantiles=self.quantiles, indptr=self.indptr,
+            buckets=self.buckets.astype(np.int16), bucket_counts=self.bucket_counts.astype(np.int32),
+            **{f"vocab_{dim}": self.vocab[dim].astype(str) for dim in DIMENSIONS})
+        return path.stat().st_size
+
+    @classmethod
+    def load(cls, path=CUBE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['format']) != CUBE_FORMAT_VERSION:
+                raise ValueError(f"cube format {int(data['format'])} is not {CUBE_FORMAT_VERSION}; rebuild it")
+            return cls({dim: data[f"vocab_{dim}"] for dim in DIMENSIONS}, data['keys'], data['counts'],
+                       data['salary_count'], data['salary_sum'], data['quantiles'], data['indptr'],
+                       data['buckets'], data['bucket_counts'], float(data['relative_accuracy']),
+                       data['sources'].tolist())
+
+    @property
+    def n_cells(self):
+        return len(self.keys)
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.keys, self.counts, self.salary_count, self.salary_sum,
+                                      self.quantiles, self.indptr, self.buckets, self.bucket_counts))
+
+    def member_code(self, dim, member):
+        """Code of a member (case-insensitive; None or '*' is ALL); KeyError when unknown"""
+        if member is None:
+            return 0
+        member = str(member).strip().lower()
+        return self._codes[dim][normalize_skill(member) if dim == 'skill' else member]
+
+    def cell(self, **members):
+        """Index of the cell for one member per dimension, or -1 when it holds no postings"""
+        key = 0
+        for dim, stride in zip(DIMENSIONS, self.strides):
+            key += self.member_code(dim, members.get(dim)) * int(stride)
+        i = int(self.keys.searchsorted(key))
+        return i if i < len(self.keys) and self.keys[i] == key else -1
+
+    def sketch(self, i):
+        """The QuantileSketch of cell i, for merging or arbitrary quantiles"""
+        sketch = QuantileSketch(self.relative_accuracy)
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        if stop > start:
+            buckets = self.buckets[start:stop].astype(np.int64)
+            sketch.positive.offset = int(buckets[0])
+            sketch.positive.counts = np.zeros(int(buckets[-1] - buckets[0]) + 1, dtype=np.int64)
+            sketch.positive.counts[buckets - buckets[0]] = self.bucket_counts[start:stop]
+        return sketch
+
+    def query(self, **members):
+        """
+        Counts and salary statistics for a slice, e.g. query(experience='entry', skill='python').
+
+        Omitted dimensions are rolled up. A list of members merges their cells'
+        sketches (still without touching postings); a single member per
+        dimension is a direct lookup of the precomputed quantiles. Cells are
+        disjoint except along skill, where a posting listing two of the given
+        skills counts once per skill.
+        """
+        unknown = members.keys() - DIMENSIONS
+        if unknown:
+            raise KeyError(f"unknown dimension(s): {', '.join(sorted(unknown))}")
+        multi = {dim: value for dim, value in members.items() if isinstance(value, (list, tuple, set))}
+        if not multi:
+            i = self.cell(**members)
+            if i < 0:
+                return _stats(0, 0, 0.0, [math.nan] * len(QUANTILES))
+            return _stats(int(self.counts[i]), int(self.salary_count[i]), float(self.salary_sum[i]),
+                          self.quantiles[i].tolist())
+
+        count = salary_count = 0
+        salary_sum = 0.0
+        merged = QuantileSketch(self.relative_accuracy)
+        for combo in itertools.product(*(sorted(set(v)) for v in multi.values())):
+            i = self.cell(**{**members, **dict(zip(multi, combo))})
+            if i >= 0:
+                count += int(self.counts[i])
+                salary_count += int(self.salary_count[i])
+                salary_sum += float(self.salary_sum[i])
+                merged.merge(self.sketch(i))
+        return _stats(count, salary_count, salary_sum, merged.quantiles(QUANTILES))
+
+    def breakdown(self, dim, min_count=1, **members):
+        """Statistics for every member of `dim` within a slice, as a DataFrame sorted by count"""
+        base = 0
+        for other, stride in zip(DIMENSIONS, self.strides):
+            if other != dim:
+                base += self.member_code(other, members.get(other)) * int(stride)
+        stride = int(self.strides[DIMENSIONS.index(dim)])
+        keys = base + np.arange(1, len(self.vocab[dim]), dtype=np.int64) * stride
+        idx = np.minimum(self.keys.searchsorted(keys), len(self.keys) - 1)
+        found = self.keys[idx] == keys
+        idx, member = idx[found], self.vocab[dim][1:][found]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.salary_sum[idx] / self.salary_count[idx]
+        frame = pd.DataFrame({dim: member, 'count': self.counts[idx], 'salary_count': self.salary_count[idx],
+                              'mean': mean})
+        for label, column in zip(QUANTILE_LABELS, self.quantiles[idx].T):
+            frame[label] = column
+        return frame[frame['count'] >= min_count].sort_values('count', ascending=False, ignore_index=True)
+
+
+def _cell_quantiles(indptr, buckets, bucket_counts, salary_count, gamma):
+    """QUANTILES of every cell from its sparse buckets, with the rank rule of QuantileSketch.quantile"""
+    quantiles = np.full((len(salary_count), len(QUANTILES)), np.nan, dtype=np.float32)
+    cells = np.flatnonzero(salary_count > 0)
+    if len(cells) == 0:
+        return quantiles
+    cumulative = np.cumsum(bucket_counts)
+    before = np.r_[0, cumulative][indptr[cells]]
+    for j, q in enumerate(QUANTILES):
+        rank = q * (salary_count[cells] - 1)
+        entry = np.searchsorted(cumulative, before + rank, side='right')
+        entry = np.minimum(entry, indptr[cells + 1] - 1)
+        quantiles[cells, j] = 2 * gamma ** buckets[entry].astype(np.float64) / (gamma + 1)
+    return quantiles
+
+
+def _stats(count, salary_count, salary_sum, quantiles):
+    stats = {'count': count, 'salary_count': salary_count,
+             'mean': round(salary_sum / salary_count, 2) if salary_count else None}
+    for label, value in zip(QUANTILE_LABELS, quantiles):
+        stats[label] = None if math.isnan(value) else round(value, 2)
+    return stats
+
+
+def build_from_sources(sources=None):
+    frames, skills = {}, {}
+    store = SkillStore()
+    for name in sources or CUBE_SOURCES:
+        columns = [c for key, c in CUBE_SOURCES[name].items() if c and key != 'skill']
+        try:
+            df, _ = read_dataset(name, columns=columns)
+            if CUBE_SOURCES[name]['skill']:
+                skills[name] = store.get(name)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            continue
+        frames[name] = cube_frame(name, df)
+        print(f"✓ {name}: {len(df):,} postings, {int(frames[name]['salary'].notna().sum()):,} with a salary")
+    if not frames:
+        raise RuntimeError("No cube sources could be loaded")
+    return SalaryCube.build(frames, skills)
+
+
+def _parse_query(terms):
+    members = {}
+    for term in terms:
+        dim, _, value = term.partition('=')
+        if dim not in DIMENSIONS or not value:
+            raise ValueError(f"bad query term '{term}' (use DIMENSION=VALUE[,VALUE]; dimensions: {', '.join(DIMENSIONS)})")
+        values = [v.strip() for v in value.split(',')]
+        members[dim] = values if len(values) > 1 else values[0]
+    return members
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the salary cube")
+    parser.add_argument('--sources', nargs='+', choices=sorted(CUBE_SOURCES), default=None)
+    parser.add_argument('--path', type=Path, default=CUBE_PATH)
+    parser.add_argument('--query', nargs='+', metavar='DIM=VALUE',
+                        help="Query the stored cube instead of building it, e.g. experience=entry skill=python")
+    parser.add_argument('--by', choices=DIMENSIONS, help="With --query, break the slice down by this dimension")
+    args = parser.parse_args(argv)
+
+    if args.query:
+        try:
+            members = _parse_query(args.query)
+            cube = SalaryCube.load(args.path)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}")
+            return 1
+        start = time.perf_counter()
+        try:
+            result = cube.breakdown(args.by, **members) if args.by else cube.query(**members)
+        except KeyError as e:
+            print(f"✗ Unknown member {e}")
+            return 1
+        elapsed = time.perf_counter() - start
+        print(result.head(25).to_string(index=False) if args.by else result)
+        print(f"⏱ {elapsed * 1e6:.0f} µs")
+        return 0
+
+    start = time.perf_counter()
+    cube = build_from_sources(args.sources)
+    size = cube.save(args.path)
+    print(f"✓ Salary cube: {cube.n_cells:,} cells over "
+          f"{' × '.join(f'{len(cube.vocab[dim]) - 1:,} {dim}' for dim in DIMENSIONS)} "
+          f"({cube.nbytes() / 1e6:.1f} MB in memory, {size / 1e6:.1f} MB on disk) in {time.perf_counter() - start:.2f}s")
+
+    # Lookup latency over a sample of stored cells
+    sample = np.random.default_rng(0).choice(cube.n_cells, size=min(2000, cube.n_cells), replace=False)
+    slices = []
+    for key in cube.keys[sample]:
+        slices.append({dim: cube.vocab[dim][(key // int(stride)) % len(cube.vocab[dim])]
+                       for dim, stride in zip(DIMENSIONS, cube.strides)})
+    start = time.perf_counter()
+    for members in slices:
+        cube.query(**members)
+    print(f"✓ {len(slices):,} slice lookups: {(time.perf_counter() - start) / len(slices) * 1e6:.1f} µs each")
+    print(f"✓ Saved cube to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+Mergeable Streaming Sketches for BDPA Tech Job Market Analysis
+Fixed-size summaries that can be updated chunk by chunk and combined across chunks or files
+"""
+
+import base64
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class RunningStats:
+    """Count, mean, variance, min and max, merged with Chan's parallel update"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        other = RunningStats()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def sum(self):
+        return self.mean * self.count
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = data['count'], data['mean'], data['m2']
+        stats.min, stats.max = data['min'], data['max']
+        return stats
+
+
+class _BucketStore:
+    """Dense run of log-bucket counts starting at bucket index `offset`"""
+
+    def __init__(self, max_buckets):
+        self.max_buckets = max_buckets
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add_indices(self, indices):
+        if len(indices) == 0:
+            return
+        lo, hi = int(indices.min()), int(indices.max())
+        self._extend(lo, hi)
+        self.counts += np.bincount(indices - self.offset, minlength=len(self.counts))[:len(self.counts)]
+        self._collapse()
+
+    def merge(self, other, sign=1):
+        if len(other.counts) == 0:
+            return
+        self._extend(other.offset, other.offset + len(other.counts) - 1)
+        start = other.offset - self.offset
+        self.counts[start:start + len(other.counts)] += sign * other.counts
+        self._collapse()
+
+    def _extend(self, lo, hi):
+        if len(self.counts) == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + len(self.counts) - 1)
+        if new_lo == self.offset and new_hi == self.offset + len(self.counts) - 1:
+            return
+        counts = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        counts[self.offset - new_lo:self.offset - new_lo + len(self.counts)] = self.counts
+        self.offset, self.counts = new_lo, counts
+
+    def _collapse(self):
+        # Fold the lowest buckets together so memory stays bounded; only the
+        # extreme low tail loses accuracy, as in DDSketch's collapsing store.
+        excess = len(self.counts) - self.max_buckets
+        if excess > 0:
+            self.counts[excess] += self.counts[:excess].sum()
+            self.counts = self.counts[excess:].copy()
+            self.offset += excess
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch (DDSketch).
+
+    Values are counted in logarithmic buckets of ratio gamma = (1 + a) / (1 - a),
+    so any quantile is returned within relative accuracy `a` of a true sample value.
+    Two sketches with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = _BucketStore(max_buckets)
+        self.negative = _BucketStore(max_buckets)
+        self.zero_count = 0
+
+    def _indices(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        self.positive.add_indices(self._indices(values[values > 0]))
+        self.negative.add_indices(self._indices(-values[values < 0]))
+        self.zero_count += int((values == 0).sum())
+        return self
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.zero_count += other.zero_count
+        return self
+
+    def subtract(self, other):
+        """
+        Remove values previously added (e.g. postings deleted from a snapshot).
+
+        Exact as long as neither sketch has collapsed buckets, which needs values
+        spanning more than gamma ** max_buckets; salaries are far from that.
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot subtract sketches with different relative accuracy")
+        self.positive.merge(other.positive, sign=-1)
+        self.negative.merge(other.negative, sign=-1)
+        self.zero_count -= other.zero_count
+        if (self.positive.counts < 0).any() or (self.negative.counts < 0).any() or self.zero_count < 0:
+            raise ValueError("Subtracted values that were never added to the sketch")
+        return self
+
+    @property
+    def count(self):
+        return self.positive.total + self.negative.total + self.zero_count
+
+    def _bucket_value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1); NaN when the sketch is empty"""
+        n = self.count
+        if n == 0:
+            return float('nan')
+        rank = q * (n - 1)
+
+        negative_total = self.negative.total
+        if rank < negative_total:
+            # Negative buckets are walked from the largest magnitude down
+            cumulative = np.cumsum(self.negative.counts[::-1])
+            i = int(np.searchsorted(cumulative, rank, side='right'))
+            return -self._bucket_value(self.negative.offset + len(self.negative.counts) - 1 - i)
+        rank -= negative_total
+
+        if rank < self.zero_count:
+            return 0.0
+        rank -= self.zero_count
+
+        cumulative = np.cumsum(self.positive.counts)
+        i = int(np.searchsorted(cumulative, rank, side='right'))
+        return self._bucket_value(self.positive.offset + min(i, len(cumulative) - 1))
+
+    def quantiles(self, qs):
+        return [self.quantile(q) for q in qs]
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'zero_count': self.zero_count,
+            'positive': [self.positive.offset, self.positive.counts.tolist()],
+            'negative': [self.negative.offset, self.negative.counts.tolist()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.zero_count = data['zero_count']
+        for store, (offset, counts) in ((sketch.positive, data['positive']), (sketch.negative, data['negative'])):
+            store.offset = offset
+            store.counts = np.asarray(counts, dtype=np.int64)
+        return sketch
+
+
+def hash_values(values):
+    """64-bit hashes of any 1-d array or Series; categoricals hash each category once"""
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        return pd.util.hash_array(values.cat.categories.to_numpy(dtype=object))[codes[codes >= 0]]
+    if isinstance(values, pd.Series):
+        values = values.dropna().to_numpy(dtype=object if not pd.api.types.is_numeric_dtype(values) else None)
+    return pd.util.hash_array(np.asarray(values))
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count (HyperLogLog with linear counting for small ranges).
+
+    2**precision one-byte registers; the standard error is about 1.04 / sqrt(2**precision)
+    (1.6% at the default precision 12). Sketches merge exactly by taking register maxima.
+    `count` is the number of hashes added (None for sketches saved without it), which
+    caps the estimate.
+    """
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.count = 0
+
+    def update_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return self
+        if self.count is not None:
+            self.count += len(hashes)
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = np.full(len(hashes), 64 - p + 1, dtype=np.int64)
+        nonzero = rest > 0
+        rank[nonzero] = (64 - p) - np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def update(self, values):
+        return self.update_hashes(hash_values(values))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        self.count = None if self.count is None or other.count is None else self.count + other.count
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int((self.registers == 0).sum())
+        estimate = m * math.log(m / zeros) if raw <= 2.5 * m and zeros else float(raw)
+        return estimate if self.count is None else float(min(estimate, self.count))
+
+    def to_dict(self):
+        return {'precision': self.precision, 'count': self.count,
+                'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        sketch.count = data.get('count')
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Most frequent values (Misra-Gries summary with at most `capacity` counters).
+
+    Each reported count is an underestimate by at most `error`, which stays below
+    total / (capacity + 1); any value more frequent than that is guaranteed to be
+    kept. Summaries merge by adding counters and pruning back to capacity.
+    """
+
+    def __init__(self, capacity=50):
+        self.capacity = capacity
+        self.counts = {}
+        self.total = 0
+        self.error = 0
+
+    def update(self, values):
+        """Add a Series (or array) of values; missing values are ignored"""
+        counts = pd.Series(values).value_counts(dropna=True)
+        return self.update_counts(counts.index.to_numpy(), counts.to_numpy())
+
+    def update_counts(self, values, counts):
+        """Add exact counts of distinct values (e.g. from one chunk's factorize)"""
+        counts = np.asarray(counts, dtype=np.int64)
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        other = HeavyHitters(self.capacity)
+        other.total = int(counts.sum())
+        other.counts = {values[i]: int(counts[i]) for i in order[:self.capacity]}
+        if len(order) > self.capacity:
+            # Reduce the exact chunk counts to a summary first, as Misra-Gries would
+            cut = int(counts[order[self.capacity]])
+            other.counts = {k: v - cut for k, v in other.counts.items() if v > cut}
+            other.error = cut
+        return self.merge(other)
+
+    def merge(self, other):
+        counts = dict(self.counts)
+        for value, count in other.counts.items():
+            counts[value] = counts.get(value, 0) + count
+        self.total += other.total
+        self.error += other.error
+        if len(counts) > self.capacity:
+            cut = sorted(counts.values(), reverse=True)[self.capacity]
+            counts = {k: v - cut for k, v in counts.items() if v > cut}
+            self.error += cut
+        self.counts = counts
+        return self
+
+    def top(self, n=10):
+        """[(value, lower-bound count)] most frequent first"""
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total, 'error': self.error,
+                'counts': [[str(k), v] for k, v in self.top(self.capacity)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['capacity'])
+        sketch.total, sketch.error = data['total'], data['error']
+        sketch.counts = {k: v for k, v in data['counts']}
+        return sketch
@@ -0,0 +1,411 @@
+"""
+Vectorized Skill Explosion Engine for BDPA Tech Job Market Analysis
+Splits comma-separated skill lists into integer-coded postings in a handful of C-level passes
+
+The skill store (SkillStore) persists this once per dataset: a canonical, append-only
+vocabulary shared by every dataset (skill string <-> int ID, case-folded) and a
+memory-mapped CSR posting -> skill matrix per dataset, so analyses load skills with no
+parsing and count, filter and join them as integer arrays.
+
+Usage:
+    python analysis/skill_engine.py [--rows N]              # benchmark against the legacy loop
+    python analysis/skill_engine.py --store [DATASET ...]   # build or refresh the skill store
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+SKILL_CACHE_DIR = ANALYSIS_DIR / "cache" / "skills"
+SKILL_STORE_DIR = SKILL_CACHE_DIR / "store"
+
+# Dataset name -> column holding its comma-separated skill lists
+SKILL_SOURCES = {
+    'job_skills': 'job_skills',
+    'dice_jobs': 'skills',
+    'ai_jobs': 'required_skills',
+    'ai_jobs_snapshot': 'required_skills',
+}
+
+
+class PostingSkills:
+    """
+    Compact posting -> skill mapping in CSR layout.
+
+    vocab[codes[offsets[i]:offsets[i + 1]]] are the skills of posting i, and
+    posting_ids[i] is that posting's row label in the source frame.
+    """
+
+    def __init__(self, vocab, codes, offsets, posting_ids):
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.posting_ids = np.asarray(posting_ids)
+
+    @property
+    def n_postings(self):
+        return len(self.offsets) - 1
+
+    @property
+    def n_mentions(self):
+        return len(self.codes)
+
+    def counts(self):
+        """Exact mention count for every skill in the vocabulary, aligned with vocab"""
+        return np.bincount(self.codes, minlength=len(self.vocab))
+
+    def skill_counts(self):
+        """All skill counts as a Series sorted from most to least demanded"""
+        counts = pd.Series(self.counts(), index=pd.Index(self.vocab, name='skill'), name='count')
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def counts_frame(self):
+        """Skill counts in the same skill/count layout as results/top_100_skills.csv"""
+        return self.skill_counts().reset_index()
+
+    def to_counter(self):
+        """Counter view of the counts, for callers written against collections.Counter"""
+        return Counter(dict(zip(self.vocab.tolist(), self.counts().tolist())))
+
+    def skills_for(self, i):
+        """Skills listed on the i-th posting"""
+        return self.vocab[self.codes[self.offsets[i]:self.offsets[i + 1]]].tolist()
+
+    def posting_rows(self):
+        """Posting row number for every entry in codes (the COO row array)"""
+        return np.repeat(np.arange(self.n_postings, dtype=np.int32), np.diff(self.offsets))
+
+    def select(self, posting_ids):
+        """The postings whose posting_ids are among posting_ids, in this mapping's order"""
+        rows = np.flatnonzero(np.isin(self.posting_ids, np.asarray(posting_ids)))
+        if len(rows) == self.n_postings:
+            return self
+        lengths = np.diff(self.offsets)[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        take = np.repeat(np.asarray(self.offsets[:-1])[rows] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return PostingSkills(self.vocab, np.asarray(self.codes)[take], offsets, np.asarray(self.posting_ids)[rows])
+
+    def nbytes(self):
+        """Memory held by the integer arrays (the vocabulary strings are not counted)"""
+        return self.codes.nbytes + self.offsets.nbytes + self.posting_ids.nbytes
+
+    def save(self, path):
+        """Persist the mapping as an uncompressed .npz archive"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        posting_ids = self.posting_ids.astype(str) if self.posting_ids.dtype == object else self.posting_ids
+        np.savez(path, vocab=self.vocab.astype(str), codes=self.codes,
+                 offsets=self.offsets, posting_ids=posting_ids)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['vocab'], data['codes'], data['offsets'], data['posting_ids'])
+
+
+def _explode_arrow(values, sep):
+    """Split/trim/dictionary-encode entirely inside Arrow compute kernels"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    lists = pc.split_pattern(pa.array(values.to_numpy(dtype=object), type=pa.large_string()), sep)
+    offsets = lists.offsets.to_numpy()
+    encoded = pc.dictionary_encode(pc.utf8_trim_whitespace(lists.flatten()))
+    codes = encoded.indices.to_numpy(zero_copy_only=False)
+    vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+    return vocab, codes, offsets - offsets[0]
+
+
+def _explode_pandas(values, sep):
+    """Join/split once, then strip only the distinct raw tokens before re-coding"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values.str.count(sep).to_numpy(dtype=np.int64) + 1, out=offsets[1:])
+
+    raw_codes, raw_vocab = pd.factorize(np.array(sep.join(values.tolist()).split(sep), dtype=object))
+    stripped_codes, vocab = pd.factorize(np.array([t.strip() for t in raw_vocab], dtype=object))
+    return np.asarray(vocab, dtype=object), stripped_codes[raw_codes], offsets
+
+
+def explode_skills(skills, sep=','):
+    """
+    Split a Series of comma-separated skill strings into a PostingSkills mapping.
+
+    Matches the legacy loop: null rows are skipped, every comma-separated token is
+    stripped, and empty tokens are kept. Uses Arrow compute kernels when pyarrow is
+    installed and a join/split + factorize path otherwise; neither loops per row.
+    """
+    skills = skills.dropna()
+    if skills.dtype == object:
+        skills = skills[skills.map(type) == str]
+    values = skills.astype(str)
+
+    if len(values) == 0:
+        return PostingSkills([], [], [0], [])
+
+    try:
+        vocab, codes, offsets = _explode_arrow(values, sep)
+    except ImportError:
+        vocab, codes, offsets = _explode_pandas(values, sep)
+
+    return PostingSkills(vocab, codes, offsets, skills.index.to_numpy())
+
+
+def canonical_skills(skills):
+    """Canonical spelling of each skill string: lowercased with whitespace collapsed"""
+    return (pd.Series(skills, dtype=object).str.lower().str.replace(r'\s+', ' ', regex=True)
+            .str.strip().to_numpy(dtype=object))
+
+
+def canonical_postings(mapping, vocabulary):
+    """
+    mapping re-coded onto a SkillVocabulary's IDs (unseen skills are appended).
+
+    Skills are canonicalized, empty tokens dropped, and each posting's skills are
+    sorted by ID without repeats; posting_ids are kept.
+    """
+    local, canonical = pd.factorize(canonical_skills(mapping.vocab))
+    canonical = np.asarray(canonical, dtype=object)
+    global_ids = np.full(len(canonical), -1, dtype=np.int32)
+    global_ids[canonical != ''] = vocabulary.ids(list(canonical[canonical != '']), add=True)
+    codes = global_ids[local][mapping.codes] if len(mapping.codes) else np.zeros(0, dtype=np.int32)
+    keep = codes >= 0
+
+    # One sort orders every posting's skills and exposes repeats as equal neighbours
+    width = np.int64(max(len(vocabulary), 1))
+    keys = np.sort(mapping.posting_rows()[keep].astype(np.int64) * width + codes[keep])
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+    offsets = np.zeros(mapping.n_postings + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // width, minlength=mapping.n_postings), out=offsets[1:])
+    return PostingSkills(vocabulary.array(), (keys % width).astype(np.int32), offsets, mapping.posting_ids)
+
+
+class SkillVocabulary:
+    """Append-only canonical skill strings; a skill's ID is its line number in vocab.txt"""
+
+    def __init__(self, skills=()):
+        self.skills = list(skills)
+        self._ids = {skill: i for i, skill in enumerate(self.skills)}
+        self._array = None
+
+    def __len__(self):
+        return len(self.skills)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        text = path.read_text(encoding='utf-8')
+        return cls(text.split('\n') if text else [])
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text('\n'.join(self.skills), encoding='utf-8')
+        tmp.replace(path)
+
+    def ids(self, skills, add=False):
+        """int32 ID of each canonical skill; unknown skills are appended when add=True, else -1"""
+        ids = np.empty(len(skills), dtype=np.int32)
+        for i, skill in enumerate(skills):
+            skill_id = self._ids.get(skill, -1)
+            if skill_id < 0 and add:
+                skill_id = self._ids[skill] = len(self.skills)
+                self.skills.append(skill)
+                self._array = None
+            ids[i] = skill_id
+        return ids
+
+    def array(self):
+        """The vocabulary as an object array indexed by ID (cached until it grows)"""
+        if self._array is None:
+            self._array = np.asarray(self.skills, dtype=object)
+        return self._array
+
+
+class SkillStore:
+    """
+    Persisted posting -> skill matrices over one shared SkillVocabulary.
+
+    Each dataset directory holds indptr.npy, indices.npy (sorted, distinct skill
+    IDs per posting) and posting_ids.npy (row positions in the dataset), loaded
+    memory-mapped, plus meta.json recording the source hash they were built from.
+    Empty skill tokens are dropped and repeated skills within a posting count once.
+    """
+
+    def __init__(self, directory=SKILL_STORE_DIR, data_dir=None):
+        self.directory = Path(directory)
+        self.data_dir = data_dir
+        self.vocabulary = SkillVocabulary.load(self.directory / "vocab.txt")
+
+    def _meta(self, name):
+        try:
+            return json.loads((self.directory / name / "meta.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _source_sha(self, name):
+        """Source hash from the columnar cache manifest (no re-hash on a warm cache), or None"""
+        from data_cache import cache_status, dataset_path
+
+        valid, manifest = cache_status(name, dataset_path(name, self.data_dir))
+        return manifest['sha256'] if valid else None
+
+    def is_current(self, name):
+        meta = self._meta(name)
+        return meta is not None and meta['sha256'] == self._source_sha(name)
+
+    def build(self, name):
+        """Explode the dataset's skill column once into the store; returns its meta"""
+        from data_cache import cache_status, dataset_path, read_dataset
+
+        start = time.perf_counter()
+        column = SKILL_SOURCES[name]
+        df, _ = read_dataset(name, data_dir=self.data_dir, columns=[column])
+        mapping = canonical_postings(explode_skills(df[column]), self.vocabulary)
+        posting_ids = pd.Index(df.index).get_indexer(mapping.posting_ids).astype(np.int64)
+
+        directory = self.directory / name
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "indptr.npy", mapping.offsets)
+        np.save(directory / "indices.npy", mapping.codes)
+        np.save(directory / "posting_ids.npy", posting_ids)
+        self.vocabulary.save(self.directory / "vocab.txt")
+        _, manifest = cache_status(name, dataset_path(name, self.data_dir))
+        meta = {'dataset': name, 'column': column, 'sha256': manifest['sha256'] if manifest else None,
+                'postings': int(mapping.n_postings), 'entries': int(mapping.n_mentions),
+                'skills': int(np.count_nonzero(mapping.counts())), 'vocabulary': len(self.vocabulary),
+                'seconds': round(time.perf_counter() - start, 3)}
+        (directory / "meta.json").write_text(json.dumps(meta, indent=2))
+        return meta
+
+    def get(self, name, refresh=True):
+        """The dataset's PostingSkills over the shared vocabulary, with memory-mapped arrays"""
+        if refresh and not self.is_current(name):
+            self.build(name)
+        directory = self.directory / name
+        return PostingSkills(self.vocabulary.array(),
+                             np.load(directory / "indices.npy", mmap_mode='r'),
+                             np.load(directory / "indptr.npy", mmap_mode='r'),
+                             np.load(directory / "posting_ids.npy", mmap_mode='r'))
+
+    def skill_ids(self, skills):
+        """IDs of skill strings (any case/spacing); -1 for skills never seen"""
+        return self.vocabulary.ids(list(canonical_skills(skills)))
+
+    def find(self, pattern, regex=False):
+        """IDs of every vocabulary skill containing pattern (case-insensitive), scanning the vocabulary once"""
+        matches = pd.Series(self.vocabulary.array()).str.contains(pattern, case=False, regex=regex)
+        return np.flatnonzero(matches.to_numpy(dtype=bool))
+
+    def postings_with(self, name, skill_ids):
+        """Row positions of the dataset's postings listing any of skill_ids"""
+        mapping = self.get(name, refresh=False)
+        hit = np.isin(mapping.codes, np.asarray(skill_ids))
+        rows = np.unique(mapping.posting_rows()[hit])
+        return np.asarray(mapping.posting_ids)[rows]
+
+
+def legacy_skill_counts(skills):
+    """The original analyze_skills() loop, kept as the benchmark reference"""
+    all_skills = []
+    for skills_str in skills.dropna():
+        if isinstance(skills_str, str):
+            all_skills.extend([s.strip() for s in skills_str.split(',')])
+    return Counter(all_skills)
+
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(skills, repeats=3):
+    """Time and trace the legacy loop against explode_skills() and check the counts agree"""
+    results = {}
+    for label, fn in (('legacy_loop', legacy_skill_counts), ('vectorized', explode_skills)):
+        runs = [_measure(fn, skills) for _ in range(repeats)]
+        results[label] = {
+            'seconds': min(r[1] for r in runs),
+            'peak_mb': max(r[2] for r in runs) / 1e6,
+            'result': runs[0][0],
+        }
+
+    legacy = results['legacy_loop'].pop('result')
+    mapping = results['vectorized'].pop('result')
+    results['counts_match'] = legacy == mapping.to_counter()
+    results['speedup'] = results['legacy_loop']['seconds'] / max(results['vectorized']['seconds'], 1e-9)
+    results['rows'] = len(skills)
+    results['mentions'] = mapping.n_mentions
+    results['unique_skills'] = len(mapping.vocab)
+    results['mapping_mb'] = mapping.nbytes() / 1e6
+    return results
+
+
+def build_store(names, directory=SKILL_STORE_DIR):
+    """Bring the store up to date for each dataset and report what it holds"""
+    store = SkillStore(directory)
+    for name in names:
+        try:
+            current = store.is_current(name)
+            meta = store._meta(name) if current else store.build(name)
+        except Exception as e:
+            print(f"✗ {name}: {e}")
+            continue
+        start = time.perf_counter()
+        mapping = store.get(name, refresh=False)
+        counts = mapping.counts()
+        elapsed = time.perf_counter() - start
+        state = "current" if current else f"built in {meta['seconds']:.2f}s"
+        print(f"✓ {name}: {meta['postings']:,} postings, {meta['entries']:,} posting-skill pairs, "
+              f"{meta['skills']:,} skills ({state}); load + count {elapsed * 1000:.1f} ms, "
+              f"top: {', '.join(store.vocabulary.skills[i] for i in np.argsort(-counts, kind='stable')[:3])}")
+    print(f"✓ Shared vocabulary: {len(store.vocabulary):,} skills in {store.directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill explosion against the legacy loop")
+    parser.add_argument('--rows', type=int, default=None, help="Only use the first N postings")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--store', nargs='*', metavar='DATASET', default=None,
+                        help="Build or refresh the skill store instead (all skill datasets by default)")
+    args = parser.parse_args()
+
+    if args.store is not None:
+        unknown = [name for name in args.store if name not in SKILL_SOURCES]
+        if unknown:
+            parser.error(f"no skill column for {', '.join(unknown)} (choose from {', '.join(SKILL_SOURCES)})")
+        build_store(args.store or list(SKILL_SOURCES))
+        return
+
+    from data_cache import read_dataset
+
+    df, _ = read_dataset('job_skills', columns=['job_skills'])
+    skills = df['job_skills'] if args.rows is None else df['job_skills'].head(args.rows)
+
+    results = benchmark(skills, repeats=args.repeats)
+    print(f"Postings: {results['rows']:,} | Mentions: {results['mentions']:,} | "
+          f"Unique skills: {results['unique_skills']:,}")
+    for label in ('legacy_loop', 'vectorized'):
+        r = results[label]
+        print(f"  • {label:12s} {r['seconds'] * 1000:10.1f} ms | peak {r['peak_mb']:8.1f} MB")
+    print(f"  Speedup: {results['speedup']:.1f}x | Mapping size: {results['mapping_mb']:.1f} MB | "
+          f"Counts match: {results['counts_match']}")
+
+
+if __name__ == "__main__":
+    main()
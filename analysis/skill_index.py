@@ -0,0 +1,117 @@
+"""
+Skill Lookup Index for BDPA SkillGap
+Token-level substring index over a skill vocabulary, so "which skills contain X" is a set lookup
+"""
+
+# numpy/pandas are imported inside SubstringIndex so small pure-Python lookups
+# (e.g. the 100-row top skills table) never pay for them
+
+# Vocabularies up to this size are scanned directly instead of being indexed
+SMALL_VOCABULARY = 5000
+
+
+class SubstringIndex:
+    """
+    Case-insensitive substring search over a fixed vocabulary.
+
+    Entries are split on whitespace into tokens and an inverted index maps each
+    distinct token to the entries containing it. Any substring of an entry is made
+    of pieces that each sit inside a single token, so a query only scans the
+    (much smaller) distinct-token list, unions the matching posting lists and,
+    for multi-word queries, verifies the intersection.
+    """
+
+    def __init__(self, vocabulary):
+        import numpy as np
+        import pandas as pd
+
+        lowered = pd.Series(vocabulary, dtype=object).astype(str).str.lower()
+        self.vocabulary = lowered.to_numpy(dtype=str)
+
+        tokens = lowered.str.split()
+        lengths = tokens.str.len().to_numpy()
+        entry_ids = np.repeat(np.arange(len(self.vocabulary), dtype=np.int32), lengths)
+        token_codes, distinct_tokens = pd.factorize(tokens.explode().dropna().to_numpy())
+
+        order = np.argsort(token_codes, kind='stable')
+        self._tokens = np.asarray(distinct_tokens, dtype=str)
+        self._entries = entry_ids[order]
+        self._offsets = np.zeros(len(self._tokens) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_codes, minlength=len(self._tokens)), out=self._offsets[1:])
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def _entries_with_piece(self, piece):
+        import numpy as np
+
+        token_ids = np.flatnonzero(np.char.find(self._tokens, piece) >= 0)
+        if len(token_ids) == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate([
+            self._entries[self._offsets[t]:self._offsets[t + 1]] for t in token_ids
+        ]))
+
+    def find(self, needle):
+        """Sorted ids of every vocabulary entry containing needle"""
+        import numpy as np
+
+        needle = needle.lower()
+        if needle in self._cache:
+            return self._cache[needle]
+
+        pieces = needle.split()
+        if not pieces:
+            ids = np.arange(len(self.vocabulary), dtype=np.int32)
+        else:
+            ids = self._entries_with_piece(pieces[0])
+            for piece in pieces[1:]:
+                if len(ids) == 0:
+                    break
+                ids = np.intersect1d(ids, self._entries_with_piece(piece), assume_unique=True)
+            if len(pieces) > 1 or needle != pieces[0]:
+                ids = ids[np.char.find(self.vocabulary[ids], needle) >= 0]
+
+        self._cache[needle] = ids
+        return ids
+
+
+class SkillDemandIndex:
+    """
+    Skill -> market demand lookups over skill/count data.
+
+    Accepts a skill/count DataFrame or an iterable of (skill, count) pairs. Rows
+    whose skill differs only in case are merged first, so a substring query sums
+    the same counts a case-insensitive str.contains scan would. Small
+    vocabularies are scanned in pure Python; larger ones get a SubstringIndex.
+    """
+
+    def __init__(self, skills, skill_col='skill', count_col='count'):
+        if hasattr(skills, 'columns'):
+            skills = zip(skills[skill_col].astype(str).tolist(), skills[count_col].tolist())
+        totals = {}
+        for skill, count in skills:
+            key = str(skill).lower()
+            totals[key] = totals.get(key, 0) + int(count)
+
+        self.vocabulary = list(totals)
+        self.counts = list(totals.values())
+        self.index = SubstringIndex(self.vocabulary) if len(totals) > SMALL_VOCABULARY else None
+        self._cache = {}
+
+    def _ids(self, skill):
+        if self.index is not None:
+            return self.index.find(skill).tolist()
+        needle = skill.lower()
+        if needle not in self._cache:
+            self._cache[needle] = [i for i, text in enumerate(self.vocabulary) if needle in text]
+        return self._cache[needle]
+
+    def demand(self, skill):
+        """Total count of every dataset skill that contains `skill` as a substring"""
+        return sum(self.counts[i] for i in self._ids(skill))
+
+    def matches(self, skill):
+        """Dataset skills (lowercased) that contain `skill`"""
+        return [self.vocabulary[i] for i in self._ids(skill)]
@@ -0,0 +1,443 @@
+"""
+Skill Trend Engine for BDPA Tech Job Market Analysis
+Counts every skill per posting month in one sparse pass and flags emerging skills from
+rolling growth rates and z-score surges instead of a fixed list of technology names
+
+Counts are kept per source (Dice postings by post_year/post_month, the 2025 AI job
+datasets by posting_date) in a skill x month matrix under cache/trends/. Skills come
+from the skill store (skill_engine.SkillStore); a CSV given with --file is exploded into
+the same canonical spellings. An update only counts the postings of the months it is
+given and swaps those month columns in, so a new month of data never re-counts the history:
+without --file, the months after the stored range and any month whose posting count
+changed (backfilled postings) are recounted.
+
+Usage:
+    python analysis/skill_trends.py                 # full build from every source
+    python analysis/skill_trends.py --update        # recount only new or changed months
+    python analysis/skill_trends.py --update --sources ai_jobs --file new_month.csv
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from data_cache import DATASET_SCHEMAS, read_csv_with_schema, read_dataset
+from skill_engine import SkillStore, SkillVocabulary, canonical_postings, explode_skills
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+TRENDS_CACHE_DIR = ANALYSIS_DIR / "cache" / "trends"
+TRENDS_PATH = ANALYSIS_DIR / "results" / "skill_trends.json"
+
+# Bump when the exported JSON's keys or their meaning change
+TRENDS_VERSION = 1
+
+# Dataset name -> (skill column, date columns); one date column is a YYYY-MM-DD
+# string, two are (year, month) integers
+TREND_SOURCES = {
+    'dice_jobs': ('skills', ('post_year', 'post_month')),
+    'ai_jobs': ('required_skills', ('posting_date',)),
+}
+
+
+def month_label(ordinal):
+    """'YYYY-MM' for a month ordinal (year * 12 + month - 1)"""
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+def posting_months(df, date_columns):
+    """Month ordinal of every row, -1 where the date is missing or unparseable"""
+    if len(date_columns) == 2:
+        year = pd.to_numeric(df[date_columns[0]], errors='coerce').astype('float64').to_numpy()
+        month = pd.to_numeric(df[date_columns[1]], errors='coerce').astype('float64').to_numpy()
+        ordinal = year * 12 + month - 1
+    else:
+        dates = df[date_columns[0]]
+        if isinstance(dates.dtype, pd.CategoricalDtype):
+            # Parse each distinct date once and broadcast through the codes
+            parsed = pd.to_datetime(pd.Series(dates.cat.categories.astype(str)), errors='coerce')
+            per_category = (parsed.dt.year * 12 + parsed.dt.month - 1).astype('float64').to_numpy()
+            codes = dates.cat.codes.to_numpy()
+            ordinal = np.where(codes >= 0, per_category[codes], np.nan)
+        else:
+            parsed = pd.to_datetime(dates, errors='coerce')
+            ordinal = (parsed.dt.year * 12 + parsed.dt.month - 1).astype('float64').to_numpy()
+    return np.where(np.isfinite(ordinal), ordinal, -1).astype(np.int64)
+
+
+class SkillMonthCounts:
+    """
+    Skill x month mention counts.
+
+    counts[i, j] is how many postings from month `first + j` list vocab[i];
+    postings[j] is how many postings with a skill list that month had.
+    """
+
+    def __init__(self, vocab, first, counts, postings):
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.first = int(first)
+        self.counts = sparse.csr_matrix(counts, dtype=np.int32)
+        self.postings = np.asarray(postings, dtype=np.int64)
+
+    @classmethod
+    def empty(cls):
+        return cls([], 0, sparse.csr_matrix((0, 0), dtype=np.int32), [])
+
+    @classmethod
+    def from_frame(cls, skills, months):
+        """Count a skill-list Series against its rows' month ordinals (rows with month -1 are dropped)"""
+        keep = (months >= 0) & skills.notna().to_numpy()
+        skills = skills[keep].reset_index(drop=True)
+        if len(skills) == 0:
+            return cls.empty()
+        # Canonical spellings, as in the skill store, so file updates line up with stored counts
+        mapping = canonical_postings(explode_skills(skills), SkillVocabulary())
+        return cls.from_postings(mapping, months[keep])
+
+    @classmethod
+    def from_postings(cls, mapping, months):
+        """
+        Count a PostingSkills mapping (e.g. from the skill store) against month
+        ordinals indexed by its posting_ids; postings with month -1 are dropped.
+        """
+        posting_month = months[np.asarray(mapping.posting_ids, dtype=np.int64)]
+        keep = posting_month >= 0
+        if not keep.any():
+            return cls.empty()
+        first = int(posting_month[keep].min())
+        n_months = int(posting_month[keep].max()) - first + 1
+        rows = mapping.posting_rows()
+        mentions = keep[rows]
+        used, skill_rows = np.unique(np.asarray(mapping.codes)[mentions], return_inverse=True)
+        counts = sparse.coo_matrix(
+            (np.ones(len(skill_rows), dtype=np.int32), (skill_rows, posting_month[rows][mentions] - first)),
+            shape=(len(used), n_months)).tocsr()
+        postings = np.bincount(posting_month[keep] - first, minlength=n_months)
+        return cls(mapping.vocab[used], first, counts, postings)
+
+    @property
+    def n_months(self):
+        return self.counts.shape[1]
+
+    @property
+    def last(self):
+        return self.first + self.n_months - 1
+
+    def months(self):
+        return np.arange(self.first, self.first + self.n_months)
+
+    def month_labels(self):
+        return [month_label(m) for m in self.months()]
+
+    def _aligned(self, vocab_index, first, n_months):
+        """These counts re-indexed onto a shared vocabulary and month range"""
+        coo = self.counts.tocoo()
+        rows = vocab_index.get_indexer(self.vocab)[coo.row]
+        counts = sparse.coo_matrix((coo.data, (rows, coo.col + self.first - first)),
+                                   shape=(len(vocab_index), n_months)).tocsr()
+        postings = np.zeros(n_months, dtype=np.int64)
+        postings[self.first - first:self.first - first + self.n_months] = self.postings
+        return counts, postings
+
+    def _combine(self, other, replace):
+        if self.n_months == 0:
+            return other
+        if other.n_months == 0:
+            return self
+        vocab_index = pd.Index(self.vocab).append(pd.Index(other.vocab)).unique()
+        first = min(self.first, other.first)
+        n_months = max(self.last, other.last) - first + 1
+        counts, postings = self._aligned(vocab_index, first, n_months)
+        other_counts, other_postings = other._aligned(vocab_index, first, n_months)
+        if replace:
+            # Months the update has postings for are dropped from the stored counts first
+            keep = (other_postings == 0).astype(np.int32)
+            counts = counts @ sparse.diags(keep, dtype=np.int32)
+            postings = postings * keep
+        return SkillMonthCounts(vocab_index.to_numpy(dtype=object), first,
+                                counts + other_counts, postings + other_postings)
+
+    def merge(self, other):
+        """Sum of two count matrices, e.g. two sources over one vocabulary"""
+        return self._combine(other, replace=False)
+
+    def replace_months(self, update):
+        """These counts with every month that `update` has postings for taken from `update`"""
+        return self._combine(update, replace=True)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, vocab=self.vocab.astype(str), first=self.first, data=self.counts.data,
+                 indices=self.counts.indices, indptr=self.counts.indptr, postings=self.postings)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            n_months = len(data['postings'])
+            counts = sparse.csr_matrix((data['data'], data['indices'], data['indptr']),
+                                       shape=(len(data['indptr']) - 1, n_months))
+            return cls(data['vocab'], int(data['first']), counts, data['postings'])
+
+
+def _store_path(name, cache_dir):
+    return Path(cache_dir) / f"{name}.npz"
+
+
+def load_source_frame(name, path=None):
+    """
+    A source's postings: the skill and date columns of a new CSV, or the date columns of
+    the registered dataset, whose skills come from the skill store
+    """
+    skill_column, date_columns = TREND_SOURCES[name]
+    if path is not None:
+        return read_csv_with_schema(path, DATASET_SCHEMAS.get(name, {}), usecols=[skill_column, *date_columns])
+    df, _ = read_dataset(name, columns=list(date_columns))
+    return df
+
+
+def count_source(name, df, months=None, skills=None):
+    """
+    SkillMonthCounts for one source frame, optionally restricted to some month ordinals.
+    skills is the frame's PostingSkills from the skill store; without it the frame's own
+    skill column is exploded.
+    """
+    skill_column, date_columns = TREND_SOURCES[name]
+    ordinals = posting_months(df, date_columns)
+    if months is not None:
+        ordinals = np.where(np.isin(ordinals, list(months)), ordinals, -1)
+    if skills is None:
+        return SkillMonthCounts.from_frame(df[skill_column], ordinals)
+    if months is not None:
+        skills = skills.select(np.flatnonzero(ordinals >= 0))
+    return SkillMonthCounts.from_postings(skills, ordinals)
+
+
+def build_trends(sources=None, cache_dir=TRENDS_CACHE_DIR):
+    """Count every source in full and store its matrix; returns {source: SkillMonthCounts}"""
+    stores = {}
+    skill_store = SkillStore()
+    for name in sources or TREND_SOURCES:
+        try:
+            df = load_source_frame(name)
+            skills = skill_store.get(name)
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            continue
+        stores[name] = count_source(name, df, skills=skills)
+        stores[name].save(_store_path(name, cache_dir))
+        print(f"✓ {name}: {int(stores[name].postings.sum()):,} postings over {stores[name].n_months} months, "
+              f"{len(stores[name].vocab):,} skills")
+    return stores
+
+
+def stale_months(stored, ordinals):
+    """
+    Months of the postings' ordinals that the stored counts are missing or out of date
+    for: every month after the stored range, and every month whose number of postings
+    differs from the stored one (postings added to or removed from an earlier month)
+    """
+    months, counts = np.unique(ordinals[ordinals >= 0], return_counts=True)
+    stored_counts = np.zeros(len(months), dtype=np.int64)
+    inside = (months >= stored.first) & (months <= stored.last)
+    stored_counts[inside] = stored.postings[months[inside] - stored.first]
+    return months[(months > stored.last) | (counts != stored_counts)]
+
+
+def update_trends(sources=None, path=None, cache_dir=TRENDS_CACHE_DIR):
+    """
+    Fold new postings into the stored matrices and return {source: SkillMonthCounts}.
+
+    With `path`, every month present in that CSV replaces the stored month; without
+    it, the registered dataset's stale_months() are recounted from the skill store.
+    Only the rows of those months are counted. A source with no stored matrix yet is
+    built in full.
+    """
+    stores = {}
+    skill_store = SkillStore()
+    for name in sources or TREND_SOURCES:
+        store_path = _store_path(name, cache_dir)
+        if not store_path.exists():
+            stores.update(build_trends([name], cache_dir))
+            continue
+        stored = SkillMonthCounts.load(store_path)
+        try:
+            df = load_source_frame(name, path)
+            skills = skill_store.get(name) if path is None else None
+        except Exception as e:
+            print(f"✗ Skipping {name}: {e}")
+            stores[name] = stored
+            continue
+        ordinals = posting_months(df, TREND_SOURCES[name][1])
+        if path is not None:
+            months = np.unique(ordinals[ordinals >= 0])
+        else:
+            # Only postings with a skill list are counted, so compare against those
+            months = stale_months(stored, ordinals[np.asarray(skills.posting_ids, dtype=np.int64)])
+        if len(months) == 0:
+            print(f"✓ {name}: up to date")
+            stores[name] = stored
+            continue
+        update = count_source(name, df, months, skills)
+        stores[name] = stored.replace_months(update)
+        stores[name].save(store_path)
+        print(f"✓ {name}: recounted {', '.join(month_label(m) for m in months) or 'no months'} "
+              f"({int(update.postings.sum()):,} postings)")
+    return stores
+
+
+def load_trends(sources=None, cache_dir=TRENDS_CACHE_DIR):
+    """Stored matrices of the sources that have one"""
+    return {name: SkillMonthCounts.load(_store_path(name, cache_dir))
+            for name in sources or TREND_SOURCES if _store_path(name, cache_dir).exists()}
+
+
+def trend_table(counts, window=3, baseline=6, min_count=10):
+    """
+    Growth and surge statistics for every skill with at least `min_count` mentions.
+
+    Shares are mentions per posting in a month, so changes in posting volume do not
+    read as demand. growth compares the mean share of the last `window` calendar
+    months with the `window` before them (NaN when the skill was absent before).
+    zscore is the latest month's share against the `baseline` months before it,
+    with the spread floored at the share's binomial sampling error so a flat
+    history cannot produce an infinite score. Months without postings are ignored.
+    """
+    totals = np.asarray(counts.counts.sum(axis=1)).ravel()
+    rows = np.flatnonzero(totals >= min_count)
+    columns = ['skill', 'total', 'latest', 'recent_share', 'prior_share', 'growth', 'zscore']
+    observed = np.flatnonzero(counts.postings > 0)
+    if len(rows) == 0 or len(observed) == 0:
+        return pd.DataFrame(columns=columns)
+
+    dense = counts.counts[rows].toarray().astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(counts.postings > 0, dense / counts.postings, np.nan)
+    latest = observed[-1]
+
+    def window_mean(stop, length):
+        block = share[:, max(stop - length, 0):max(stop, 0)]
+        if block.shape[1] == 0 or np.isnan(block).all():
+            return np.full(len(rows), np.nan)
+        return np.nanmean(block, axis=1)
+
+    recent = window_mean(latest + 1, window)
+    prior = window_mean(latest + 1 - window, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = np.where(prior > 0, recent / prior - 1, np.nan)
+
+    history = share[:, max(latest - baseline, 0):latest]
+    history = history[:, ~np.isnan(history).all(axis=0)] if history.size else history
+    if history.shape[1] >= 2:
+        mean = history.mean(axis=1)
+        sampling = np.sqrt(np.clip(mean * (1 - mean), 0, None) / counts.postings[latest])
+        spread = np.maximum(np.maximum(history.std(axis=1, ddof=1), sampling), 1e-9)
+        zscore = (share[:, latest] - mean) / spread
+    else:
+        zscore = np.full(len(rows), np.nan)
+
+    return pd.DataFrame({
+        'skill': counts.vocab[rows], 'total': totals[rows].astype(np.int64),
+        'latest': dense[:, latest].astype(np.int64), 'recent_share': recent,
+        'prior_share': prior, 'growth': growth, 'zscore': zscore,
+    }, columns=columns)
+
+
+def emerging_skills(table, z_threshold=2.0, min_growth=0.25, min_latest=5, limit=25):
+    """Skills surging in the latest month or growing across the window, strongest first"""
+    candidates = table[(table['latest'] >= min_latest)
+                       & ((table['zscore'] >= z_threshold) | (table['growth'] >= min_growth))]
+    return candidates.sort_values(['zscore', 'growth'], ascending=False, na_position='last').head(limit)
+
+
+def _number(value, digits=4):
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def export_trends(counts, table, emerging, sources, path=TRENDS_PATH, window=3, baseline=6, series_skills=100):
+    """
+    Write the trend summary the frontend reads: the observed months, the emerging
+    skills, and monthly counts for the most mentioned skills plus every emerging one.
+    """
+    observed = np.flatnonzero(counts.postings > 0)
+    labels = counts.month_labels()
+    index = {skill: i for i, skill in enumerate(counts.vocab)}
+    top = table.nlargest(series_skills, 'total')['skill'].tolist()
+    tracked = list(dict.fromkeys(top + emerging['skill'].tolist()))
+    by_skill = table.set_index('skill')
+
+    payload = {
+        'version': TRENDS_VERSION,
+        'window': window,
+        'baseline': baseline,
+        'months': [labels[j] for j in observed],
+        'postings': counts.postings[observed].tolist(),
+        'sources': {name: {'from': month_label(store.first), 'to': month_label(store.last),
+                           'postings': int(store.postings.sum())}
+                    for name, store in sources.items() if store.n_months},
+        'emerging': [{'skill': row.skill, 'growth': _number(row.growth), 'zscore': _number(row.zscore, 2),
+                      'latestCount': int(row.latest), 'recentShare': _number(row.recent_share)}
+                     for row in emerging.itertuples()],
+        'skills': {skill: {'series': counts.counts[index[skill], observed].toarray().ravel().tolist(),
+                           'growth': _number(by_skill.at[skill, 'growth']),
+                           'zscore': _number(by_skill.at[skill, 'zscore'], 2)}
+                   for skill in tracked},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monthly skill trends and emerging-skill detection")
+    parser.add_argument('--sources', nargs='+', choices=sorted(TREND_SOURCES), default=None)
+    parser.add_argument('--update', action='store_true',
+                        help="Recount only new or changed months (or the months in --file) into the stored counts")
+    parser.add_argument('--file', type=Path, help="CSV of new postings for --update (needs one --sources entry)")
+    parser.add_argument('--window', type=int, default=3, help="Months per growth window")
+    parser.add_argument('--baseline', type=int, default=6, help="Months of history behind the surge z-score")
+    parser.add_argument('--min-count', type=int, default=10, help="Minimum mentions for a skill to be scored")
+    parser.add_argument('--z', type=float, default=2.0, help="Surge threshold on the latest month's z-score")
+    parser.add_argument('--out', type=Path, default=TRENDS_PATH)
+    args = parser.parse_args(argv)
+    if args.file and (not args.update or not args.sources or len(args.sources) != 1):
+        parser.error("--file needs --update and exactly one --sources entry")
+
+    start = time.perf_counter()
+    if args.update:
+        update_trends(args.sources, args.file)
+        sources = load_trends()
+    else:
+        sources = build_trends(args.sources)
+    if not sources:
+        print("✗ No skill trend data available")
+        return 1
+
+    combined = SkillMonthCounts.empty()
+    for store in sources.values():
+        combined = combined.merge(store)
+    table = trend_table(combined, window=args.window, baseline=args.baseline, min_count=args.min_count)
+    emerging = emerging_skills(table, z_threshold=args.z)
+    export_trends(combined, table, emerging, sources, args.out, window=args.window, baseline=args.baseline)
+
+    print(f"✓ {len(combined.vocab):,} skills × {combined.n_months} months "
+          f"({combined.counts.nnz:,} non-zero cells) in {time.perf_counter() - start:.2f}s")
+    print("\n--- EMERGING SKILLS ---")
+    for row in emerging.itertuples():
+        growth = f"{row.growth:+.0%}" if pd.notna(row.growth) else 'new'
+        print(f"  • {row.skill:30s} z={row.zscore:5.2f}  growth {growth:>6s}  ({row.latest:,} in latest month)")
+    if emerging.empty:
+        print("  (none above the thresholds)")
+    print(f"✓ Saved skill trends to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
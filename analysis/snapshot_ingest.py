@@ -0,0 +1,301 @@
+"""
+Incremental Snapshot Ingestion for BDPA Tech Job Market Analysis
+Diffs each new data drop against a persisted state store by posting key and row hash and
+applies only the new, changed and removed postings to the stored aggregates
+
+The store (cache/snapshots/<dataset>/) holds one hash per posting, the columns the
+aggregates are built from, the aggregates themselves (skill counts, skill pair counts,
+a salary quantile sketch) and a history recording which snapshot produced each state.
+Reading and hashing a snapshot is a vectorized pass; exploding skills and updating the
+pair counts only touches the delta.
+
+Usage:
+    python analysis/snapshot_ingest.py "2025 Job Market/ai_job_dataset.csv" "2025 Job Market/ai_job_dataset1.csv"
+    python analysis/snapshot_ingest.py new_postings.csv --partial   # drop with only new/changed rows
+    python analysis/snapshot_ingest.py --status
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from cooccurrence import posting_skill_matrix
+from data_cache import DATASET_SCHEMAS, file_sha256, read_csv_with_schema
+from sketches import QuantileSketch
+from skill_engine import SkillVocabulary, canonical_postings, explode_skills
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+STATE_DIR = ANALYSIS_DIR / "cache" / "snapshots"
+
+# Bump when the store layout changes so old stores are rebuilt instead of misread
+STATE_FORMAT_VERSION = 2
+
+# Dataset name -> (posting key column, skill list column, salary column or None)
+SNAPSHOT_SOURCES = {
+    'ai_jobs': ('job_id', 'required_skills', 'salary_usd'),
+    'dice_jobs': ('jobid', 'skills', None),
+}
+
+SALARY_ACCURACY = 0.01
+
+
+def row_hashes(df, key):
+    """64-bit hash of every non-key column of each row (categoricals hash by value)"""
+    return pd.util.hash_pandas_object(df.drop(columns=[key]), index=False).to_numpy()
+
+
+class Contribution:
+    """What a set of postings adds to the aggregates; subtracting one undoes it exactly"""
+
+    def __init__(self, skills, salaries=None):
+        # Snapshots are arbitrary files rather than skill-store datasets, but their skills
+        # take the store's canonical spellings so the aggregates line up with it
+        mapping = canonical_postings(explode_skills(skills), SkillVocabulary())
+        matrix, self.vocab = posting_skill_matrix(mapping)
+        matrix.data = matrix.data.astype(np.int64)
+        self.skill_counts = np.asarray(matrix.sum(axis=0)).ravel()
+        pairs = (matrix.T @ matrix).tocsr()
+        pairs.setdiag(0)
+        pairs.eliminate_zeros()
+        self.pairs = pairs
+        self.salary = QuantileSketch(SALARY_ACCURACY)
+        self.salary_count = self.salary_sum = 0
+        if salaries is not None:
+            values = salaries.astype('float64').dropna().to_numpy()
+            self.salary.update(values)
+            self.salary_count, self.salary_sum = len(values), float(values.sum())
+
+
+class SnapshotState:
+    """
+    The state store of one dataset.
+
+    rows is indexed by posting key with the row hash and the aggregate inputs;
+    skill_counts[i] is the number of postings listing vocab[i], pairs[i, j] the
+    number listing both, and salary a sketch over every posting's salary.
+    """
+
+    def __init__(self, name, state_dir=STATE_DIR):
+        self.name = name
+        self.key, self.skill_column, self.salary_column = SNAPSHOT_SOURCES[name]
+        self.dir = Path(state_dir) / name
+        self.rows = pd.DataFrame({'row_hash': pd.Series(dtype='uint64'),
+                                  self.skill_column: pd.Series(dtype='string')},
+                                 index=pd.Index([], name=self.key, dtype='string'))
+        if self.salary_column:
+            self.rows[self.salary_column] = pd.Series(dtype='float64')
+        self.vocab = pd.Index([], dtype=object)
+        self.skill_counts = np.zeros(0, dtype=np.int64)
+        self.pairs = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.salary = QuantileSketch(SALARY_ACCURACY)
+        self.salary_count = 0
+        self.salary_sum = 0.0
+        self.history = []
+
+    @property
+    def state_id(self):
+        return self.history[-1]['state'] if self.history else 0
+
+    @classmethod
+    def load(cls, name, state_dir=STATE_DIR):
+        """The stored state, or an empty one when there is none (or it has an old layout)"""
+        state = cls(name, state_dir)
+        try:
+            with open(state.dir / "state.json") as f:
+                meta = json.load(f)
+            if meta['format'] != STATE_FORMAT_VERSION:
+                print(f"⚠ Snapshot store for {name} has an old layout, starting over")
+                return state
+            state.rows = pd.read_parquet(state.dir / "rows.parquet")
+            with np.load(state.dir / "aggregates.npz", allow_pickle=False) as data:
+                state.vocab = pd.Index(data['vocab'].astype(object))
+                state.skill_counts = data['skill_counts']
+                state.pairs = sparse.csr_matrix((data['data'], data['indices'], data['indptr']),
+                                                shape=(len(state.vocab), len(state.vocab)))
+        except (OSError, KeyError, ValueError):
+            return state
+        state.salary = QuantileSketch.from_dict(meta['salary']['sketch'])
+        state.salary_count, state.salary_sum = meta['salary']['count'], meta['salary']['sum']
+        state.history = meta['history']
+        return state
+
+    def save(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.rows.to_parquet(self.dir / "rows.parquet")
+        np.savez(self.dir / "aggregates.npz", vocab=self.vocab.to_numpy(dtype=str),
+                 skill_counts=self.skill_counts, data=self.pairs.data,
+                 indices=self.pairs.indices, indptr=self.pairs.indptr)
+        meta = {
+            'format': STATE_FORMAT_VERSION,
+            'dataset': self.name,
+            'salary': {'sketch': self.salary.to_dict(), 'count': self.salary_count, 'sum': self.salary_sum},
+            'history': self.history,
+        }
+        tmp = self.dir / "state.json.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        tmp.replace(self.dir / "state.json")
+
+    def _grow_vocab(self, vocab):
+        """Extend the vocabulary with new skills; returns the positions of `vocab` in it"""
+        new = pd.Index(vocab).difference(self.vocab, sort=False)
+        if len(new):
+            size = len(self.vocab) + len(new)
+            self.vocab = self.vocab.append(new)
+            self.skill_counts = np.concatenate([self.skill_counts, np.zeros(len(new), dtype=np.int64)])
+            self.pairs.resize((size, size))
+        return self.vocab.get_indexer(vocab)
+
+    def _apply(self, contribution, sign):
+        if len(contribution.vocab):
+            positions = self._grow_vocab(contribution.vocab)
+            np.add.at(self.skill_counts, positions, sign * contribution.skill_counts)
+            coo = contribution.pairs.tocoo()
+            delta = sparse.csr_matrix((sign * coo.data, (positions[coo.row], positions[coo.col])),
+                                      shape=self.pairs.shape)
+            self.pairs = (self.pairs + delta).tocsr()
+            self.pairs.eliminate_zeros()
+        if sign > 0:
+            self.salary.merge(contribution.salary)
+        else:
+            self.salary.subtract(contribution.salary)
+        self.salary_count += sign * contribution.salary_count
+        self.salary_sum += sign * contribution.salary_sum
+
+    def _contribution(self, rows):
+        salaries = rows[self.salary_column] if self.salary_column else None
+        return Contribution(rows[self.skill_column].reset_index(drop=True),
+                            None if salaries is None else salaries.reset_index(drop=True))
+
+    def diff(self, snapshot, partial=False):
+        """(new, changed, removed) posting keys of a snapshot frame against the stored rows"""
+        keys = pd.Index(snapshot.index)
+        stored = self.rows.index
+        new = keys.difference(stored, sort=False)
+        common = keys.intersection(stored, sort=False)
+        changed = common[snapshot.loc[common, 'row_hash'].to_numpy() != self.rows.loc[common, 'row_hash'].to_numpy()]
+        removed = stored.difference(keys, sort=False) if not partial else stored[:0]
+        return new, changed, removed
+
+    def ingest(self, path, partial=False):
+        """
+        Apply one snapshot CSV and return its history entry.
+
+        A full snapshot lists every live posting, so stored postings missing from
+        it are removed; a partial one only carries new and changed postings.
+        A snapshot whose file was already ingested as the latest state is skipped.
+        """
+        start = time.perf_counter()
+        path = Path(path)
+        sha = file_sha256(path)
+        if self.history and self.history[-1]['sha256'] == sha:
+            return None
+
+        df = read_csv_with_schema(path, DATASET_SCHEMAS.get(self.name, {}))
+        if df[self.key].duplicated().any():
+            print(f"⚠ {path.name}: {int(df[self.key].duplicated().sum()):,} duplicate {self.key} rows, keeping the last")
+            df = df.drop_duplicates(self.key, keep='last')
+        columns = [self.skill_column] + ([self.salary_column] if self.salary_column else [])
+        snapshot = df[columns].copy()
+        snapshot.insert(0, 'row_hash', row_hashes(df, self.key))
+        snapshot.index = pd.Index(df[self.key].astype('string'), name=self.key)
+        snapshot[self.skill_column] = snapshot[self.skill_column].astype('string')
+
+        new, changed, removed = self.diff(snapshot, partial)
+        outgoing = self.rows.loc[changed.append(removed)]
+        incoming = snapshot.loc[new.append(changed)]
+        self._apply(self._contribution(outgoing), -1)
+        self._apply(self._contribution(incoming), +1)
+
+        kept = self.rows.drop(index=changed.append(removed))
+        self.rows = pd.concat([kept, incoming]) if len(kept) else incoming.copy()
+
+        entry = {
+            'state': self.state_id + 1,
+            'snapshot': path.name,
+            'sha256': sha,
+            'partial': partial,
+            'ingested_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'rows': len(self.rows),
+            'new': len(new),
+            'changed': len(changed),
+            'removed': len(removed),
+            'unchanged': len(snapshot) - len(new) - len(changed),
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+        self.history.append(entry)
+        return entry
+
+    def top_skills(self, n=10):
+        order = np.argsort(-self.skill_counts, kind='stable')[:n]
+        return [(self.vocab[i], int(self.skill_counts[i])) for i in order if self.skill_counts[i] > 0]
+
+    def top_pairs(self, n=10):
+        upper = sparse.triu(self.pairs, k=1).tocoo()
+        order = np.argsort(-upper.data, kind='stable')[:n]
+        return [(self.vocab[upper.row[i]], self.vocab[upper.col[i]], int(upper.data[i])) for i in order]
+
+
+def print_state(state):
+    print(f"\n--- SNAPSHOT STATE: {state.name} (state {state.state_id}) ---")
+    for entry in state.history[-10:]:
+        kind = 'partial' if entry['partial'] else 'full'
+        print(f"  • state {entry['state']:3d} ← {entry['snapshot']} ({kind}, {entry['ingested_at']}): "
+              f"+{entry['new']:,} new, ~{entry['changed']:,} changed, -{entry['removed']:,} removed "
+              f"→ {entry['rows']:,} postings in {entry['seconds']:.2f}s")
+    print(f"  Skills: {int((state.skill_counts > 0).sum()):,} | Skill pairs: {state.pairs.nnz // 2:,}")
+    print(f"  Top skills: {', '.join(f'{skill} ({count:,})' for skill, count in state.top_skills(5))}")
+    print(f"  Top pairs: {', '.join(f'{a} + {b} ({count:,})' for a, b, count in state.top_pairs(3))}")
+    if state.salary_count:
+        p25, p50, p75 = state.salary.quantiles([0.25, 0.5, 0.75])
+        print(f"  Salary: mean ${state.salary_sum / state.salary_count:,.0f} | "
+              f"p25 ${p25:,.0f} | median ${p50:,.0f} | p75 ${p75:,.0f} ({state.salary_count:,} postings)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply new posting snapshots to the stored aggregates")
+    parser.add_argument('snapshots', nargs='*', type=Path, help="Snapshot CSVs, oldest first")
+    parser.add_argument('--dataset', choices=sorted(SNAPSHOT_SOURCES), default='ai_jobs',
+                        help="Dataset the snapshots belong to (sets the key, skill and salary columns)")
+    parser.add_argument('--partial', action='store_true',
+                        help="Snapshots only carry new and changed postings; nothing is removed")
+    parser.add_argument('--status', action='store_true', help="Print the stored state and its history")
+    parser.add_argument('--reset', action='store_true', help="Discard the stored state before ingesting")
+    parser.add_argument('--state-dir', type=Path, default=STATE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        shutil.rmtree(args.state_dir / args.dataset, ignore_errors=True)
+        print(f"✓ Cleared snapshot state for {args.dataset}")
+    state = SnapshotState.load(args.dataset, args.state_dir)
+
+    for path in args.snapshots:
+        if not path.exists():
+            print(f"✗ Snapshot not found: {path}")
+            return 1
+        entry = state.ingest(path, partial=args.partial)
+        if entry is None:
+            print(f"✓ {path.name} is already the latest ingested snapshot (state {state.state_id})")
+            continue
+        state.save()
+        print(f"✓ {path.name} → state {entry['state']}: +{entry['new']:,} new, ~{entry['changed']:,} changed, "
+              f"-{entry['removed']:,} removed, {entry['unchanged']:,} unchanged in {entry['seconds']:.2f}s")
+
+    if args.status or not args.snapshots:
+        if not state.history:
+            print(f"⚠ No snapshots ingested for {args.dataset} yet")
+            return 0
+        print_state(state)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+SQL Store for BDPA Tech Job Market Analysis
+Ingests every ML_Ready and 2025 Job Market dataset once into a local SQLite database so new
+questions are ad-hoc SQL instead of new pandas code and a full reload
+
+Each dataset becomes a table of the same name (row_id is its rowid, in CSV order), with
+indexes on its company, location and year/month columns. Skill lists are exploded into
+<dataset>_skills (row_id, skill_id), clustered by posting and indexed by skill, from the
+skill store (skill_engine.SkillStore): the skills table mirrors its canonical vocabulary,
+so skill_id is the same ID every other analysis uses. Per-dataset mention counts are
+materialized in skill_counts, so skill rankings do not scan the mentions. A dataset is only re-ingested
+when its source CSV changes.
+
+The job postings, layoffs and skills analyses of initial_data_exploration.py are available
+as named queries (ANALYSIS_QUERIES) that run against the persisted store.
+
+Usage:
+    python analysis/sql_store.py --ingest [--datasets NAME ...] [--force]
+    python analysis/sql_store.py "SELECT company, SUM(total_layoffs) FROM layoffs GROUP BY 1 ORDER BY 2 DESC LIMIT 5"
+    python analysis/sql_store.py --run top_skills salary_by_experience   # or --run all
+    python analysis/sql_store.py --list
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import DATASET_FILES, DATASET_SCHEMAS, dataset_path, file_sha256, read_dataset
+from skill_engine import SKILL_SOURCES, SkillStore
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+STORE_PATH = ANALYSIS_DIR / "cache" / "store" / "market.sqlite"
+
+# Bump when the table layout changes; an older database is cleared and re-ingested
+STORE_FORMAT_VERSION = 2
+
+# Dataset name -> indexed column groups (company, location, year/month or date)
+STORE_INDEXES = {
+    'job_postings': [('company_name',), ('location',), ('posted_year', 'posted_month')],
+    'job_skills': [('job_link',)],
+    'it_jobs': [('company_name',), ('location',)],
+    'linkedin_postings': [('job_link',), ('company',), ('job_location',), ('first_seen_year', 'first_seen_month')],
+    'layoffs': [('company',), ('headquarter_location',), ('year', 'month')],
+    'layoff_trends': [('year',)],
+    'dice_jobs': [('company',), ('joblocation_address',), ('post_year', 'post_month')],
+    'unified_jobs': [('company_name',), ('location',), ('posted_year', 'posted_month')],
+    'ai_jobs': [('company_name',), ('company_location',), ('posting_date',)],
+    'ai_jobs_snapshot': [('company_name',), ('company_location',), ('posting_date',)],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_log (
+    dataset TEXT PRIMARY KEY, source_sha256 TEXT, rows INTEGER, skill_postings INTEGER, mentions INTEGER,
+    seconds REAL, ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS skills (skill_id INTEGER PRIMARY KEY, skill TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS skill_counts (
+    dataset TEXT NOT NULL, skill_id INTEGER NOT NULL, mentions INTEGER NOT NULL,
+    PRIMARY KEY (dataset, skill_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_counts_rank ON skill_counts (dataset, mentions DESC);
+"""
+
+# Name -> (description, SQL); mirrors analyze_job_postings(), analyze_layoffs() and analyze_skills()
+ANALYSIS_QUERIES = {
+    'salary_stats': ("Salary statistics of the tech postings", """
+        SELECT COUNT(normalized_salary) AS count, AVG(normalized_salary) AS mean,
+               MIN(normalized_salary) AS min, MEDIAN(normalized_salary) AS median, MAX(normalized_salary) AS max
+        FROM job_postings"""),
+    'salary_by_experience': ("Median salary by experience level", """
+        SELECT formatted_experience_level, COUNT(normalized_salary) AS count,
+               MEDIAN(normalized_salary) AS median, AVG(normalized_salary) AS mean
+        FROM job_postings WHERE formatted_experience_level IS NOT NULL
+        GROUP BY formatted_experience_level ORDER BY median DESC"""),
+    'remote_distribution': ("Remote work distribution", """
+        SELECT remote_allowed, COUNT(*) AS count, 100.0 * COUNT(*) / (SELECT COUNT(*) FROM job_postings) AS pct
+        FROM job_postings WHERE remote_allowed IS NOT NULL GROUP BY remote_allowed ORDER BY count DESC"""),
+    'top_locations': ("Top 15 job locations", """
+        SELECT location, COUNT(*) AS count FROM job_postings WHERE location IS NOT NULL
+        GROUP BY location ORDER BY count DESC LIMIT 15"""),
+    'postings_by_month': ("Postings by month (2024)", """
+        SELECT posted_month, COUNT(*) AS count FROM job_postings WHERE posted_year = 2024
+        GROUP BY posted_month ORDER BY posted_month"""),
+    'work_types': ("Work type distribution", """
+        SELECT formatted_work_type, COUNT(*) AS count FROM job_postings WHERE formatted_work_type IS NOT NULL
+        GROUP BY formatted_work_type ORDER BY count DESC"""),
+    'layoff_totals': ("Layoff events and employees laid off", """
+        SELECT COUNT(*) AS events, SUM(total_layoffs) AS total_layoffs FROM layoffs"""),
+    'layoffs_by_year': ("Layoffs by year", """
+        SELECT year, SUM(total_layoffs) AS total_layoffs, COUNT(company) AS num_events FROM layoffs
+        WHERE year IS NOT NULL GROUP BY year ORDER BY year"""),
+    'layoffs_by_industry': ("Top 10 industries by layoffs", """
+        SELECT industry, SUM(total_layoffs) AS total_layoffs FROM layoffs WHERE industry IS NOT NULL
+        GROUP BY industry ORDER BY total_layoffs DESC LIMIT 10"""),
+    'layoffs_by_company': ("Top 15 companies by total layoffs", """
+        SELECT company, SUM(total_layoffs) AS total_layoffs FROM layoffs WHERE company IS NOT NULL
+        GROUP BY company ORDER BY total_layoffs DESC LIMIT 15"""),
+    'top_skills': ("Top 30 most demanded skills", """
+        SELECT s.skill, c.mentions FROM skill_counts c JOIN skills s USING (skill_id)
+        WHERE c.dataset = 'job_skills' ORDER BY c.mentions DESC LIMIT 30"""),
+    'skill_totals': ("Postings with skills, mentions and unique skills", """
+        SELECT skill_postings AS postings, mentions,
+               (SELECT COUNT(*) FROM skill_counts WHERE dataset = 'job_skills') AS unique_skills
+        FROM ingest_log WHERE dataset = 'job_skills'"""),
+}
+
+
+class _Median:
+    """SQLite aggregate: exact median of the non-null values"""
+
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+def _sql_frame(df):
+    """A frame sqlite3 can bind: categoricals and nullable dtypes as plain objects with None"""
+    out = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        if pd.api.types.is_bool_dtype(values.dtype):
+            values = values.astype('Int8')
+        if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            values = values.astype(object)
+        out[column] = values.where(values.notna(), None) if values.dtype == object else values
+    return pd.DataFrame(out)
+
+
+class MarketStore:
+    """The SQLite store: ingestion, ad-hoc queries and the named analysis queries"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.create_aggregate('MEDIAN', 1, _Median)
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        # Every ingest rewrites whole tables, so a crash mid-ingest only means re-running it
+        self.conn.execute('PRAGMA synchronous = OFF')
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != STORE_FORMAT_VERSION:
+            self._clear()
+        self.conn.executescript(_SCHEMA)
+
+    def _clear(self):
+        tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        with self.conn:
+            for table in tables:
+                self.conn.execute(f'DROP TABLE "{table}"')
+        self.conn.execute(f'PRAGMA user_version = {STORE_FORMAT_VERSION}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def query(self, sql, params=()):
+        """Run SQL and return the result as a DataFrame"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def run(self, name):
+        """Run one of ANALYSIS_QUERIES by name"""
+        return self.query(ANALYSIS_QUERIES[name][1])
+
+    def tables(self):
+        """Ingested datasets with their row counts, source hash and ingest time"""
+        return self.query("SELECT * FROM ingest_log ORDER BY dataset")
+
+    def ingested_sha(self, name):
+        row = self.conn.execute("SELECT source_sha256 FROM ingest_log WHERE dataset = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, name, data_dir=None, force=False):
+        """Load one dataset into its table (skipped when its source is unchanged); returns the log row or None"""
+        sha = file_sha256(dataset_path(name, data_dir))
+        if not force and sha == self.ingested_sha(name):
+            return None
+        start = time.perf_counter()
+        df, _ = read_dataset(name, data_dir=data_dir)
+
+        with self.conn:
+            self.conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            _sql_frame(df).to_sql(name, self.conn, index=False)
+            for columns in STORE_INDEXES.get(name, ()):
+                present = [c for c in columns if c in df.columns]
+                if present:
+                    quoted = ', '.join(f'"{c}"' for c in present)
+                    self.conn.execute(f'CREATE INDEX "{name}_{"_".join(present)}" ON "{name}" ({quoted})')
+            skill_postings, mentions = self._ingest_skills(name, df, data_dir)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ingest_log VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, sha, len(df), skill_postings, mentions, round(time.perf_counter() - start, 3),
+                 datetime.now(timezone.utc).isoformat(timespec='seconds')))
+        return self.conn.execute("SELECT * FROM ingest_log WHERE dataset = ?", (name,)).fetchone()
+
+    def _sync_skills(self, vocabulary):
+        """Append the skill store's new vocabulary entries to the skills table"""
+        known = self.conn.execute("SELECT COUNT(*), MAX(skill_id) FROM skills").fetchone()
+        last = known[1] if known[1] is not None else -1
+        if known[0] != last + 1 or (last >= 0 and self.conn.execute(
+                "SELECT skill FROM skills WHERE skill_id = ?", (last,)).fetchone()[0] != vocabulary.skills[last]):
+            # The skill store was rebuilt with different IDs: every dataset's skills need re-ingesting
+            print("⚠ Skill store vocabulary changed; the other datasets' skills must be re-ingested")
+            self.conn.execute("DELETE FROM skills")
+            self.conn.execute("DELETE FROM ingest_log")
+            last = -1
+        self.conn.executemany("INSERT INTO skills VALUES (?, ?)",
+                              ((i, vocabulary.skills[i]) for i in range(last + 1, len(vocabulary))))
+
+    def _ingest_skills(self, name, df, data_dir=None):
+        """Rewrite the dataset's skills table and skill_counts rows; returns (postings, mentions)"""
+        self.conn.execute(f'DROP TABLE IF EXISTS "{name}_skills"')
+        self.conn.execute("DELETE FROM skill_counts WHERE dataset = ?", (name,))
+        column = SKILL_SOURCES.get(name)
+        if column is None or column not in df.columns:
+            return 0, 0
+        skill_store = SkillStore(data_dir=data_dir)
+        mapping = skill_store.get(name)
+        self._sync_skills(skill_store.vocabulary)
+
+        # row_id is the rowid of a freshly written table: position + 1
+        rows = np.asarray(mapping.posting_ids, dtype=np.int64)[mapping.posting_rows()] + 1
+        self.conn.execute(f'CREATE TABLE "{name}_skills" (row_id INTEGER NOT NULL, skill_id INTEGER NOT NULL, '
+                          f'PRIMARY KEY (row_id, skill_id)) WITHOUT ROWID')
+        self.conn.executemany(f'INSERT INTO "{name}_skills" VALUES (?, ?)',
+                              zip(rows.tolist(), np.asarray(mapping.codes).tolist()))
+        self.conn.execute(f'CREATE INDEX "{name}_skills_skill_id" ON "{name}_skills" (skill_id)')
+        counts = mapping.counts()
+        skill_ids = np.flatnonzero(counts)
+        self.conn.executemany("INSERT INTO skill_counts VALUES (?, ?, ?)",
+                              zip([name] * len(skill_ids), skill_ids.tolist(), counts[skill_ids].tolist()))
+        return mapping.n_postings, mapping.n_mentions
+
+
+def print_result(name, frame, seconds):
+    description = ANALYSIS_QUERIES[name][0] if name in ANALYSIS_QUERIES else name
+    print(f"\n--- {description.upper()} ---")
+    print(frame.to_string(index=False) if len(frame) else "(no rows)")
+    print(f"⏱ {seconds * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest the datasets into SQLite and query them")
+    parser.add_argument('sql', nargs='?', help="Ad-hoc SQL to run against the store")
+    parser.add_argument('--ingest', action='store_true', help="Load new or changed datasets into the store")
+    parser.add_argument('--datasets', nargs='+', choices=list(DATASET_SCHEMAS), default=None)
+    parser.add_argument('--data-dir', type=Path, default=None, help="ML_Ready directory to ingest from")
+    parser.add_argument('--force', action='store_true', help="Re-ingest even when the source is unchanged")
+    parser.add_argument('--run', nargs='+', metavar='NAME', help="Run named analysis queries ('all' for every one)")
+    parser.add_argument('--list', action='store_true', help="List the ingested tables and the named queries")
+    parser.add_argument('--path', type=Path, default=STORE_PATH)
+    args = parser.parse_args(argv)
+
+    if not (args.sql or args.ingest or args.run or args.list):
+        parser.print_help()
+        return 1
+    names = list(ANALYSIS_QUERIES) if args.run == ['all'] else args.run or []
+    unknown = [n for n in names if n not in ANALYSIS_QUERIES]
+    if unknown:
+        print(f"✗ Unknown query: {', '.join(unknown)} (available: {', '.join(ANALYSIS_QUERIES)})")
+        return 1
+
+    with MarketStore(args.path) as store:
+        if args.ingest:
+            print("--- INGEST ---")
+            for name in args.datasets or DATASET_SCHEMAS:
+                try:
+                    # --data-dir only replaces the ML_Ready directory; the 2025 files keep theirs
+                    row = store.ingest(name, data_dir=args.data_dir if name in DATASET_FILES else None,
+                                       force=args.force)
+                except Exception as e:
+                    print(f"✗ {name}: {e}")
+                    continue
+                if row is None:
+                    print(f"✓ {name}: unchanged")
+                else:
+                    print(f"✓ {name}: {row[2]:,} rows, {row[4]:,} skill mentions in {row[5]:.2f}s")
+            print(f"✓ Store at {args.path} ({args.path.stat().st_size / 1e6:.1f} MB)")
+
+        if args.list:
+            print(store.tables().to_string(index=False))
+            print("\nNamed queries:")
+            for name, (description, _) in ANALYSIS_QUERIES.items():
+                print(f"  {name:22s} {description}")
+
+        status = 0
+        for name in names:
+            start = time.perf_counter()
+            try:
+                frame = store.run(name)
+            except Exception as e:
+                print(f"✗ {name}: {e}")
+                status = 1
+                continue
+            print_result(name, frame, time.perf_counter() - start)
+
+        if args.sql:
+            start = time.perf_counter()
+            try:
+                frame = store.query(args.sql)
+            except Exception as e:
+                print(f"✗ {e}")
+                return 1
+            print_result('query', frame, time.perf_counter() - start)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Streaming Job Postings Analysis for BDPA Tech Job Market Analysis
+Processes posting CSVs chunk by chunk with online aggregates, so memory stays flat as input grows
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import DATA_DIR, DATASET_FILES, DATASET_SCHEMAS, apply_schema, text_dtypes
+from sketches import QuantileSketch, RunningStats
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Only the columns analyze_job_postings() looks at are ever parsed
+STREAM_COLUMNS = [
+    'normalized_salary', 'formatted_experience_level', 'remote_allowed',
+    'location', 'posted_year', 'posted_month', 'formatted_work_type',
+]
+
+
+class PostingsAggregator:
+    """
+    Online equivalent of analyze_job_postings().
+
+    Holds running stats and a quantile sketch for salary (overall and per
+    experience level) plus value counts for the categorical columns. Memory
+    depends on the number of distinct categories, never on the number of rows,
+    and two aggregators built over different chunks or files merge exactly.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.rows = 0
+        self.salary = RunningStats()
+        self.salary_sketch = QuantileSketch(relative_accuracy)
+        self.salary_by_level = {}
+        self.remote_counts = Counter()
+        self.location_counts = Counter()
+        self.work_type_counts = Counter()
+        self.monthly_2024 = Counter()
+
+    def _level(self, level):
+        if level not in self.salary_by_level:
+            self.salary_by_level[level] = (RunningStats(), QuantileSketch(self.relative_accuracy))
+        return self.salary_by_level[level]
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+
+        if 'normalized_salary' in chunk.columns:
+            salary = chunk['normalized_salary'].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.salary.update(salary)
+            self.salary_sketch.update(salary)
+
+            if 'formatted_experience_level' in chunk.columns:
+                has_salary = ~np.isnan(salary)
+                levels = chunk['formatted_experience_level'][has_salary]
+                for level, values in pd.Series(salary[has_salary], index=levels.index).groupby(levels.to_numpy()):
+                    stats, sketch = self._level(level)
+                    stats.update(values.to_numpy())
+                    sketch.update(values.to_numpy())
+
+        if 'remote_allowed' in chunk.columns:
+            self.remote_counts.update(chunk['remote_allowed'].value_counts().to_dict())
+        if 'location' in chunk.columns:
+            self.location_counts.update(chunk['location'].value_counts().to_dict())
+        if 'formatted_work_type' in chunk.columns:
+            self.work_type_counts.update(chunk['formatted_work_type'].value_counts().to_dict())
+        if 'posted_year' in chunk.columns and 'posted_month' in chunk.columns:
+            months = chunk.loc[chunk['posted_year'] == 2024, 'posted_month'].dropna()
+            self.monthly_2024.update(months.value_counts().to_dict())
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.salary.merge(other.salary)
+        self.salary_sketch.merge(other.salary_sketch)
+        for level, (stats, sketch) in other.salary_by_level.items():
+            own_stats, own_sketch = self._level(level)
+            own_stats.merge(stats)
+            own_sketch.merge(sketch)
+        self.remote_counts.update(other.remote_counts)
+        self.location_counts.update(other.location_counts)
+        self.work_type_counts.update(other.work_type_counts)
+        self.monthly_2024.update(other.monthly_2024)
+        return self
+
+    def salary_summary(self):
+        """describe()-style salary statistics; quantiles are sketch estimates"""
+        q25, q50, q75 = self.salary_sketch.quantiles([0.25, 0.5, 0.75])
+        return pd.Series({
+            'count': self.salary.count, 'mean': self.salary.mean, 'std': self.salary.std,
+            'min': self.salary.min, '25%': q25, '50%': q50, '75%': q75, 'max': self.salary.max,
+        }, name='normalized_salary')
+
+    def salary_by_experience(self):
+        """Per-level count/median/mean, sorted by median like the in-memory groupby"""
+        rows = {
+            level: {'count': stats.count, 'median': sketch.quantile(0.5), 'mean': stats.mean}
+            for level, (stats, sketch) in self.salary_by_level.items()
+        }
+        frame = pd.DataFrame.from_dict(rows, orient='index')
+        frame.index.name = 'formatted_experience_level'
+        return frame.sort_values('median', ascending=False) if len(frame) else frame
+
+
+def iter_posting_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE, schema=None):
+    """Yield schema-typed chunks of a postings CSV, reading only STREAM_COLUMNS"""
+    schema = DATASET_SCHEMAS['job_postings'] if schema is None else schema
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [col for col in STREAM_COLUMNS if col in header]
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=text_dtypes(schema, usecols), chunksize=chunksize):
+        yield apply_schema(chunk, schema)
+
+
+def stream_job_postings(csv_paths, chunksize=DEFAULT_CHUNKSIZE, relative_accuracy=0.01):
+    """Aggregate one or more postings CSVs without materializing them"""
+    aggregator = PostingsAggregator(relative_accuracy)
+    for csv_path in csv_paths:
+        for chunk in iter_posting_chunks(csv_path, chunksize):
+            aggregator.update(chunk)
+    return aggregator
+
+
+def print_streaming_report(aggregator):
+    """Print the same sections as analyze_job_postings() from streamed aggregates"""
+    print("\n" + "=" * 80)
+    print("JOB POSTINGS ANALYSIS (STREAMING)")
+    print("=" * 80)
+    print(f"\nRows processed: {aggregator.rows:,}")
+
+    if aggregator.salary.count:
+        print("\n--- SALARY STATISTICS ---")
+        print(aggregator.salary_summary())
+        print(f"(quantiles within ±{aggregator.relative_accuracy:.0%} relative error)")
+
+    if aggregator.salary_by_level:
+        print("\n--- MEDIAN SALARY BY EXPERIENCE LEVEL ---")
+        print(aggregator.salary_by_experience())
+
+    if aggregator.remote_counts:
+        print("\n--- REMOTE WORK DISTRIBUTION ---")
+        print(pd.Series(aggregator.remote_counts, name='count').sort_values(ascending=False))
+        print(f"\nRemote allowed percentage: {(aggregator.remote_counts.get(True, 0) / aggregator.rows) * 100:.1f}%")
+
+    if aggregator.location_counts:
+        print("\n--- TOP 15 JOB LOCATIONS ---")
+        for location, count in aggregator.location_counts.most_common(15):
+            print(f"  {location:40s} {count:,}")
+
+    if aggregator.monthly_2024:
+        print("\n--- POSTINGS BY MONTH (2024) ---")
+        print(pd.Series(aggregator.monthly_2024, name='count').sort_index())
+
+    if aggregator.work_type_counts:
+        print("\n--- WORK TYPE DISTRIBUTION ---")
+        for work_type, count in aggregator.work_type_counts.most_common():
+            print(f"  {work_type:40s} {count:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream postings CSVs through the job postings analysis")
+    parser.add_argument('csv_paths', nargs='*', type=Path,
+                        help="Postings CSVs (defaults to tech_job_postings_clean.csv)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--accuracy', type=float, default=0.01, help="Relative accuracy of salary quantiles")
+    parser.add_argument('--trace-memory', action='store_true', help="Report peak traced memory")
+    args = parser.parse_args()
+
+    csv_paths = args.csv_paths or [DATA_DIR / DATASET_FILES['job_postings']]
+
+    if args.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    aggregator = stream_job_postings(csv_paths, args.chunksize, args.accuracy)
+    elapsed = time.perf_counter() - start
+
+    print_streaming_report(aggregator)
+    print(f"\n✓ Streamed {aggregator.rows:,} rows in {elapsed:.2f}s ({aggregator.rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"✓ Peak traced memory: {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
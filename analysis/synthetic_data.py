@@ -0,0 +1,481 @@
+"""
+Synthetic Dataset Generator for BDPA Tech Job Market Analysis
+Writes seeded stand-ins for every ML_Ready CSV and the 2025 AI job files, with the documented
+schemas and realistic distributions, at any multiple of the real row counts
+
+The output mirrors the repo layout (<root>/Kaggle Datasets/ML_Ready and <root>/2025 Job Market),
+so scripts that read cwd-relative paths can be pointed at it by running from <root>.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import dataset_path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+SYNTHETIC_DIR = ANALYSIS_DIR / "cache" / "synthetic"
+
+# Bump when generated content changes so stale synthetic trees are regenerated
+GENERATOR_VERSION = 2
+
+# Rows per dataset at scale 1 (Kaggle Datasets/ML_Ready/README.md and the 2025 files)
+BASE_ROWS = {
+    'job_postings': 40_991,
+    'job_skills': 354_953,
+    'it_jobs': 2_500,
+    'linkedin_postings': 370_139,
+    'layoffs': 489,
+    'layoff_trends': 30,
+    'dice_jobs': 22_000,
+    'unified_jobs': 58_491,
+    'ai_jobs': 15_000,
+    'ai_jobs_snapshot': 15_000,
+}
+
+# Yearly series: one row per year regardless of scale
+FIXED_SIZE = {'layoff_trends'}
+
+CHUNK_ROWS = 200_000
+
+TECH_TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Data Analyst', 'Data Scientist', 'Data Engineer',
+    'DevOps Engineer', 'Systems Administrator', 'Network Engineer', 'Business Analyst', 'Product Manager',
+    'Project Manager', 'Full Stack Developer', 'Frontend Developer', 'Backend Developer', 'QA Engineer',
+    'Machine Learning Engineer', 'Cloud Architect', 'Security Analyst', 'IT Support Specialist',
+    'Database Administrator', 'Solutions Architect', 'Technical Program Manager', 'Site Reliability Engineer',
+    'Mobile Developer', 'UX Designer', 'Software Engineering Intern', 'Data Analyst Intern',
+]
+CITIES = [
+    ('New York', 'NY'), ('San Francisco', 'CA'), ('Seattle', 'WA'), ('Austin', 'TX'), ('Chicago', 'IL'),
+    ('Boston', 'MA'), ('Washington', 'DC'), ('Houston', 'TX'), ('Atlanta', 'GA'), ('Los Angeles', 'CA'),
+    ('Dallas', 'TX'), ('Denver', 'CO'), ('San Jose', 'CA'), ('Philadelphia', 'PA'), ('Phoenix', 'AZ'),
+    ('Charlotte', 'NC'), ('Minneapolis', 'MN'), ('Raleigh', 'NC'), ('Portland', 'OR'), ('Detroit', 'MI'),
+]
+COMPANY_STEMS = [
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Hooli', 'Vandelay', 'Soylent', 'Cyberdyne',
+    'Tyrell', 'Wonka', 'Aperture', 'Massive', 'Dunder', 'Prestige', 'Oscorp', 'Nakatomi', 'Gringotts', 'Monarch',
+]
+COMPANY_SUFFIXES = ['Inc', 'Inc.', 'LLC', 'Corp', 'Corporation', 'Technologies', 'Systems', 'Labs', 'Group', '']
+SKILL_PREFIXES = [
+    'Cloud', 'Data', 'Network', 'Systems', 'Web', 'Mobile', 'Security', 'Quality', 'Process', 'Vendor',
+    'Client', 'Risk', 'Supply Chain', 'Financial', 'Technical', 'Product', 'Clinical', 'Field', 'Sales', 'Team',
+]
+SKILL_SUFFIXES = [
+    'Management', 'Analysis', 'Engineering', 'Design', 'Support', 'Operations', 'Testing', 'Planning',
+    'Architecture', 'Administration', 'Development', 'Reporting', 'Compliance', 'Automation', 'Integration',
+]
+
+AI_TITLES = [
+    'AI Architect', 'AI Consultant', 'AI Product Manager', 'AI Research Scientist', 'AI Software Engineer',
+    'AI Specialist', 'Autonomous Systems Engineer', 'Computer Vision Engineer', 'Data Analyst', 'Data Engineer',
+    'Data Scientist', 'Deep Learning Engineer', 'Head of AI', 'ML Ops Engineer', 'Machine Learning Engineer',
+    'Machine Learning Researcher', 'NLP Engineer', 'Principal Data Scientist', 'Research Scientist',
+    'Robotics Engineer',
+]
+AI_COMPANIES = [
+    'AI Innovations', 'Advanced Robotics', 'Algorithmic Solutions', 'Autonomous Tech', 'Cloud AI Solutions',
+    'Cognitive Computing', 'DataVision Ltd', 'DeepTech Ventures', 'Digital Transformation LLC', 'Future Systems',
+    'Machine Intelligence Group', 'Neural Networks Co', 'Predictive Systems', 'Quantum Computing Inc',
+    'Smart Analytics', 'TechCorp Inc',
+]
+AI_COUNTRIES = [
+    'Australia', 'Austria', 'Canada', 'China', 'Denmark', 'Finland', 'France', 'Germany', 'India', 'Ireland',
+    'Israel', 'Japan', 'Netherlands', 'Norway', 'Singapore', 'South Korea', 'Sweden', 'Switzerland',
+    'United Kingdom', 'United States',
+]
+AI_INDUSTRIES = [
+    'Automotive', 'Consulting', 'Education', 'Energy', 'Finance', 'Gaming', 'Government', 'Healthcare',
+    'Manufacturing', 'Media', 'Real Estate', 'Retail', 'Technology', 'Telecommunications', 'Transportation',
+]
+# Skill -> relative frequency in required_skills of the 2025 files
+AI_SKILLS = {
+    'Python': 4450, 'SQL': 3407, 'TensorFlow': 3022, 'Kubernetes': 3009, 'Scala': 2794, 'PyTorch': 2777,
+    'Linux': 2705, 'Git': 2631, 'Java': 2578, 'GCP': 2442, 'Hadoop': 2419, 'Tableau': 2341, 'R': 2311,
+    'Computer Vision': 2284, 'Data Visualization': 2270, 'Deep Learning': 2189, 'MLOps': 2164, 'Spark': 2155,
+    'NLP': 2145, 'Azure': 2144, 'AWS': 2018, 'Mathematics': 1943, 'Docker': 1862, 'Statistics': 1833,
+}
+# Experience level -> (log-salary mean, log-salary std, min years, max years)
+AI_LEVELS = {'EN': (11.011, 0.288, 0, 1), 'MI': (11.344, 0.285, 2, 4),
+             'SE': (11.673, 0.283, 5, 9), 'EX': (12.094, 0.312, 10, 19)}
+
+# Head of the real skill distribution (top 40 of results/top_100_skills.csv as first committed);
+# built in so the generated data depends only on seed, scale and GENERATOR_VERSION
+DEFAULT_SKILL_HEAD = {
+    'Communication': 85424, 'Teamwork': 54183, 'Leadership': 41717, 'Project Management': 32166,
+    'Customer service': 30179, 'Troubleshooting': 29072, 'Problem Solving': 27717,
+    'Communication skills': 27312, 'Customer Service': 23725, 'Collaboration': 22904, 'Problemsolving': 22784,
+    'Communication Skills': 22434, 'Python': 22016, 'Training': 18966, 'SQL': 18322,
+    'Attention to detail': 17316, 'Data Analysis': 16757, 'Microsoft Office Suite': 16154,
+    'Project management': 15512, 'Attention to Detail': 15022, 'Microsoft Office': 14706,
+    'Time Management': 14656, 'Engineering': 14113, 'Documentation': 13595, 'Time management': 13578,
+    "Bachelor's Degree": 12592, 'Java': 12482, 'Adaptability': 12462, 'Excel': 12221, 'Sales': 12115,
+    'Travel': 12108, 'Scheduling': 11752, 'AWS': 11735, 'Interpersonal skills': 11681, 'AutoCAD': 11678,
+    'Patient Care': 11217, 'Multitasking': 11139, 'Safety': 11107, 'Interpersonal Skills': 11073,
+    'Flexibility': 11037,
+}
+
+
+def _rng(seed, name, chunk):
+    """Independent, reproducible stream per (seed, dataset, chunk)"""
+    return np.random.default_rng([seed, sum(map(ord, name)), chunk])
+
+
+def _weighted(rng, values, weights, n):
+    weights = np.asarray(weights, dtype=np.float64)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=weights / weights.sum())]
+
+
+def _zipf_index(rng, size, n, exponent=1.1):
+    """n indices in [0, size) with Zipf-like popularity (index 0 most common)"""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    cdf = np.cumsum(weights)
+    return np.searchsorted(cdf, rng.random(n) * cdf[-1])
+
+
+def _companies(count=5000):
+    stems = np.array(COMPANY_STEMS, dtype=object)
+    suffixes = np.array(COMPANY_SUFFIXES, dtype=object)
+    i = np.arange(count)
+    names = stems[i % len(stems)] + np.where(i >= len(stems), ' ' + (i // len(stems)).astype(str), '')
+    return np.char.strip((names + ' ' + suffixes[(i * 7) % len(suffixes)]).astype(str)).astype(object)
+
+
+COMPANIES = _companies()
+CITY_NAMES = np.array([f"{city}, {state}" for city, state in CITIES], dtype=object)
+
+
+def _join_lists(names, codes, offsets):
+    """Comma-separated string per row from CSR (codes, offsets) into names"""
+    tokens = names[codes] + ', '
+    starts = offsets[:-1]
+    out = np.full(len(starts), '', dtype=object)
+    nonempty = offsets[1:] > starts
+    out[nonempty] = np.add.reduceat(tokens, starts[nonempty])
+    return np.array([s[:-2] for s in out], dtype=object)
+
+
+def _dates(rng, start, end, n):
+    start, end = np.datetime64(start), np.datetime64(end)
+    return start + rng.integers(0, (end - start).astype(int) + 1, n).astype('timedelta64[D]')
+
+
+def skill_vocabulary(size=200_000, head=None):
+    """(names, weights): the real head of the skill distribution followed by a Zipf tail"""
+    if head is None:
+        head = DEFAULT_SKILL_HEAD
+    head_names = list(head)
+    head_weights = np.array(list(head.values()), dtype=np.float64)
+    n_tail = max(0, size - len(head_names))
+    i = np.arange(n_tail)
+    prefixes = np.array(SKILL_PREFIXES, dtype=object)
+    suffixes = np.array(SKILL_SUFFIXES, dtype=object)
+    tail_names = (prefixes[i % len(prefixes)] + ' ' + suffixes[(i // len(prefixes)) % len(suffixes)]
+                  + np.where(i >= len(prefixes) * len(suffixes),
+                             ' ' + (i // (len(prefixes) * len(suffixes))).astype(str), ''))
+    ranks = np.arange(len(head_names) + 1, size + 1)
+    tail_weights = head_weights.min() * (len(head_names) / ranks) ** 1.05
+    names = np.concatenate([np.array(head_names, dtype=object), tail_names.astype(object)])
+    return names, np.concatenate([head_weights, tail_weights])
+
+
+def gen_job_postings(rng, n, offset):
+    has_salary = rng.random(n) < 0.176
+    yearly = rng.random(n) < 0.85
+    med = np.where(yearly, rng.lognormal(11.45, 0.38, n), rng.lognormal(3.6, 0.35, n))
+    spread = rng.uniform(0.1, 0.3, n)
+    level = _weighted(rng, ['Mid-Senior level', 'Entry level', 'Associate', 'Director', 'Internship',
+                            'Executive', None], [38, 30, 9, 4, 2, 1, 16], n)
+    posted_month = rng.integers(1, 13, n)
+    return pd.DataFrame({
+        'job_id': (3_900_000_000 + offset + np.arange(n)).astype(str),
+        'company_name': COMPANIES[_zipf_index(rng, len(COMPANIES), n)],
+        'title': np.array(TECH_TITLES, dtype=object)[_zipf_index(rng, len(TECH_TITLES), n, 0.8)],
+        'location': CITY_NAMES[_zipf_index(rng, len(CITY_NAMES), n, 0.9)],
+        'min_salary': np.where(has_salary, np.round(med * (1 - spread)), np.nan),
+        'max_salary': np.where(has_salary, np.round(med * (1 + spread)), np.nan),
+        'med_salary': np.where(has_salary & (rng.random(n) < 0.3), np.round(med), np.nan),
+        'normalized_salary': np.where(has_salary, np.round(np.where(yearly, med, med * 2080)), np.nan),
+        'pay_period': np.where(has_salary, np.where(yearly, 'YEARLY', 'HOURLY'), None),
+        'currency': np.where(has_salary, 'USD', None),
+        'views': np.floor(rng.lognormal(2.5, 1.2, n)),
+        'applies': np.where(rng.random(n) < 0.2, np.floor(rng.lognormal(1.5, 1.0, n)), np.nan),
+        'formatted_work_type': _weighted(rng, ['Full-time', 'Contract', 'Part-time', 'Temporary', 'Internship'],
+                                         [80, 12, 4, 2, 2], n),
+        'formatted_experience_level': level,
+        'remote_allowed': np.where(rng.random(n) < 0.15, 1, 0),
+        'posted_year': np.where(rng.random(n) < 0.97, 2024, 2023),
+        'posted_month': posted_month,
+        'zip_code': rng.integers(10000, 99999, n).astype(str),
+    })
+
+
+def gen_job_skills(rng, n, offset, vocab):
+    names, weights = vocab
+    sizes = np.clip(np.round(rng.lognormal(2.85, 0.55, n)), 1, 120).astype(np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    cdf = np.cumsum(weights)
+    codes = np.searchsorted(cdf, rng.random(offsets[-1]) * cdf[-1])
+    return pd.DataFrame({
+        'job_link': [f"https://www.linkedin.com/jobs/view/job-{offset + i}" for i in range(n)],
+        'job_skills': _join_lists(names, codes, offsets),
+    })
+
+
+def gen_it_jobs(rng, n, offset):
+    min_years = rng.choice([0, 1, 2, 3, 5, 7, 10], size=n, p=[0.15, 0.2, 0.2, 0.2, 0.15, 0.06, 0.04]).astype(float)
+    return pd.DataFrame({
+        'job_title': np.array(TECH_TITLES, dtype=object)[_zipf_index(rng, len(TECH_TITLES), n, 0.8)],
+        'company_name': COMPANIES[_zipf_index(rng, len(COMPANIES), n)],
+        'location': CITY_NAMES[_zipf_index(rng, len(CITY_NAMES), n, 0.9)],
+        'experience_min_years': min_years,
+        'experience_max_years': min_years + rng.choice([1, 2, 3, 5], size=n),
+    })
+
+
+def gen_linkedin_postings(rng, n, offset):
+    first_seen = _dates(rng, '2024-01-12', '2024-01-21', n)
+    country = _weighted(rng, ['United States', 'United Kingdom', 'Canada', 'Australia'], [80, 10, 6, 4], n)
+    cities = np.array([c for c, _ in CITIES], dtype=object)[_zipf_index(rng, len(CITIES), n, 0.9)]
+    return pd.DataFrame({
+        'job_link': [f"https://www.linkedin.com/jobs/view/job-{offset + i}" for i in range(n)],
+        'job_title': np.array(TECH_TITLES, dtype=object)[_zipf_index(rng, len(TECH_TITLES), n, 0.8)],
+        'company': COMPANIES[_zipf_index(rng, len(COMPANIES), n)],
+        'job_location': CITY_NAMES[_zipf_index(rng, len(CITY_NAMES), n, 0.9)],
+        'search_city': cities,
+        'search_country': country,
+        'job_level': _weighted(rng, ['Mid senior', 'Associate'], [91, 9], n),
+        'job_type': _weighted(rng, ['Onsite', 'Hybrid', 'Remote'], [78, 12, 10], n),
+        'first_seen': first_seen.astype(str),
+        'first_seen_year': 2024,
+        'first_seen_month': 1,
+    })
+
+
+def gen_layoffs(rng, n, offset):
+    reported = _dates(rng, '2022-01-01', '2023-12-31', n)
+    years = reported.astype('datetime64[Y]').astype(int) + 1970
+    months = reported.astype('datetime64[M]').astype(int) % 12 + 1
+    return pd.DataFrame({
+        'company': COMPANIES[_zipf_index(rng, len(COMPANIES), n)],
+        'total_layoffs': np.where(rng.random(n) < 0.7, np.round(rng.lognormal(4.8, 1.3, n)), np.nan),
+        'impacted_workforce_percentage': np.where(rng.random(n) < 0.8, np.round(rng.uniform(1, 40, n), 1), np.nan),
+        'reported_date': reported.astype(str),
+        'industry': _weighted(rng, ['Fintech', 'Healthcare Tech', 'PropTech', 'E-commerce', 'EdTech', 'SaaS',
+                                    'Crypto', 'Transportation', 'Marketing', 'Other'],
+                              [24, 17, 15, 13, 10, 10, 8, 6, 5, 20], n),
+        'headquarter_location': _weighted(rng, ['San Francisco', 'New York', 'Seattle', 'Boston', 'Austin',
+                                                'Los Angeles', 'Chicago', 'Other'],
+                                          [136, 77, 21, 18, 15, 14, 10, 198], n),
+        'status': _weighted(rng, ['Private', 'Public'], [70, 30], n),
+        'year': years,
+        'month': months,
+    })
+
+
+def gen_layoff_trends(rng, n, offset):
+    years = np.arange(1995, 1995 + n)
+    shocks = {2001: 4.0, 2002: 3.0, 2008: 3.5, 2009: 4.0, 2020: 3.0, 2022: 2.5, 2023: 4.5}
+    factor = np.array([shocks.get(y, 1.0) for y in years])
+    return pd.DataFrame({
+        'year': years.astype(float),
+        'layoffs': np.round(rng.uniform(20_000, 60_000, n) * factor),
+        'reason_for_layoffs': _weighted(rng, ['Economic downturn', 'Restructuring', 'Automation', 'Pandemic',
+                                              'Overhiring correction'], [3, 3, 2, 1, 1], n),
+        'industry_focus': 'Technology',
+        'global_event': _weighted(rng, ['Dot-com bubble', 'Financial crisis', 'COVID-19', 'AI boom', 'None'],
+                                  [1, 1, 1, 1, 3], n),
+        'job_sector_growthmillions': np.round(rng.uniform(0.5, 4.0, n), 2),
+        'ai_job_percentagepct': np.round(np.geomspace(0.5, 60, n), 1),
+        'future_job_trends': _weighted(rng, ['Cloud', 'AI/ML', 'Cybersecurity', 'Data Science'], [1, 1, 1, 1], n),
+    })
+
+
+def gen_dice_jobs(rng, n, offset, vocab):
+    names, weights = vocab
+    head = min(2000, len(names))
+    sizes = rng.integers(2, 12, n)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    cdf = np.cumsum(weights[:head])
+    codes = np.searchsorted(cdf, rng.random(offsets[-1]) * cdf[-1])
+    posted = _dates(rng, '2019-01-01', '2019-12-31', n)
+    return pd.DataFrame({
+        'jobid': [f"{(offset + i) * 2654435761 % 16**12:012x}" for i in range(n)],
+        'company': COMPANIES[_zipf_index(rng, len(COMPANIES), n)],
+        'jobtitle': np.array(TECH_TITLES, dtype=object)[_zipf_index(rng, len(TECH_TITLES), n, 0.8)],
+        'joblocation_address': CITY_NAMES[_zipf_index(rng, len(CITY_NAMES), n, 0.9)],
+        'employmenttype_jobstatus': _weighted(rng, ['Full Time', 'Contract', 'Contract W2', 'Part Time',
+                                                    'Full Time, Contract'], [50, 25, 12, 5, 8], n),
+        'skills': _join_lists(names, codes, offsets),
+        'postdate': posted.astype(str),
+        'post_year': 2019,
+        'post_month': posted.astype('datetime64[M]').astype(int) % 12 + 1,
+    })
+
+
+def gen_unified_jobs(rng, n, offset):
+    source = _weighted(rng, ['job_postings', 'linkedin', 'dice', 'it_jobs'], [40_991, 10_000, 5_000, 2_500], n)
+    has_salary = (source == 'job_postings') & (rng.random(n) < 0.176)
+    med = rng.lognormal(11.45, 0.38, n)
+    has_experience = source == 'it_jobs'
+    min_years = np.where(has_experience, rng.choice([0, 1, 2, 3, 5], size=n).astype(float), np.nan)
+    prefix = np.char.add(np.char.add(source.astype(str), '_'), (offset + np.arange(n)).astype(str))
+    return pd.DataFrame({
+        'job_id': prefix.astype(object),
+        'source': source,
+        'job_title': np.array(TECH_TITLES, dtype=object)[_zipf_index(rng, len(TECH_TITLES), n, 0.8)],
+        'company_name': np.where(rng.random(n) < 0.994, COMPANIES[_zipf_index(rng, len(COMPANIES), n)], None),
+        'location': CITY_NAMES[_zipf_index(rng, len(CITY_NAMES), n, 0.9)],
+        'experience_min_years': min_years,
+        'experience_max_years': min_years + 2,
+        'min_salary': np.where(has_salary, np.round(med * 0.85), np.nan),
+        'max_salary': np.where(has_salary, np.round(med * 1.15), np.nan),
+        'med_salary': np.where(has_salary, np.round(med), np.nan),
+        'job_level': np.where(rng.random(n) < 0.71,
+                              _weighted(rng, ['Mid-Senior', 'Entry', 'Associate', 'Director'], [60, 25, 12, 3], n),
+                              None),
+        'job_type': np.where(rng.random(n) < 0.872,
+                             _weighted(rng, ['Full-time', 'Contract', 'Part-time'], [82, 14, 4], n), None),
+        'remote_allowed': np.where(rng.random(n) < 0.15, 1, 0),
+        'posted_year': np.where(source == 'dice', 2019, 2024),
+        'posted_month': rng.integers(1, 13, n),
+    })
+
+
+def gen_ai_jobs(rng, n, offset):
+    levels = np.array(list(AI_LEVELS), dtype=object)[rng.integers(0, len(AI_LEVELS), n)]
+    params = np.array([AI_LEVELS[level] for level in levels])
+    salary = np.round(np.exp(rng.normal(params[:, 0], params[:, 1])))
+    years = np.floor(rng.uniform(params[:, 2], params[:, 3] + 1)).astype(int)
+    currency = _weighted(rng, ['USD', 'EUR', 'GBP'], [797, 154, 49], n)
+    rate = np.select([currency == 'EUR', currency == 'GBP'], [0.88, 0.75], 1.0)
+
+    skill_names = np.array(list(AI_SKILLS), dtype=object)
+    sizes = rng.choice([3, 4, 5], size=n, p=[0.33, 0.34, 0.33])
+    probs = np.array(list(AI_SKILLS.values()), dtype=np.float64)
+    probs /= probs.sum()
+    picks = [rng.choice(len(skill_names), size=k, replace=False, p=probs) for k in sizes]
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+    posted = _dates(rng, '2024-01-01', '2025-04-30', n)
+    country = np.array(AI_COUNTRIES, dtype=object)[rng.integers(0, len(AI_COUNTRIES), n)]
+    return pd.DataFrame({
+        'job_id': [f"AI{offset + i + 1:05d}" for i in range(n)],
+        'job_title': np.array(AI_TITLES, dtype=object)[rng.integers(0, len(AI_TITLES), n)],
+        'salary_usd': salary.astype(int),
+        'salary_currency': currency,
+        'salary_local': np.round(salary * rate).astype(int),
+        'experience_level': levels,
+        'employment_type': np.array(['FT', 'FL', 'CT', 'PT'], dtype=object)[rng.integers(0, 4, n)],
+        'company_location': country,
+        'company_size': np.array(['S', 'M', 'L'], dtype=object)[rng.integers(0, 3, n)],
+        'employee_residence': np.where(rng.random(n) < 0.8, country, np.array(AI_COUNTRIES, dtype=object)[
+            rng.integers(0, len(AI_COUNTRIES), n)]),
+        'remote_ratio': np.array([0, 50, 100])[rng.integers(0, 3, n)],
+        'required_skills': _join_lists(skill_names, np.concatenate(picks), offsets),
+        'education_required': np.array(['Bachelor', 'Associate', 'Master', 'PhD'], dtype=object)[rng.integers(0, 4, n)],
+        'years_experience': years,
+        'industry': np.array(AI_INDUSTRIES, dtype=object)[rng.integers(0, len(AI_INDUSTRIES), n)],
+        'posting_date': posted.astype(str),
+        'application_deadline': (posted + rng.integers(14, 75, n).astype('timedelta64[D]')).astype(str),
+        'job_description_length': rng.integers(500, 2500, n),
+        'benefits_score': np.round(rng.uniform(5.0, 10.0, n), 1),
+        'company_name': np.array(AI_COMPANIES, dtype=object)[rng.integers(0, len(AI_COMPANIES), n)],
+    })
+
+
+GENERATORS = {
+    'job_postings': gen_job_postings,
+    'job_skills': gen_job_skills,
+    'it_jobs': gen_it_jobs,
+    'linkedin_postings': gen_linkedin_postings,
+    'layoffs': gen_layoffs,
+    'layoff_trends': gen_layoff_trends,
+    'dice_jobs': gen_dice_jobs,
+    'unified_jobs': gen_unified_jobs,
+    'ai_jobs': gen_ai_jobs,
+    'ai_jobs_snapshot': gen_ai_jobs,
+}
+USES_VOCABULARY = {'job_skills', 'dice_jobs'}
+
+
+def dataset_file(root, name):
+    """The dataset's CSV under root, at the path data_cache registers it at under the repo root"""
+    return Path(root) / dataset_path(name).relative_to(ANALYSIS_DIR.parent)
+
+
+def scaled_rows(name, scale):
+    return BASE_ROWS[name] if name in FIXED_SIZE else int(round(BASE_ROWS[name] * scale))
+
+
+def generate_dataset(root, name, scale=1, seed=0, chunk_rows=CHUNK_ROWS, vocab=None):
+    """Write one synthetic CSV in chunks; returns (path, rows)"""
+    path = dataset_file(root, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = scaled_rows(name, scale)
+    tmp = path.with_suffix('.csv.tmp')
+    for chunk, start in enumerate(range(0, n, chunk_rows)):
+        rows = min(chunk_rows, n - start)
+        rng = _rng(seed, name, chunk)
+        args = (rng, rows, start) + ((vocab,) if name in USES_VOCABULARY else ())
+        GENERATORS[name](*args).to_csv(tmp, mode='w' if chunk == 0 else 'a', header=chunk == 0, index=False)
+    tmp.replace(path)
+    return path, n
+
+
+def generate(root, scale=1, seed=0, datasets=None, chunk_rows=CHUNK_ROWS, verbose=True):
+    """
+    Write every (or the named) synthetic dataset under root.
+
+    A manifest records the seed, scale and generator version; datasets whose
+    entry matches are left alone, so repeated benchmark runs reuse the files.
+    Returns {name: rows}.
+    """
+    root = Path(root)
+    manifest_path = root / "synthetic_manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    wanted = {'version': GENERATOR_VERSION, 'seed': seed, 'scale': scale}
+    vocab = None
+
+    rows = {}
+    for name in datasets or GENERATORS:
+        entry = manifest.get(name, {})
+        if {k: entry.get(k) for k in wanted} == wanted and dataset_file(root, name).exists():
+            rows[name] = entry['rows']
+            continue
+        if name in USES_VOCABULARY and vocab is None:
+            vocab = skill_vocabulary(size=int(200_000 * max(1, scale ** 0.5)))
+        start = time.perf_counter()
+        _, rows[name] = generate_dataset(root, name, scale, seed, chunk_rows, vocab)
+        manifest[name] = {**wanted, 'rows': rows[name]}
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        if verbose:
+            print(f"✓ {name}: {rows[name]:,} rows in {time.perf_counter() - start:.1f}s → {dataset_file(root, name)}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ML_Ready and 2025 AI job datasets")
+    parser.add_argument('--scale', type=float, default=1, help="Multiple of the real row counts (1, 10, 100)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--root', type=Path, default=None,
+                        help="Output root (default: analysis/cache/synthetic/scale-<N>x)")
+    parser.add_argument('--datasets', nargs='+', choices=list(GENERATORS), default=None)
+    args = parser.parse_args()
+
+    root = args.root or SYNTHETIC_DIR / f"scale-{args.scale:g}x"
+    start = time.perf_counter()
+    rows = generate(root, scale=args.scale, seed=args.seed, datasets=args.datasets)
+    print(f"\nTotal: {sum(rows.values()):,} rows across {len(rows)} datasets in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
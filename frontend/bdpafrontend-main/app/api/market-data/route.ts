@@ -1,11 +1,32 @@
 import { NextResponse } from 'next/server';
 
-// Cached market data to avoid file I/O on every request
-let cachedMarketData: Record<string, number> | null = null;
-let cacheTimestamp: number = 0;
-const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
+// Precompiled artifact written by `python analysis/bdpa_analysis.py export`
+// (analysis/market_artifact.py). Once it loads, its serialized body is reused
+// for every response; until then the fallback body is retried every 5 minutes.
+interface MarketDataArtifact {
+  version: number;
+  etag: string;
+  marketData: Record<string, number>;
+  skillCombinations: Record<string, string[]>;
+  emergingTech: string[];
+  industryDemandScores: Record<string, unknown>;
+  totalSkills: number;
+}
+
+interface PreparedResponse {
+  body: string;
+  etag: string;
+  fromArtifact: boolean;
+}
+
+const ARTIFACT_FILE = 'analysis/results/market_data.json';
+const FALLBACK_RETRY_MS = 5 * 60 * 1000;
 
-// Fallback market data (used immediately, no file I/O blocking)
+let preparedResponse: Promise<PreparedResponse> | null = null;
+// Set while preparedResponse holds the fallback body: when to look for the artifact again
+let fallbackExpiresAt = 0;
+
+// Core skills, served alone when no artifact loads and merged under the artifact's table otherwise
 const FALLBACK_MARKET_DATA: Record<string, number> = {
   'python': 22016,
   'sql': 18322,
@@ -36,89 +57,89 @@ const FALLBACK_MARKET_DATA: Record<string, number> = {
   'power bi': 2500,
 };
 
-// Load market data from CSV files dynamically (with caching)
-export async function GET() {
-  try {
-    // Return cached data if available and fresh
-    const now = Date.now();
-    if (cachedMarketData && (now - cacheTimestamp) < CACHE_DURATION) {
-      return NextResponse.json({
-        marketData: cachedMarketData,
-        skillCombinations: generateSkillCombinations(cachedMarketData),
-        emergingTech: [],
-        totalSkills: Object.keys(cachedMarketData).length,
-      });
-    }
-    
-    // Try to load from CSV in background (non-blocking)
-    let marketData: Record<string, number> = { ...FALLBACK_MARKET_DATA };
-    
-    // Try to load CSV asynchronously (don't block response)
+async function loadArtifact(): Promise<MarketDataArtifact | null> {
+  const { readFile } = await import('fs/promises');
+  const { join } = await import('path');
+
+  const possiblePaths = [
+    process.env.MARKET_DATA_PATH,
+    join(process.cwd(), '../..', ARTIFACT_FILE),
+    join(process.cwd(), '../../..', ARTIFACT_FILE),
+    join(process.cwd(), ARTIFACT_FILE),
+  ].filter((path): path is string => Boolean(path));
+
+  for (const path of possiblePaths) {
+    let text: string;
     try {
-      const { readFile } = await import('fs/promises');
-      const { join } = await import('path');
-      
-      const possiblePaths = [
-        join(process.cwd(), '../../analysis/results/top_100_skills.csv'),
-        join(process.cwd(), '../../../analysis/results/top_100_skills.csv'),
-        join(process.cwd(), 'analysis/results/top_100_skills.csv'),
-      ];
-      
-      for (const path of possiblePaths) {
-        try {
-          const csvContent = await readFile(path, 'utf-8');
-          const lines = csvContent.split('\n').slice(1); // Skip header
-          
-          // Process CSV quickly (limit to first 200 lines to avoid blocking)
-          for (const line of lines.slice(0, 200)) {
-            if (!line.trim()) continue;
-            const [skill, countStr] = line.split(',');
-            if (skill && countStr) {
-              const count = parseInt(countStr.trim(), 10);
-              if (!isNaN(count) && count > 0) {
-                const normalizedSkill = skill.trim().toLowerCase();
-                marketData[normalizedSkill] = (marketData[normalizedSkill] || 0) + count;
-              }
-            }
-          }
-          break; // Successfully loaded, exit loop
-        } catch (e) {
-          // Try next path
-          continue;
-        }
+      text = await readFile(path, 'utf-8');
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== 'ENOENT') {
+        console.warn(`Could not read market data artifact at ${path}:`, error);
       }
+      // Try next path
+      continue;
+    }
+    try {
+      return JSON.parse(text) as MarketDataArtifact;
     } catch (error) {
-      // If CSV loading fails, use fallback (already set above)
-      console.warn('Could not load CSV, using fallback data:', error);
+      console.error(`Market data artifact at ${path} is not valid JSON:`, error);
     }
-    
-    // Cache the result
-    cachedMarketData = marketData;
-    cacheTimestamp = now;
-    
-    // Dynamically determine emerging tech based on growth patterns
-    // (skills with lower absolute count but high growth potential)
-    const emergingTech: string[] = [];
-    const sortedSkills = Object.entries(marketData)
-      .sort((a, b) => a[1] - b[1]) // Sort by count ascending
-      .slice(0, 20); // Bottom 20 by count (emerging)
-    
-    for (const [skill] of sortedSkills) {
-      if (['kubernetes', 'terraform', 'graphql', 'microservices', 'pytorch', 'spark', 'kafka'].includes(skill)) {
-        emergingTech.push(skill);
-      }
+  }
+  return null;
+}
+
+async function prepareResponse(): Promise<PreparedResponse> {
+  const artifact = await loadArtifact();
+  if (!artifact) {
+    console.warn(`No usable market data artifact (${ARTIFACT_FILE}), using fallback data`);
+  }
+
+  // The artifact holds only the most demanded skills, so the core intern skills are
+  // merged in underneath it to keep them available to the combination heuristics
+  const marketData = { ...FALLBACK_MARKET_DATA, ...artifact?.marketData };
+  const skillCombinations = artifact && Object.keys(artifact.skillCombinations).length > 0
+    ? artifact.skillCombinations
+    : generateSkillCombinations(marketData);
+
+  const body = JSON.stringify({
+    marketData,
+    skillCombinations,
+    emergingTech: artifact?.emergingTech ?? [],
+    industryDemandScores: artifact?.industryDemandScores ?? {},
+    totalSkills: Object.keys(marketData).length,
+    version: artifact?.version ?? 0,
+  });
+  return { body, etag: `"${artifact?.etag ?? 'fallback'}"`, fromArtifact: artifact !== null };
+}
+
+// Serve the precompiled market data (loaded once, no per-request parsing)
+export async function GET(request: Request) {
+  try {
+    if (!preparedResponse || (fallbackExpiresAt && Date.now() >= fallbackExpiresAt)) {
+      fallbackExpiresAt = 0;
+      preparedResponse = prepareResponse()
+        .then((prepared) => {
+          if (!prepared.fromArtifact) {
+            fallbackExpiresAt = Date.now() + FALLBACK_RETRY_MS;
+          }
+          return prepared;
+        })
+        .catch((error) => {
+          preparedResponse = null;
+          throw error;
+        });
+    }
+    const { body, etag } = await preparedResponse;
+    const headers = {
+      'Content-Type': 'application/json',
+      'Cache-Control': 'public, max-age=300, stale-while-revalidate=3600',
+      ETag: etag,
+    };
+
+    if (request.headers.get('if-none-match') === etag) {
+      return new NextResponse(null, { status: 304, headers });
     }
-    
-    // Dynamically generate skill combinations based on common patterns
-    // This would ideally come from analyzing job postings, but for now we'll infer from skill categories
-    const skillCombinations = generateSkillCombinations(marketData);
-    
-    return NextResponse.json({
-      marketData,
-      skillCombinations,
-      emergingTech,
-      totalSkills: Object.keys(marketData).length,
-    });
+    return new NextResponse(body, { status: 200, headers });
   } catch (error) {
     console.error('Error loading market data:', error);
     return NextResponse.json(